@@ -8,12 +8,12 @@ configuration for a particular use case.
 
 Constants:
 DEFAULT     -- list of strings to indicate a default argument to an option.
-NP_MATMUL   -- list of strings to indicate the NumPy Matmul algorithm to -A.
-NP_ROLL     -- list of strings to indicate the NumPy Roll algorithm to -A.
-SP_MATMUL   -- list of strings to indicate the SciPy Matmul algorithm to -A.
-SP_CONVOLVE -- list of strings to indicate the SciPy Convolve algorithm to -A.
+ALGORITHMS  -- list of strings of the algorithms to -A, see life.registry.
 TERMINAL    -- list of strings to indicate the Terminal mode output to -O.
 GRAPHICAL   -- list of strings to indicate the Graphical mode output to -O.
+NONE        -- list of strings to indicate the Headless mode (no output) to -O.
+GLYPHS      -- list of strings of the terminal glyph modes to -G.
+PARALLEL    -- list of strings of the algorithms to -A which accept -w.
 
 Functions:
 get_args(argv)  -- obtain and preprocess arguments from argv.
@@ -23,37 +23,48 @@ _normalize_verbose_quiet(args)
                 -- preprocess the verbose and quiet options, Private.
 _normalize_size_resolution(args)
                 -- preprocess the size and resolution options, Private.
+_parse_bytes(text)
+                -- parse a number of bytes with an optional suffix, Private.
+_parse_every(text)
+                -- parse a number of steps or a time with a suffix, Private.
 """
 
 import argparse
 
+from life import rules
+from life import registry
+from life import fingerprint
+
 
 WIDTH  =  96
 HEIGHT =  54
 
 DELAY = 0.05
 
-DEFAULT   = ["default", "def", "deflt", "dflt", 'd']
+# The names of the Models are registered in life.registry.
 
-NP_MATMUL   = ["numpy-matmul","np-matmul", "n-matmul", "nm",
-               "numpy", "np", 'n']
-NP_ROLL     = ["numpy-roll", "np-roll", "n-roll", "nr", "roll", 'r']
-SP_MATMUL   = ["scipy-matmul", "sparse-matmul", "sp-matmul", "s-matmul", "sm",
-               "scipy", "sparse", "sp", 's',
-               "matmul", 'm']
-SP_CONVOLVE = ["scipy-convolve", "scipy-conv", "sp-convolve", "sp-conv", "sc",
-               "convolve", "conv", 'c']
+DEFAULT = registry.DEFAULT
 
 TERMINAL  = ["terminal", "term", 't', "ncurses", "nc", "curses", 'c']
 GRAPHICAL = ["graphical", "graph", 'g', "pygame", "pg", 'p']
+NONE      = ["none", "headless", "batch", "null", 'n']
+
+GLYPHS = ["block", "half", "quadrant", "braille"]
 
-ALGORITHMS = DEFAULT + NP_MATMUL + NP_ROLL + SP_MATMUL + SP_CONVOLVE
+ALGORITHMS = registry.ALGORITHMS
 
-OUTPUTS = DEFAULT + TERMINAL + GRAPHICAL
+PARALLEL = DEFAULT + registry.NP_ROLL + registry.NP_PARALLEL \
+         + registry.SP_CONVOLVE
+
+OUTPUTS = DEFAULT + TERMINAL + GRAPHICAL + NONE
 
 RES_WIDTH  = 960
 RES_HEIGHT = 540
 
+BYTE_SUFFIXES = {"" : 1, 'k' : 1 << 10, 'm' : 1 << 20, 'g' : 1 << 30}
+
+TIME_SUFFIXES = {'s' : 1, 'm' : 60, 'h' : 3600}
+
 #MAX_RESOLUTION_WIDTH  = 1280
 #MAX_RESOLUTION_HEIGHT =  720
 
@@ -114,16 +125,103 @@ def _get_raw_args(args):
     parser.add_argument('-s', "--size",       type=int, nargs='+',
                                               default=[WIDTH, HEIGHT])
     
-    parser.add_argument('-A', "--algorithm", choices=ALGORITHMS,
-                                             default=DEFAULT[0])
+    # Algorithms and output modes registered by third party packages (see
+    # life.registry) are accepted as well.
+    
+    parser.add_argument('-A', "--algorithm",
+                        choices=registry.Registry(dict.fromkeys(ALGORITHMS),
+                                                  registry.MODELS),
+                        default=DEFAULT[0])
+    
+    parser.add_argument('-O', '--outmode',
+                        choices=registry.Registry(dict.fromkeys(OUTPUTS),
+                                                  registry.VIEWS),
+                        default=DEFAULT[0])
+    
+    parser.add_argument('-G', "--glyphs", choices=GLYPHS)
     
-    parser.add_argument('-O', '--outmode', choices=OUTPUTS,
-                                           default=DEFAULT[0])
+    parser.add_argument('-f', "--file")
+    parser.add_argument('-x', "--offset", type=int, nargs=2)
+    
+    parser.add_argument('-R', "--rule", default=rules.CONWAY)
+    
+    parser.add_argument('-w', "--workers", type=int)
+    
+    parser.add_argument('-b', "--rollback", default="0")
+    parser.add_argument('-z', "--compress", action="store_true")
+    
+    parser.add_argument('-c', "--cycles", type=int, nargs='?', default=0,
+                                          const=fingerprint.WINDOW)
+    
+    parser.add_argument('-T', "--timeline")
+    parser.add_argument('-k', "--interval", type=int)
+    parser.add_argument('-g', "--goto",     type=int)
+    
+    parser.add_argument('-n', "--steps",  type=int)
+    parser.add_argument('-o', "--output")
+    
+    parser.add_argument('-C', "--checkpoint")
+    parser.add_argument('-e', "--every")
+    parser.add_argument('-u', "--resume")
     
     parser.add_argument('-p', "--paused",     action="store_true")
     parser.add_argument('-F', "--fullscreen", action="store_true")
     
-    return parser.parse_args(args=args[1:])
+    args = parser.parse_args(args=args[1:])
+    
+    try:
+        args.rule = rules.normalize(args.rule)
+    except ValueError as e:
+        parser.error(f"argument -R/--rule: {e}")
+    
+    try:
+        args.rollback = _parse_bytes(args.rollback)
+    except ValueError as e:
+        parser.error(f"argument -b/--rollback: {e}")
+    
+    if args.interval is not None and args.timeline is None:
+        parser.error("argument -k/--interval: requires -T/--timeline")
+    
+    if args.interval is not None and args.interval < 1:
+        parser.error("argument -k/--interval: must be positive")
+    
+    if args.cycles < 0:
+        parser.error("argument -c/--cycles: must not be negative")
+    
+    if args.goto is not None and args.goto < 0:
+        parser.error("argument -g/--goto: must not be negative")
+    
+    if args.offset is not None and args.file is None:
+        parser.error("argument -x/--offset: requires -f/--file")
+    
+    if args.resume is not None and args.file is not None:
+        parser.error("argument -u/--resume: not allowed with -f/--file")
+    
+    if args.every is not None and args.checkpoint is None:
+        parser.error("argument -e/--every: requires -C/--checkpoint")
+    
+    try:
+        args.every = _parse_every(args.every)
+    except ValueError as e:
+        parser.error(f"argument -e/--every: {e}")
+    
+    if args.glyphs is not None and args.outmode not in TERMINAL:
+        parser.error("argument -G/--glyphs: requires -O/--outmode terminal")
+    
+    if args.steps is not None and args.outmode not in NONE:
+        parser.error("argument -n/--steps: requires -O/--outmode none")
+    
+    if args.steps is not None and args.steps < 0:
+        parser.error("argument -n/--steps: must not be negative")
+    
+    if args.output is not None and args.outmode not in NONE:
+        parser.error("argument -o/--output: requires -O/--outmode none")
+    
+    if args.workers is not None and args.algorithm not in PARALLEL:
+        parser.error("argument -w/--workers: not supported by algorithm "
+                    f"'{args.algorithm}'")
+    
+    return args
 
 
 def _normalize_verbose_quiet(args):
@@ -180,3 +278,79 @@ def _normalize_size_resolution(args):
         args.size = (args.size[0], args.size[-1])
     if args.resolution is not None:
         args.resolution = (args.resolution[0], args.resolution[-1])
+
+
+def _parse_bytes(text):
+    """
+    Parse a number of bytes with an optional binary suffix.
+    
+    The suffixes 'K', 'M' and 'G' (case insensitive, optionally followed by
+    'iB' or 'B', which alone is ignored) multiply by 1024, 1024**2 and
+    1024**3 respectively, so that "64M" is 67108864.
+    
+    Parameters:
+    text    -- string:  the number of bytes, Required.
+    
+    Returns: int    -- the number of bytes.
+    
+    Exceptions Raised:
+    ValueError  -- if text is not a non-negative number of bytes.
+    
+    Note: This is a private function, you should not be calling this.
+    """
+    _text = text.strip().lower().removesuffix("ib").removesuffix('b')
+    
+    _suffix = _text[-1:] if _text[-1:] in BYTE_SUFFIXES else ""
+    
+    try:
+        _bytes = int(float(_text[:len(_text) - len(_suffix)])
+                     *BYTE_SUFFIXES[_suffix])
+    except ValueError:
+        raise ValueError(f"invalid number of bytes: '{text}'") from None
+    
+    if _bytes < 0:
+        raise ValueError(f"invalid number of bytes: '{text}'")
+    
+    return _bytes
+
+
+def _parse_every(text):
+    """
+    Parse a number of steps, or a time with a suffix, between checkpoints.
+    
+    A plain number is of steps, while the suffixes 's', 'm' and 'h' (case
+    insensitive) make it a number of seconds, minutes and hours, so that
+    "5m" is every 300 seconds.
+    
+    Parameters:
+    text    -- string:  the number of steps or the time, or None for the
+                        default, Required.
+    
+    Returns: tuple  -- the number of steps and the number of seconds, either
+                       or both None.
+    
+    Exceptions Raised:
+    ValueError  -- if text is not a positive number of steps or time.
+    
+    Note: This is a private function, you should not be calling this.
+    """
+    if text is None:
+        return None, None
+    
+    _text = text.strip().lower()
+    
+    _steps, _seconds = None, None
+    
+    try:
+        if _text[-1:] in TIME_SUFFIXES:
+            _seconds = float(_text[:-1])*TIME_SUFFIXES[_text[-1]]
+        else:
+            _steps = int(_text)
+    except ValueError:
+        raise ValueError(f"invalid number of steps or time: '{text}'") \
+              from None
+    
+    if (_seconds if _steps is None else _steps) <= 0:
+        raise ValueError(f"invalid number of steps or time: '{text}'")
+    
+    return _steps, _seconds
@@ -6,33 +6,83 @@ implementing a version of the Model-View-Controller design pattern for
 Cellular Automata. A number of Models, Views and Controllers are provided
 chich can be used (relatively) interchangeably to assemble the desired device.
 
+Only the light modules are imported with the package, the rest (marked
+below) are imported on first access, e.g. as life.nump, so that neither
+PyGame, curses nor SciPy is imported unless it is used.
+
 Modules:
 arguments   -- A concreate module for command line argument handling for a
                main.py script. This module is due to be removed from the life
                package as it is inappropriately included.
 terminal    -- A module providing View and Controller objects for a terminal
-               based interface using curses.
+               based interface using curses. Imported on first access.
 graphics    -- A module providing View and Controller objects for a graphical
-               interface using PyGame.
+               interface using PyGame. Imported on first access.
+headless    -- A module providing a Controller object running the Models
+               with no View, for batch runs. Imported on first access.
+registry    -- A module providing registries of lazily imported Models, Views
+               and Controllers, extended by entry points, and the names of
+               the Models of the package.
 utils       -- A module providing functions of general utility. This module
                may be removed from the package at some point in the future as
                its value is not specific to this package.
 mvc         -- A module providing Abstract Base Class descriptions for Model,
                View and Controller objects.
+rules       -- A module compiling Life-like rules in B/S notation into
+               lookup tables for the Models.
+history     -- A module providing the bounded rollback history of XOR deltas
+               for back-steps of the Models.
+timeline    -- A module providing disk-backed keyframe timelines for seeking
+               the Models with step_to().
+fingerprint -- A module providing state fingerprints for detecting cycles
+               and skipping whole periods in the Models.
+patterns    -- A module providing streaming loaders of RLE, plaintext and
+               Macrocell pattern files into the states of the Models.
+checkpoint  -- A module providing compact checkpoints of the states of the
+               Models, saved, autosaved in the background and resumed.
+bench       -- A script module benchmarking the Models registered in
+               registry, run with "python -m life.bench". It is not imported
+               with the package.
 
 Subpackages:
 nump        -- A package providing Model objects for Conway's Game of Life
                Cellular Automaton based on linear algebra provided by NumPy.
+               Imported on first access.
 scip        -- A package providing Model objects for Conway's Game of Life
                Cellular Automaton based on linear algebra provided by SciPy.
+               Imported on first access.
 """
 
+import importlib
+
 # Modules
-from . import terminal
-from . import graphics
+from . import registry
 from . import utils
 from . import mvc
+from . import rules
+from . import history
+from . import timeline
+from . import fingerprint
+from . import patterns
+from . import checkpoint
+
+# Lazy Modules and Packages
+_LAZY = ("terminal", "graphics", "headless", "nump", "scip")
+
 
-# Packages
-from . import nump
-from . import scip
+def __getattr__(name):
+    """
+    Import a lazy module or subpackage on first access.
+    
+    Parameters:
+    name    -- string:  the name of the attribute, Required.
+    
+    Returns: module -- the module or subpackage.
+    
+    Exceptions Raised:
+    AttributeError  -- if name is not a lazy module or subpackage.
+    """
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    return importlib.import_module(f".{name}", __name__)
@@ -0,0 +1,451 @@
+"""
+This module benchmarks the Models registered in life.registry.
+
+Every algorithm in life.registry.models() (or those selected) is run over a
+grid of
+"world" sizes, densities and step counts. Each run is started from the same
+seeded random state, so that results are reproducible and comparable between
+algorithms and between machines. The first run of each configuration is
+untimed, warming up the Model and measuring its peak memory with tracemalloc,
+plus any SharedMemory blocks of the Model, and the rest are timed. The
+private memory of worker processes is not counted. The results are reported as a table and optionally
+written as JSON, which may later be given as a baseline to catch regressions.
+
+Invoke, with the life package importable, as:
+
+    python -m life.bench [OPTIONS]
+
+Constants:
+SIZES       -- list:    the default (width, height) sizes of the "world".
+DENSITIES   -- list:    the default initial densities of living cells.
+STEPS       -- list:    the default numbers of steps per timed run.
+REPEAT      -- int:     the default number of timed runs per configuration.
+SEED        -- int:     the default seed of the initial states.
+TOLERANCE   -- float:   the default fraction of the baseline speed which may
+                        be lost before a result counts as a regression.
+
+Functions:
+main(argv)  -- run the benchmarks as a script.
+algorithms([names])
+            -- find the canonical names and Models of algorithms.
+state(shape, density, seed)
+            -- create the seeded random initial state of a run.
+measure(model_class, size, density, steps[, repeat][, seed][, options])
+            -- benchmark one configuration of a Model.
+run(names, sizes, densities, steps[, repeat][, seed][, options])
+            -- benchmark a grid of configurations.
+compare(results, baseline[, tolerance])
+            -- compare results with a baseline.
+table(results)
+            -- format results as a table.
+_get_args(argv)
+            -- initialize the ArgumentParser and parse arguments, Private.
+_size(text) -- parse a WIDTHxHEIGHT size, Private.
+"""
+
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import tracemalloc
+
+import numpy
+
+from . import rules
+from . import registry
+
+
+SIZES = [(96, 54), (256, 256), (1024, 256)]
+
+DENSITIES = [0.5]
+
+STEPS = [100]
+
+REPEAT = 5
+
+SEED = 0
+
+TOLERANCE = 0.25
+
+
+def main(argv):
+    """
+    Run the benchmarks as a script, see _get_args() for the options.
+    
+    Parameters:
+    argv    -- list:    the argument list, usually sys.argv, Required.
+    
+    Returns: int    -- the exit status, 1 if there was any regression from
+                       the baseline, 0 otherwise.
+    """
+    args = _get_args(argv)
+    
+    options = {"rule" : args.rule}
+    
+    _results = run(args.algorithm, args.size or SIZES,
+                   args.density or DENSITIES, args.steps or STEPS,
+                   repeat=args.repeat, seed=args.seed, options=options)
+    
+    _report = {"python"   : platform.python_version(),
+               "numpy"    : numpy.__version__,
+               "machine"  : platform.machine(),
+               "platform" : platform.platform(),
+               "repeat"   : args.repeat,
+               "seed"     : args.seed,
+               "rule"     : args.rule,
+               "results"  : _results}
+    
+    _regressions = []
+    
+    if args.baseline is not None:
+        with open(args.baseline) as _file:
+            _baseline = json.load(_file)
+        
+        _regressions = compare(_results, _baseline["results"],
+                               args.tolerance)
+    
+    sys.stdout.write(table(_results))
+    
+    for _result in _regressions:
+        sys.stderr.write(f"{argv[0]}: regression: {_result['algorithm']} "
+                         f"{_result['width']}x{_result['height']} "
+                         f"density {_result['density']} "
+                         f"{_result['steps']} steps at "
+                         f"{_result['speedup']:.2f}x the baseline\n")
+    
+    if args.output is not None:
+        with open(args.output, 'w') as _file:
+            json.dump(_report, _file, indent=4)
+            
+            _file.write("\n")
+    
+    return 1 if _regressions else 0
+
+
+def algorithms(names=None):
+    """
+    Find the canonical names and Models of the registered algorithms.
+    
+    The canonical name of an algorithm is the first name registered for its
+    Model other than the default.
+    
+    Parameters:
+    names   -- list:    the names or aliases of the algorithms, Default = None
+                        for every algorithm.
+    
+    Returns: dict   -- the Model classes by canonical name, in order.
+    
+    Exceptions Raised:
+    KeyError    -- if a name is not registered in life.registry.
+    """
+    _registry = registry.models()
+    
+    _canonical = {}
+    
+    for _name, _model in _registry.items():
+        if _name not in registry.DEFAULT:
+            _canonical.setdefault(_model, _name)
+    
+    if names is None:
+        return {_name : _model for _model, _name in _canonical.items()}
+    
+    _models = [_registry[_name] for _name in names]
+    
+    return {_canonical[_model] : _model for _model in _models}
+
+
+def state(shape, density, seed):
+    """
+    Create the seeded random initial state of a run.
+    
+    Parameters:
+    shape   -- tuple:   the shape of the state, Required.
+    density -- float:   the statistical density of living cells, Required.
+    seed    -- int:     the seed of the random state, Required.
+    
+    Returns: ndarray    -- the uint8 (0 or 1) state.
+    """
+    _rng = numpy.random.default_rng(seed)
+    
+    return (_rng.random(shape) < density).astype(numpy.uint8)
+
+
+def measure(model_class, size, density, steps, repeat=REPEAT, seed=SEED,
+                                                options=None):
+    """
+    Benchmark one configuration of a Model.
+    
+    A new Model is constructed for every run and loaded with the seeded
+    initial state, only the steps are timed. The first run is untimed and
+    measures the peak memory allocated by the Model, including its state and
+    any SharedMemory blocks (the _shm of the parallel Model), which
+    tracemalloc cannot see. Memory private to worker processes is not
+    counted.
+    
+    Parameters:
+    model_class -- type:    the Model class, Required.
+    size        -- tuple:   the (width, height) size of the "world",
+                            Required.
+    density     -- float:   the initial density of living cells, Required.
+    steps       -- int:     the number of steps per run, Required.
+    repeat      -- int:     the number of timed runs, Default = 5.
+    seed        -- int:     the seed of the initial state, Default = 0.
+    options     -- dict:    further keyword arguments for the Model,
+                            Default = None.
+    
+    Returns: dict   -- the cells, the median and best seconds per run, the
+                       generations and cells per second from the median and
+                       the peak memory in bytes.
+    """
+    options = options or {}
+    
+    _seconds = []
+    
+    for _run in range(repeat + 1):
+        if _run == 0:
+            tracemalloc.start()
+        
+        _model = model_class(size, **options)
+        
+        _state = state(_model._snapshot().shape, density, seed)
+        
+        _model._load(_state)
+        
+        _start = time.perf_counter()
+        
+        _model.step(steps)
+        
+        _stop = time.perf_counter()
+        
+        if _run == 0:
+            _, _peak = tracemalloc.get_traced_memory()
+            
+            tracemalloc.stop()
+            
+            _peak += sum(_block.size
+                         for _block in getattr(_model, "_shm", ()))
+        else:
+            _seconds.append(_stop - _start)
+        
+        _model.close()
+    
+    _median = statistics.median(_seconds)
+    
+    return {"cells"                  : _state.size,
+            "seconds"                : _median,
+            "best"                   : min(_seconds),
+            "generations_per_second" : steps/_median,
+            "cells_per_second"       : steps*_state.size/_median,
+            "peak_bytes"             : _peak}
+
+
+def run(names, sizes, densities, steps, repeat=REPEAT, seed=SEED,
+                                        options=None):
+    """
+    Benchmark every algorithm over a grid of configurations.
+    
+    Parameters:
+    names       -- list:    the names or aliases of the algorithms, or None
+                            for every algorithm, Required.
+    sizes       -- list:    the (width, height) sizes, Required.
+    densities   -- list:    the initial densities, Required.
+    steps       -- list:    the numbers of steps per run, Required.
+    repeat      -- int:     the number of timed runs, Default = 5.
+    seed        -- int:     the seed of the initial states, Default = 0.
+    options     -- dict:    further keyword arguments for the Models,
+                            Default = None.
+    
+    Returns: list   -- a dict for each configuration, of the algorithm,
+                       width, height, density and steps and the results of
+                       measure().
+    """
+    _results = []
+    
+    for _name, _model in algorithms(names).items():
+        for _width, _height in sizes:
+            for _density in densities:
+                for _steps in steps:
+                    _results.append({"algorithm" : _name,
+                                     "width"     : _width,
+                                     "height"    : _height,
+                                     "density"   : _density,
+                                     "steps"     : _steps,
+                                     **measure(_model, (_width, _height),
+                                               _density, _steps, repeat,
+                                               seed, options)})
+    
+    return _results
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """
+    Compare results with a baseline, finding any regressions.
+    
+    Results are matched to the baseline by algorithm, size, density and
+    steps, and the speedup of each matched result over the baseline is added
+    to it. Unmatched results are left as they are.
+    
+    Parameters:
+    results     -- list:    the results of run(), modified in place,
+                            Required.
+    baseline    -- list:    the results of an earlier run(), Required.
+    tolerance   -- float:   the fraction of the baseline generations per
+                            second which may be lost, Default = 0.25.
+    
+    Returns: list   -- the results which are regressions.
+    """
+    _key = lambda _result: (_result["algorithm"], _result["width"],
+                            _result["height"], _result["density"],
+                            _result["steps"])
+    
+    _baseline = {_key(_result) : _result for _result in baseline}
+    
+    _regressions = []
+    
+    for _result in results:
+        _base = _baseline.get(_key(_result))
+        
+        if _base is None:
+            continue
+        
+        _result["speedup"] = _result["generations_per_second"] \
+                           / _base["generations_per_second"]
+        
+        if _result["speedup"] < 1 - tolerance:
+            _regressions.append(_result)
+    
+    return _regressions
+
+
+def table(results):
+    """
+    Format results as a table, one line per configuration.
+    
+    Parameters:
+    results -- list:    the results of run(), Required.
+    
+    Returns: string -- the table.
+    """
+    _compared = any("speedup" in _result for _result in results)
+    
+    _lines = [f"{'algorithm':<16}{'size':>11}{'density':>9}{'steps':>7}"
+              f"{'gen/s':>11}{'cells/s':>11}{'peak MiB':>10}"
+              + (f"{'speedup':>9}" if _compared else "")]
+    
+    for _result in results:
+        _size = f"{_result['width']}x{_result['height']}"
+        
+        _line = f"{_result['algorithm']:<16}{_size:>11}" \
+                f"{_result['density']:>9.2f}{_result['steps']:>7}" \
+                f"{_result['generations_per_second']:>11.4g}" \
+                f"{_result['cells_per_second']:>11.4g}" \
+                f"{_result['peak_bytes']/(1 << 20):>10.2f}"
+        
+        if "speedup" in _result:
+            _line += f"{_result['speedup']:>8.2f}x"
+        
+        _lines.append(_line)
+    
+    return "\n".join(_lines) + "\n"
+
+
+def _get_args(argv):
+    """
+    Initialize the ArgumentParser and parse the benchmark arguments.
+    
+    Options:
+    -A, --algorithm NAME [NAME ...]
+            the algorithms, any names accepted by main.py, Default = all.
+    -s, --size WIDTHxHEIGHT [WIDTHxHEIGHT ...]
+            the sizes, Default = 96x54 256x256 1024x256.
+    -D, --density NUMBER [NUMBER ...]
+            the initial densities, Default = 0.5.
+    -n, --steps NUMBER [NUMBER ...]
+            the numbers of steps per run, Default = 100.
+    -N, --repeat NUMBER
+            the number of timed runs, Default = 5.
+    -S, --seed NUMBER
+            the seed of the initial states, Default = 0.
+    -R, --rule RULE
+            the Life-like rule, Default = "B3/S23".
+    -o, --output FILE
+            write the results as JSON to FILE.
+    -B, --baseline FILE
+            compare the results with those in the JSON FILE, exiting with
+            status 1 on any regression.
+    -t, --tolerance NUMBER
+            the fraction of the baseline speed which may be lost,
+            Default = 0.25.
+    
+    Parameters:
+    argv    -- list:    the argument list, usually sys.argv, Required.
+    
+    Returns: Namespace  -- an object containing the arguments.
+    
+    Note: This is a private function, you should not be calling this.
+    """
+    parser = argparse.ArgumentParser(prog="python -m life.bench",
+                                     description="Benchmark the Matrix Life "
+                                                 "algorithms")
+    
+    parser.add_argument('-A', "--algorithm", nargs='+',
+                                             choices=registry.models())
+    
+    parser.add_argument('-s', "--size",    type=_size,  nargs='+')
+    parser.add_argument('-D', "--density", type=float, nargs='+')
+    parser.add_argument('-n', "--steps",   type=int,   nargs='+')
+    
+    parser.add_argument('-N', "--repeat", type=int, default=REPEAT)
+    parser.add_argument('-S', "--seed",   type=int, default=SEED)
+    
+    parser.add_argument('-R', "--rule", default=rules.CONWAY)
+    
+    parser.add_argument('-o', "--output")
+    parser.add_argument('-B', "--baseline")
+    parser.add_argument('-t', "--tolerance", type=float, default=TOLERANCE)
+    
+    args = parser.parse_args(args=argv[1:])
+    
+    try:
+        args.rule = rules.normalize(args.rule)
+    except ValueError as e:
+        parser.error(f"argument -R/--rule: {e}")
+    
+    if args.repeat < 1:
+        parser.error("argument -N/--repeat: must be positive")
+    
+    if args.steps is not None and min(args.steps) < 1:
+        parser.error("argument -n/--steps: must be positive")
+    
+    return args
+
+
+def _size(text):
+    """
+    Parse a size given as WIDTHxHEIGHT, or WIDTH alone for a square.
+    
+    Parameters:
+    text    -- string:  the size, Required.
+    
+    Returns: tuple  -- the (width, height) size.
+    
+    Exceptions Raised:
+    ArgumentTypeError   -- if text is not a valid size.
+    
+    Note: This is a private function, you should not be calling this.
+    """
+    try:
+        _size = tuple(int(_n) for _n in text.lower().split('x'))
+    except ValueError:
+        _size = ()
+    
+    if len(_size) not in (1, 2) or min(_size) < 1:
+        raise argparse.ArgumentTypeError(f"invalid size: '{text}'")
+    
+    return (_size[0], _size[-1])
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
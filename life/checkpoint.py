@@ -0,0 +1,476 @@
+"""
+This module provides compact checkpoints of the states of cellular automata.
+
+A checkpoint file holds the complete state of a Model: its state (world)
+matrix, bit-packed and zlib compressed, after a one line header of the step
+count (generation), shape, rule and seed, so that a long run may be resumed
+where it was stopped. A checkpoint is written to a temporary file which is
+then renamed over the last, so that a crash never leaves one half-written.
+Autosaves take a copy of the state between steps and leave the packing,
+compression and writing to a background thread, so that the simulation only
+ever waits for the copy.
+
+Constants:
+MAGIC   -- bytes:   the first bytes of a checkpoint file.
+VERSION -- int:     the version of the checkpoint format.
+LEVEL   -- int:     the zlib compression level.
+SECONDS -- float:   the default number of seconds between autosaves.
+SUFFIX  -- string:  the suffix of the temporary file.
+
+Classes:
+Checkpoint  -- The complete state of a Model at a step.
+Autosave    -- Periodic checkpoints of a Model written in the background.
+
+Functions:
+capture(model)          -- take a Checkpoint of a Model.
+save(path, checkpoint)  -- write a Checkpoint to a file.
+load(path)              -- read a Checkpoint from a file.
+"""
+
+import os
+import json
+import time
+import zlib
+import threading
+
+import numpy
+
+from . import rules
+
+
+MAGIC = b"MLCK"
+
+VERSION = 1
+
+LEVEL = 1
+
+SECONDS = 60.0
+
+SUFFIX = ".part"
+
+
+class Checkpoint:
+    """
+    The complete state of a Model at a step.
+    
+    Instance Variables:
+    _state  -- ndarray: the uint8 (0 or 1) state, as from Model._snapshot().
+    _steps  -- int:     the step count (generation) of the state.
+    _rule   -- string:  the rule in B/S notation, or None if unknown.
+    _seed   -- int:     the seed of the initial state, or None if unknown.
+    
+    Properties:
+    state   -- ndarray: the uint8 (0 or 1) state.
+    steps   -- int:     the step count (generation) of the state.
+    rule    -- string:  the rule in B/S notation, or None if unknown.
+    seed    -- int:     the seed of the initial state, or None if unknown.
+    size    -- tuple:   the width and height of the "world".
+    
+    Methods:
+    __init__(self, state, steps[, rule][, seed])
+            -- Initialize class object.
+    """
+    
+    def __init__(self, state, steps, rule=None, seed=None):
+        """
+        Initialize Checkpoint object.
+        
+        Parameters:
+        self    -- Checkpoint:  the object itself, Required.
+        state   -- ndarray:     the uint8 (0 or 1) state, which is kept and
+                                not copied, Required.
+        steps   -- int:         the step count of the state, Required.
+        rule    -- string:      the rule in B/S notation, Default = None for
+                                unknown.
+        seed    -- int:         the seed of the initial state,
+                                Default = None for unknown.
+        
+        Returns: None.
+        """
+        self._state = state
+        self._steps = int(steps)
+        self._rule  = rule
+        self._seed  = seed
+    
+    
+    @property
+    def state(self):
+        """
+        The uint8 (0 or 1) state, as from Model._snapshot().
+        """
+        return self._state
+    
+    
+    @property
+    def steps(self):
+        """
+        The step count (generation) of the state.
+        """
+        return self._steps
+    
+    
+    @property
+    def rule(self):
+        """
+        The rule in B/S notation, or None if unknown.
+        """
+        return self._rule
+    
+    
+    @property
+    def seed(self):
+        """
+        The seed of the initial state, or None if unknown.
+        """
+        return self._seed
+    
+    
+    @property
+    def size(self):
+        """
+        The width and height of the "world", as the size of a Model.
+        """
+        return self._state.shape[::-1][:2]
+
+
+class Autosave:
+    """
+    Periodic checkpoints of a Model, written on a background thread.
+    
+    A checkpoint is due every so many steps or seconds since the last, and
+    is captured on the thread stepping the Model, between steps, and then
+    written by a thread of its own. Should the last still be being written
+    when the next is due, the next is put off rather than the Model made to
+    wait. An error writing a checkpoint is raised by the next call to save()
+    or wait().
+    
+    Instance Variables:
+    _path       -- string:  the path of the checkpoint file.
+    _steps      -- int:     the number of steps between checkpoints, or None.
+    _seconds    -- float:   the number of seconds between checkpoints, or
+                            None.
+    _last       -- tuple:   the step count and time of the last checkpoint,
+                            or None before the first call to due().
+    _thread     -- Thread:  the thread writing the last checkpoint, or None.
+    _error      -- Exception:
+                            the Exception raised writing the last checkpoint,
+                            or None.
+    
+    Properties:
+    path    -- string:  the path of the checkpoint file.
+    seconds -- float:   the number of seconds between checkpoints, or None.
+    
+    Methods:
+    __init__(self, path[, steps][, seconds])
+            -- Initialize class object.
+    due(self, model)
+            -- Whether a checkpoint of a Model is due.
+    next(self)
+            -- The step count at which the next checkpoint is due.
+    save(self, model[, wait])
+            -- Capture a checkpoint and write it in the background.
+    wait(self)
+            -- Wait for the last checkpoint to be written.
+    close(self)
+            -- Wait for the last checkpoint, ignoring errors.
+    _raise(self)
+            -- Raise the error writing the last checkpoint, Private.
+    _write(self, checkpoint)
+            -- Write a checkpoint, on the background thread, Private.
+    """
+    
+    def __init__(self, path, steps=None, seconds=None):
+        """
+        Initialize Autosave object.
+        
+        Parameters:
+        self    -- Autosave:    the object itself, Required.
+        path    -- string:      the path of the checkpoint file, Required.
+        steps   -- int:         the number of steps between checkpoints,
+                                Default = None for none.
+        seconds -- float:       the number of seconds between checkpoints,
+                                Default = None for 60 if steps is None too.
+        
+        Returns: None.
+        
+        Exceptions Raised:
+        ValueError  -- if steps or seconds is not positive.
+        """
+        if steps is None and seconds is None:
+            seconds = SECONDS
+        
+        if steps is not None and steps < 1:
+            raise ValueError(f"Invalid autosave steps: {steps}")
+        
+        if seconds is not None and seconds <= 0:
+            raise ValueError(f"Invalid autosave seconds: {seconds}")
+        
+        self._path = path
+        
+        self._steps   = steps
+        self._seconds = seconds
+        
+        self._last = None
+        
+        self._thread = None
+        self._error  = None
+    
+    
+    @property
+    def path(self):
+        """
+        The path of the checkpoint file.
+        """
+        return self._path
+    
+    
+    @property
+    def seconds(self):
+        """
+        The number of seconds between checkpoints, or None.
+        """
+        return self._seconds
+    
+    
+    def due(self, model):
+        """
+        Whether a checkpoint of a Model is due.
+        
+        The first call only starts counting the steps and seconds.
+        
+        Parameters:
+        self    -- Autosave:    the object itself, Required.
+        model   -- Model:       the Model, Required.
+        
+        Returns: bool   -- a checkpoint is due and none is being written.
+        """
+        if self._last is None:
+            self._last = (model._steps, time.monotonic())
+            
+            return False
+        
+        if self._thread is not None and self._thread.is_alive():
+            return False
+        
+        return (self._steps is not None
+                and abs(model._steps - self._last[0]) >= self._steps) \
+            or (self._seconds is not None
+                and time.monotonic() - self._last[1] >= self._seconds)
+    
+    
+    def next(self):
+        """
+        The step count at which the next checkpoint is due, if by steps.
+        
+        Parameters:
+        self    -- Autosave:    the object itself, Required.
+        
+        Returns: int    -- the step count, or None if checkpoints are not due
+                           by steps or due() has not yet been called.
+        """
+        if self._steps is None or self._last is None:
+            return None
+        
+        return self._last[0] + self._steps
+    
+    
+    def save(self, model, wait=False):
+        """
+        Capture a checkpoint of a Model and write it in the background.
+        
+        The checkpoint must be captured between steps of the Model, i.e. on
+        the thread stepping it. If the last checkpoint is still being
+        written, this one is dropped unless waiting.
+        
+        Parameters:
+        self    -- Autosave:    the object itself, Required.
+        model   -- Model:       the Model, Required.
+        wait    -- bool:        wait for the last checkpoint and this one to
+                                be written, Default = False.
+        
+        Returns: bool   -- the checkpoint was captured.
+        
+        Exceptions Raised:
+        OSError     -- if the last checkpoint could not be written.
+        """
+        if wait:
+            self.wait()
+        elif self._thread is not None and self._thread.is_alive():
+            return False
+        
+        self._raise()
+        
+        _checkpoint = capture(model)
+        
+        self._last = (_checkpoint.steps, time.monotonic())
+        
+        self._thread = threading.Thread(target=self._write,
+                                        args=(_checkpoint,), daemon=True)
+        self._thread.start()
+        
+        if wait:
+            self.wait()
+        
+        return True
+    
+    
+    def wait(self):
+        """
+        Wait for the last checkpoint to be written.
+        
+        Parameters:
+        self    -- Autosave:    the object itself, Required.
+        
+        Returns: None.
+        
+        Exceptions Raised:
+        OSError     -- if the last checkpoint could not be written.
+        """
+        if self._thread is not None:
+            self._thread.join()
+        
+        self._raise()
+    
+    
+    def close(self):
+        """
+        Wait for the last checkpoint to be written, ignoring any error.
+        
+        Parameters:
+        self    -- Autosave:    the object itself, Required.
+        
+        Returns: None.
+        """
+        if self._thread is not None:
+            self._thread.join()
+        
+        self._error = None
+    
+    
+    def _raise(self):
+        """
+        Raise, and forget, the Exception writing the last checkpoint, if any.
+        
+        Parameters:
+        self    -- Autosave:    the object itself, Required.
+        
+        Returns: None.
+        
+        Note:
+        This is a private "helper" method, it is called by save() and wait().
+        """
+        _error, self._error = self._error, None
+        
+        if _error is not None:
+            raise _error
+    
+    
+    def _write(self, checkpoint):
+        """
+        Write a checkpoint, keeping any Exception for save() or wait().
+        
+        Parameters:
+        self        -- Autosave:    the object itself, Required.
+        checkpoint  -- Checkpoint:  the checkpoint, Required.
+        
+        Returns: None.
+        
+        Note:
+        This is a private "helper" method, it is the target of the thread
+        started by save().
+        """
+        try:
+            save(self._path, checkpoint)
+        except Exception as e:
+            self._error = e
+
+
+def capture(model):
+    """
+    Take a Checkpoint of the complete state of a Model.
+    
+    Parameters:
+    model   -- Model:   the Model, Required.
+    
+    Returns: Checkpoint -- the checkpoint, of a copy of the state.
+    """
+    _rule = getattr(model, "_rule", None)
+    
+    return Checkpoint(model._snapshot(), model._steps,
+                      None if _rule is None else rules.notation(_rule),
+                      getattr(model, "_seed", None))
+
+
+def save(path, checkpoint):
+    """
+    Write a Checkpoint to a file, replacing it only once written.
+    
+    Parameters:
+    path        -- string:      the path of the file, Required.
+    checkpoint  -- Checkpoint:  the checkpoint, Required.
+    
+    Returns: None.
+    
+    Exceptions Raised:
+    OSError     -- if the file cannot be written.
+    """
+    _header = json.dumps({"version" : VERSION,
+                          "steps"   : checkpoint.steps,
+                          "shape"   : list(checkpoint.state.shape),
+                          "rule"    : checkpoint.rule,
+                          "seed"    : checkpoint.seed})
+    
+    _data = zlib.compress(numpy.packbits(checkpoint.state).tobytes(), LEVEL)
+    
+    with open(path + SUFFIX, "wb") as _file:
+        _file.write(MAGIC + _header.encode() + b"\n")
+        _file.write(_data)
+        _file.flush()
+        
+        os.fsync(_file.fileno())
+    
+    os.replace(path + SUFFIX, path)
+
+
+def load(path):
+    """
+    Read a Checkpoint from a file.
+    
+    Parameters:
+    path    -- string:  the path of the file, Required.
+    
+    Returns: Checkpoint -- the checkpoint.
+    
+    Exceptions Raised:
+    OSError     -- if the file cannot be read.
+    ValueError  -- if the file is not a checkpoint, of this version.
+    """
+    with open(path, "rb") as _file:
+        _magic = _file.read(len(MAGIC))
+        _header = _file.readline()
+        _data = _file.read()
+    
+    if _magic != MAGIC:
+        raise ValueError(f"Not a checkpoint file: '{path}'")
+    
+    try:
+        _header = json.loads(_header)
+        
+        if _header["version"] != VERSION:
+            raise ValueError(f"Unsupported checkpoint version: "
+                             f"{_header['version']}")
+        
+        _shape = tuple(_header["shape"])
+        
+        _bits = numpy.frombuffer(zlib.decompress(_data), dtype=numpy.uint8)
+    except (KeyError, TypeError, zlib.error) as e:
+        raise ValueError(f"Malformed checkpoint file: '{path}'") from e
+    
+    if len(_bits)*8 < numpy.prod(_shape, dtype=numpy.int64):
+        raise ValueError(f"Malformed checkpoint file: '{path}'")
+    
+    _state = numpy.unpackbits(_bits, count=int(numpy.prod(_shape))) \
+                  .reshape(_shape)
+    
+    return Checkpoint(_state, _header["steps"], _header.get("rule"),
+                      _header.get("seed"))
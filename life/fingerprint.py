@@ -0,0 +1,219 @@
+"""
+This module provides cycle detection for cellular automata Models.
+
+The states of a Model are fingerprinted by a 64 bit hash of the bit-packed
+"world" and the fingerprints of recent generations are kept in a bounded
+table. As the Models are deterministic, once any state recurs the "world"
+is in a cycle (of period 1 for a still life) forever after, and any number
+of steps may be reduced modulo the period and taken at once.
+
+Constants:
+WINDOW  -- int: the default number of recent fingerprints kept.
+
+Classes:
+Fingerprints    -- A bounded table of recent state fingerprints.
+
+Functions:
+fingerprint(state)  -- compute the 64 bit fingerprint of a state.
+create(cycles)      -- create the Fingerprints for a cycles parameter.
+"""
+
+import hashlib
+import collections
+
+import numpy
+
+
+WINDOW = 4096
+
+
+class Fingerprints:
+    """
+    A bounded table of the fingerprints of recent states of a Model.
+    
+    The table maps each fingerprint to its generation, and the oldest are
+    discarded once there are more than the window size. A cycle is detected
+    as soon as the fingerprint of a state is found in the table for another
+    generation, so any cycle with a period up to the window size is found
+    within one period of being entered. The period is then known from the
+    earlier of the two generations on, whatever generation the Model is
+    stepped to.
+    
+    Instance Variables:
+    _window     -- int:     the number of recent fingerprints kept.
+    _table      -- dict:    the generation of each fingerprint.
+    _order      -- deque:   the fingerprints in the order seen.
+    _first      -- int:     the first generation of the detected cycle, or
+                            None.
+    _period     -- int:     the period of the detected cycle, or None.
+    
+    Properties:
+    first       -- int:     the first generation of the detected cycle, or
+                            None.
+    period      -- int:     the period of the detected cycle, or None.
+    
+    Methods:
+    __init__(self[, window])
+            -- Initialize class object.
+    __len__(self)
+            -- The number of fingerprints kept.
+    clear(self)
+            -- Forget all fingerprints and any detected cycle.
+    see(self, generation, state)
+            -- Fingerprint a state, detecting a cycle.
+    skip(self, generation, steps)
+            -- The number of steps which may be skipped as whole periods.
+    """
+    
+    def __init__(self, window=WINDOW):
+        """
+        Initialize Fingerprints object.
+        
+        Parameters:
+        self    -- Fingerprints:    the object itself, Required.
+        window  -- int:             the number of recent fingerprints kept,
+                                    Default = 4096.
+        
+        Returns: None.
+        
+        Exceptions Raised:
+        ValueError  -- if window is not positive.
+        """
+        if window < 1:
+            raise ValueError(f"Invalid fingerprint window: {window}")
+        
+        self._window = window
+        
+        self._table = {}
+        self._order = collections.deque()
+        
+        self._first = None
+        self._period = None
+    
+    
+    def __len__(self):
+        """
+        The number of fingerprints kept.
+        """
+        return len(self._order)
+    
+    
+    @property
+    def first(self):
+        """
+        The first generation of the detected cycle, or None.
+        """
+        return self._first
+    
+    
+    @property
+    def period(self):
+        """
+        The period of the detected cycle, or None.
+        """
+        return self._period
+    
+    
+    def clear(self):
+        """
+        Forget all fingerprints and any detected cycle.
+        
+        Parameters:
+        self    -- Fingerprints:    the object itself, Required.
+        
+        Returns: None.
+        """
+        self._table.clear()
+        self._order.clear()
+        
+        self._first = None
+        self._period = None
+    
+    
+    def see(self, generation, state):
+        """
+        Fingerprint the state at a generation, detecting a cycle.
+        
+        Parameters:
+        self        -- Fingerprints:    the object itself, Required.
+        generation  -- int:             the generation of state, Required.
+        state       -- ndarray:         the uint8 (0 or 1) state, Required.
+        
+        Returns: int    -- the period of the detected cycle, or None.
+        """
+        if self._period is not None:
+            return self._period
+        
+        _print = fingerprint(state)
+        
+        _seen = self._table.get(_print)
+        
+        if _seen is not None and _seen != generation:
+            self._first = min(_seen, generation)
+            self._period = abs(generation - _seen)
+            
+            return self._period
+        
+        if _seen is None:
+            self._table[_print] = generation
+            self._order.append(_print)
+            
+            if len(self._order) > self._window:
+                del self._table[self._order.popleft()]
+        
+        return None
+    
+    
+    def skip(self, generation, steps):
+        """
+        The number of steps which may be skipped as whole periods.
+        
+        Parameters:
+        self        -- Fingerprints:    the object itself, Required.
+        generation  -- int:             the current generation, Required.
+        steps       -- int:             the number of steps to take,
+                                        Required.
+        
+        Returns: int    -- the greatest multiple of the period no more than
+                           steps, or 0 if no cycle is known at generation.
+        """
+        if self._period is None or generation < self._first:
+            return 0
+        
+        return steps - steps%self._period
+
+
+def fingerprint(state):
+    """
+    Compute the 64 bit fingerprint of a state.
+    
+    Parameters:
+    state   -- ndarray: the uint8 (0 or 1) state, Required.
+    
+    Returns: int    -- the 64 bit BLAKE2b hash of the bit-packed state and
+                       its shape.
+    """
+    _hash = hashlib.blake2b(repr(state.shape).encode(), digest_size=8)
+    
+    _hash.update(numpy.packbits(state))
+    
+    return int.from_bytes(_hash.digest(), "little")
+
+
+def create(cycles):
+    """
+    Create the Fingerprints for a cycles parameter of a Model.
+    
+    Parameters:
+    cycles  -- int: the number of recent fingerprints kept, 0 for no cycle
+                    detection, or a Fingerprints to use as is, Required.
+    
+    Returns: Fingerprints   -- the fingerprints, or None for none.
+    
+    Exceptions Raised:
+    ValueError  -- if cycles is negative.
+    """
+    if isinstance(cycles, Fingerprints):
+        return cycles
+    
+    return Fingerprints(cycles) if cycles else None
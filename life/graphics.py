@@ -11,6 +11,7 @@ GraphicsController  -- A Controller to pair with a GraphicsView object.
 """
 
 import sys
+import math
 import numpy
 
 from . import utils
@@ -31,6 +32,12 @@ RESOLUTION = (1280, 720)
 
 SCALE = 5.2
 
+MARGIN = 0.25   # of the visible cells, rendered around them for panning.
+
+TILE = 8        # cells a side of the tiles changes are tracked in.
+
+DIRTY = 0.5     # of the tiles changed, beyond which the display is flipped.
+
 COLOURS = [(ZERO_R, ZERO_G, ZERO_B), (ONE_R, ONE_G, ONE_B)]
 
 ICON_FILE = "icon.ico"
@@ -58,6 +65,19 @@ class GraphicsView(mvc.View):
     _colours    -- list:    the display colour scheme.
     _fullscreen -- bool:    the display is in fullscreen mode.
     _matrix     -- ndarray: the most recently provided automata state.
+    _surface    -- Surface: the 8 bit palette surface of a pixel per cell of
+                            the visible cells of _matrix and a margin, or
+                            None.
+    _cells      -- ndarray: the visible cells of _matrix and the margin last
+                            rendered to _cache, or None.
+    _cache      -- Surface: _surface scaled to the display, or None.
+    _anchor     -- tuple:   the position and display size _cache was
+                            rendered for, or None.
+    _margin     -- tuple:   the x, y margin in cells of _cache.
+    _shown      -- tuple:   the offset _cache was last flushed to _canvas
+                            at, or None.
+    _stale      -- bool:    flag to indicate _matrix has changes not yet
+                            rendered to _cache.
     _position   -- tuple:   coordinates for the top left corner of _matrix.
     _resolution -- tuple:   the (virtual) size of the display window.
     _scale      -- float:   the zoom factor in pixels/cell.
@@ -79,6 +99,12 @@ class GraphicsView(mvc.View):
             -- update and/or draw the matrix, override View.update().
     _decorate_window(self[, icon_file][, caption])
             -- set the window icon and/or caption.
+    _init_surface(self, size)
+            -- Initialize the palette surface of a size, Private.
+    _render(self)
+            -- Render the visible cells and margin to _cache, Private.
+    _dirty(self, changed, offset)
+            -- Find the display rectangles of changed cells, Private.
     
     Inherits:
     View.move(self, distance)
@@ -128,6 +154,13 @@ class GraphicsView(mvc.View):
             scale = SCALE
         
         self._matrix = None
+        self._surface = None
+        self._cells = None
+        self._cache = None
+        self._anchor = None
+        self._margin = (0, 0)
+        self._shown = None
+        self._stale = True
         self._updates = False
         self._resolution = (resolution[0], resolution[-1])
         self._scale = scale
@@ -163,6 +196,11 @@ class GraphicsView(mvc.View):
         View.update()   -- Abstract Base Class API method.
         
         This method is primarily for painting or preparing to paint the screen.
+        A matrix given is not compared with the last here, its visible cells
+        are compared when rendered at the next flush. Where only the state
+        has changed since the last flush, only the rectangles of the display
+        around the changed cells are redrawn and updated, rather than
+        flipping the whole display.
         
         Parameters:
         self    -- GraphicsView:
@@ -178,41 +216,54 @@ class GraphicsView(mvc.View):
         if self._closed:
             raise ValueError("Operation on closed View.")
         
-        if matrix is not None and (matrix != self._matrix).any():
-            self._matrix = matrix
+        if matrix is not None:
             self._updates = True
+            self._stale = True
+            
+            self._matrix = matrix
         
         if flush and self._updates:
-            r_pixels = (ONE_R - ZERO_R) \
-                      *numpy.atleast_3d(self._matrix.T) + ZERO_R
-            g_pixels = (ONE_G - ZERO_G) \
-                      *numpy.atleast_3d(self._matrix.T) + ZERO_G
-            b_pixels = (ONE_B - ZERO_B) \
-                      *numpy.atleast_3d(self._matrix.T) + ZERO_B
+            _h, _w = self._matrix.shape
+            
+            if self._anchor is not None:
+                _dx = (self._position[0] - self._anchor[0] + _w//2)%_w - _w//2
+                _dy = (self._position[1] - self._anchor[1] + _h//2)%_h - _h//2
             
-            pixels = numpy.concatenate((r_pixels, g_pixels, b_pixels), axis=2)
+            _changed = None
             
-            surface = pygame.surfarray.make_surface(pixels)
+            if self._stale or self._anchor is None \
+            or self._anchor[2] != self._canvas.get_size() \
+            or abs(_dx) > self._margin[0] or abs(_dy) > self._margin[1]:
+                _changed = self._render()
+                
+                _dx, _dy = 0, 0
             
-            #surface = pygame.transform.scale(surface,
-            #                                 self._canvas.get_rect()[2:])
+            _offset = (round((_dx - self._margin[0])*self._scale),
+                       round((_dy - self._margin[1])*self._scale))
             
-            surface = pygame.transform.scale_by(surface, self._scale)
+            if _changed is not None and _offset == self._shown:
+                _rects = self._dirty(_changed, _offset)
+            else:
+                _rects = None
             
-            for i in range(int(-self._matrix.shape[1]*self._scale),
-                           self._canvas.get_size()[0],
-                           int(self._matrix.shape[1]*self._scale)):
-                for j in range(int(-self._matrix.shape[0]*self._scale),
-                               self._canvas.get_size()[1],
-                               int(self._matrix.shape[0]*self._scale)):
-                    self._canvas.blit(
-                                surface, (self._scale*self._position[0] + i,
-                                          self._scale*self._position[1] + j))
+            if _rects is None:
+                self._canvas.blit(self._cache, _offset)
+                
+                pygame.display.flip()
+            else:
+                for _rect in _rects:
+                    self._canvas.blit(self._cache, _rect,
+                                      _rect.move(-_offset[0], -_offset[1]))
+                
+                pygame.display.update(_rects)
             
-            pygame.display.flip()
+            self._shown = _offset
+            
+            self._stale = False
             
             self._updates = False
     
+    
     def close(self):
         """
         Decommission, deactivate and delete the object permanently.
@@ -260,6 +311,140 @@ class GraphicsView(mvc.View):
         
         if caption is not None:
             pygame.display.set_caption(caption)
+    
+    
+    def _init_surface(self, size):
+        """
+        Initialize the palette surface of a size in cells.
+        
+        The surface has one 8 bit pixel per cell, the value of which indexes
+        the palette of the colour scheme, so that a state matrix is copied
+        into it as it is, one byte per cell.
+        
+        Parameters:
+        self    -- GraphicsView:    the object itself, Required.
+        size    -- tuple:           the width and height in cells, Required.
+        
+        Returns: None.
+        
+        Note: This is a private method, you should not be calling this.
+        """
+        self._surface = pygame.Surface(size, depth=8)
+        
+        self._surface.set_palette(self._colours)
+    
+    
+    def _render(self):
+        """
+        Render the visible cells, and a margin around them, to the cache.
+        
+        Only the cells visible through the display at the current position,
+        and a margin of MARGIN of as many again on each side, are gathered
+        from the torus with modular indexing, copied into the palette surface
+        and scaled. The cost is therefore that of the display, whatever the
+        size of the "world", and panning within the margin only blits the
+        cache at another offset.
+        
+        Parameters:
+        self    -- GraphicsView:    the object itself, Required.
+        
+        Returns: ndarray    -- the bool mask of the cells changed since the
+                               last render, or None if it was rendered at
+                               another position or display size.
+        
+        Note: This is a private method, you should not be calling this.
+        """
+        _h, _w = self._matrix.shape
+        _size = self._canvas.get_size()
+        
+        _cols = math.ceil(_size[0]/self._scale) + 1
+        _rows = math.ceil(_size[1]/self._scale) + 1
+        
+        self._margin = (math.ceil(_cols*MARGIN), math.ceil(_rows*MARGIN))
+        
+        _x = numpy.arange(-self._margin[0], _cols + self._margin[0]) \
+           - self._position[0]
+        _y = numpy.arange(-self._margin[1], _rows + self._margin[1]) \
+           - self._position[1]
+        
+        _cells = self._matrix[numpy.ix_(_y%_h, _x%_w)]
+        
+        if self._cells is not None and self._cells.shape == _cells.shape \
+        and self._anchor == (self._position[0], self._position[1], _size):
+            _changed = _cells != self._cells
+        else:
+            _changed = None
+        
+        if self._surface is None \
+        or self._surface.get_size() != _cells.shape[::-1]:
+            self._init_surface(_cells.shape[::-1])
+        
+        pygame.surfarray.blit_array(self._surface, _cells.T)
+        
+        self._cache = pygame.transform.scale(
+                            self._surface,
+                            (round(_cells.shape[1]*self._scale),
+                             round(_cells.shape[0]*self._scale)))
+        
+        self._cells = _cells
+        
+        self._anchor = (self._position[0], self._position[1], _size)
+        
+        return _changed
+    
+    
+    def _dirty(self, changed, offset):
+        """
+        Find the rectangles of the display covering the changed cells.
+        
+        The changed cells are tracked in tiles of TILE cells a side, and each
+        run of changed tiles along a row of tiles becomes one rectangle, with
+        a pixel to spare around it for rounding in the scaling, clipped to the
+        display. If more than DIRTY of the tiles have changed, the whole
+        display is flipped instead.
+        
+        Parameters:
+        self    -- GraphicsView:    the object itself, Required.
+        changed -- ndarray:         the bool mask of the changed cells of
+                                    _cache, Required.
+        offset  -- tuple:           the offset of _cache on _canvas,
+                                    Required.
+        
+        Returns: list   -- the Rect objects to update, or None for the whole
+                           display.
+        
+        Note: This is a private method, you should not be calling this.
+        """
+        _rows, _cols = changed.shape
+        
+        _tiles = numpy.pad(changed, ((0, -_rows%TILE), (0, -_cols%TILE))) \
+                      .reshape(-(-_rows//TILE), TILE, -(-_cols//TILE), TILE) \
+                      .any(axis=(1, 3))
+        
+        if _tiles.sum() > DIRTY*_tiles.size:
+            return None
+        
+        _edges = numpy.diff(numpy.pad(_tiles, ((0, 0), (1, 1)))
+                                 .astype(numpy.int8), axis=1)
+        
+        _starts = numpy.nonzero(_edges == 1)
+        _ends = numpy.nonzero(_edges == -1)[1]
+        
+        _span = TILE*self._scale
+        _clip = self._canvas.get_rect()
+        
+        _rects = []
+        
+        for _y, _x0, _x1 in zip(*_starts, _ends):
+            _rect = pygame.Rect(offset[0] + math.floor(_x0*_span) - 1,
+                                offset[1] + math.floor(_y*_span) - 1,
+                                math.ceil((_x1 - _x0)*_span) + 2,
+                                math.ceil(_span) + 2).clip(_clip)
+            
+            if _rect.width and _rect.height:
+                _rects.append(_rect)
+        
+        return _rects
 
 
 class GraphicsController(mvc.Controller):
@@ -339,6 +524,9 @@ class GraphicsController(mvc.Controller):
                     self._paused = not self._paused
                 elif event.key in (pygame.K_RETURN, pygame.K_s):
                     self._step = True
+                elif event.key in (pygame.K_BACKSPACE, pygame.K_b):
+                    self._paused = True
+                    self._back   = True
                 elif event.key in (pygame.K_UP, pygame.K_KP8):
                     self._view.move(( 0,  1))
                 elif event.key in (pygame.K_DOWN, pygame.K_KP2):
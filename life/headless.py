@@ -0,0 +1,354 @@
+"""
+Headless Controller for cellular automata Models with no View.
+
+This module provides a Controller element of a Model-View-Controller design
+pattern for running cellular automata as fast as possible without any
+display, for batch runs on machines without a terminal or a display. Neither
+curses nor PyGame is imported.
+
+Constants:
+DEAD    -- string:  the character of a dead cell in a plaintext file.
+ALIVE   -- string:  the character of a living cell in a plaintext file.
+POLL    -- float:   the most seconds a step should take while the run has no
+                    end or checkpoints are due by time.
+
+Classes:
+HeadlessController  -- A Controller to run a Model with no View.
+
+Functions:
+write_cells(path, matrix[, comments])
+        -- write a state matrix to a plaintext (.cells) file.
+"""
+
+import sys
+import time
+
+import numpy
+
+from . import mvc
+
+
+DEAD  = '.'
+ALIVE = 'O'
+
+POLL = 1.0
+
+
+class HeadlessController(mvc.Controller):
+    """
+    A Controller class running cellular automata with no View.
+    
+    The Model is stepped in a tight loop, with no events to handle, no View
+    to update and no delay, either for a given number of steps or, failing
+    that, until the Model is found to have entered a cycle or the run is
+    interrupted (with Ctrl-C). A Model with cycle detection is stepped one
+    step at a time until its period is found, and then straight to the end.
+    Any other Model is stepped straight to the end, or to the next
+    checkpoint due, so that a Model which advances many generations at once
+    (e.g. HashLife) may do so.
+    The throughput and final statistics are then reported and the final
+    state optionally written to a file. This class is intended to be used
+    with compatible Model objects as part of a Model-View-Controller design
+    pattern.
+    
+    Extends:
+    .mvc.Controller -- Abstract Base Class for Controllers in the
+                       Model-View-Controller.
+    
+    Instance Variables:
+    _model      -- Model:   the Model object to run.
+    _view       -- View:    the View object, Ignored.
+    _delay      -- float:   additional delay in seconds, Ignored.
+    _running    -- bool:    the automaton is not finished.
+    _paused     -- bool:    the automaton is paused, Ignored.
+    _count      -- int:     the number of steps to run, or None.
+    _output     -- string:  the path of the file for the final state, or
+                            None.
+    _stream     -- file:    the stream for the report.
+    _autosave   -- Autosave:
+                            the periodic checkpoints of the Model, or None.
+    _closed     -- bool:    the object has been terminated.
+    
+    Methods:
+    __init__(self[, model][, view][, delay][, paused][, steps][, output][,
+                    stream][, autosave][, **kwargs])
+            -- Initialize class object, override Controller.__init__().
+    handle_events(self)
+            -- Handle no events, override Controller.handle_events().
+    run(self)
+            -- Run the Model to the end, override Controller.run().
+    _target(self, last, stride)
+            -- The step count to step the Model straight to, Private.
+    _report(self, steps, seconds, period)
+            -- Report the throughput and final statistics, Private.
+    
+    Inherits:
+    Controller.close(self)
+            -- Decommission, deactivate and delete the object.
+    Controller.connect_model(self, model)
+            -- Connect a Model object to the Controller.
+    Controller.connect_view(self, view)
+            -- Connect a View object to the Controller.
+    
+    Warning:
+    Any assignment to instance variables or calls to private methods will
+    result in the object entering an illegal and potentially unrecoverable
+    state.
+    """
+    
+    def __init__(self, model=None, view=None, delay=0, paused=False,
+                       steps=None, output=None, stream=None, autosave=None,
+                       **kwargs):
+        """
+        Initialize HeadlessController object.
+        
+        Overrides:
+        Controller.__init__()   -- Base Class initializer.
+        
+        Parameters:
+        self        -- HeadlessController:
+                                    the object itself, Required.
+        model       -- Model:       the Model to control and run,
+                                    Default = None.
+        view        -- View:        the View, Default = None, Ignored.
+        delay       -- float:       the delay per cycle, Default = 0,
+                                    Ignored.
+        paused      -- bool:        Start paused, Default = False, Ignored.
+        steps       -- int:         the number of steps to run,
+                                    Default = None to run until a cycle is
+                                    found or the run is interrupted.
+        output      -- string:      the path of a plaintext (.cells) file to
+                                    write the final state to,
+                                    Default = None for none.
+        stream      -- file:        the stream for the report,
+                                    Default = None for sys.stdout.
+        autosave    -- Autosave:    the periodic checkpoints of the Model,
+                                    Default = None for none.
+        **kwargs    -- dict:        catch any additional arguments.
+        
+        Returns: None.
+        """
+        super().__init__(model, view, delay, paused, autosave, **kwargs)
+        
+        self._count  = steps
+        self._output = output
+        self._stream = stream
+    
+    
+    def handle_events(self):
+        """
+        Handle no events, there is no user input without a View.
+        
+        Overrides:
+        Controller.handle_events()  -- Abstract Base Class API method.
+        
+        Parameters:
+        self    -- HeadlessController:  the object itself, Required.
+        
+        Returns None.
+        
+        Exceptions Raised:
+        ValueError  -- if self has already been closed with self.close().
+        """
+        if self._closed:
+            raise ValueError("Operation on closed Controller.")
+    
+    
+    def run(self):
+        """
+        Run the Model to the end as fast as possible.
+        
+        The Model is stepped with no delay until the number of steps has been
+        run, or with no number of steps until the Model is found to have
+        entered a cycle. Without cycle detection, or once the period is
+        known, the Model is stepped many steps at a time (see _target()). An
+        interruption (KeyboardInterrupt) ends the run
+        early. With an autosave, checkpoints are captured between steps as
+        they fall due and written in the background, and a last one is
+        written at the end. The report is then written, the final state
+        saved if a file was given and the Controller closed, also closing the
+        Model.
+        
+        Overrides:
+        Controller.run()    -- Base Class main control loop.
+        
+        Parameters:
+        self    -- HeadlessController:  the object itself, Required.
+        
+        Returns: int    -- the period of the cycle the Model was found to
+                           have entered, or None.
+        
+        Exceptions Raised:
+        ValueError  --  if self has already been closed with self.close().
+        """
+        if self._closed:
+            raise ValueError("Operation on closed Controller.")
+        
+        if self._model is None:
+            self.close()
+            
+            return None
+        
+        _first = self._model._steps
+        
+        _last = None if self._count is None else _first + self._count
+        
+        _period = None
+        
+        _stride = 1
+        
+        if self._autosave is not None:
+            self._autosave.due(self._model)
+        
+        _start = time.perf_counter()
+        
+        try:
+            while self._running and (_last is None
+                                     or self._model._steps < _last):
+                if _period is None \
+                and getattr(self._model, "_cycles", None) is not None:
+                    self._model.step()
+                    
+                    _period = self._model.period
+                    
+                    if _period is not None and _last is None:
+                        self._running = False
+                else:
+                    _begin = time.perf_counter()
+                    
+                    self._model.step(self._target(_last, _stride)
+                                     - self._model._steps)
+                    
+                    _took = time.perf_counter() - _begin
+                    
+                    if _took < POLL/2:
+                        _stride *= 2
+                    elif _took > POLL:
+                        _stride = max(1, _stride//2)
+                
+                if self._autosave is not None \
+                and self._autosave.due(self._model):
+                    self._autosave.save(self._model)
+        except KeyboardInterrupt:
+            pass
+        except BaseException:
+            self.close()
+            
+            raise
+        
+        _seconds = time.perf_counter() - _start
+        
+        try:
+            self._report(self._model._steps - _first, _seconds, _period)
+            
+            if self._output is not None:
+                write_cells(self._output, self._model._mat,
+                            [f"Generation: {self._model._steps}"])
+            
+            if self._autosave is not None:
+                self._autosave.save(self._model, wait=True)
+        finally:
+            self.close()
+        
+        return _period
+    
+    
+    def _target(self, last, stride):
+        """
+        The step count to step the Model straight to.
+        
+        This is the end of the run, or the step count at which the next
+        checkpoint is due, if by steps, whichever is sooner. Where the run
+        has no end, or checkpoints are due by time, the Model is stepped at
+        most stride steps, which run() doubles while steps take well under
+        POLL seconds (and halves should they take longer).
+        
+        Parameters:
+        self    -- HeadlessController:  the object itself, Required.
+        last    -- int:                 the step count of the end of the
+                                        run, or None, Required.
+        stride  -- int:                 the most steps to take without an
+                                        end or by time, Required.
+        
+        Returns: int    -- the step count, after the Model's own.
+        
+        Note:
+        This is a private "helper" method, it is called by run().
+        """
+        _targets = [last]
+        
+        if last is None or (self._autosave is not None
+                            and self._autosave.seconds is not None):
+            _targets.append(self._model._steps + stride)
+        
+        if self._autosave is not None:
+            _targets.append(self._autosave.next())
+        
+        return max(self._model._steps + 1,
+                   min(_target for _target in _targets
+                       if _target is not None))
+    
+    
+    def _report(self, steps, seconds, period):
+        """
+        Report the throughput and final statistics of the run.
+        
+        Parameters:
+        self    -- HeadlessController:  the object itself, Required.
+        steps   -- int:                 the number of steps run, Required.
+        seconds -- float:               the time taken, Required.
+        period  -- int:                 the period of the cycle found, or
+                                        None, Required.
+        
+        Returns: None.
+        
+        Note:
+        This is a private "helper" method, it is called by run().
+        """
+        _stream = self._stream or sys.stdout
+        
+        _mat = self._model._mat
+        
+        _rate = steps/seconds if seconds > 0 else float("inf")
+        
+        _stream.write(f"generation:    {self._model._steps}\n"
+                      f"steps:         {steps}\n"
+                      f"seconds:       {seconds:.6g}\n"
+                      f"generations/s: {_rate:.6g}\n"
+                      f"cells/s:       {_rate*_mat.size:.6g}\n"
+                      f"population:    {int(_mat.sum())} of {_mat.size}\n"
+                      f"period:        {period}\n")
+        
+        _stream.flush()
+
+
+def write_cells(path, matrix, comments=()):
+    """
+    Write a state matrix to a plaintext (.cells) file.
+    
+    Each row of the matrix is written as a line of '.' for dead and 'O' for
+    living cells, after a '!' line for each comment.
+    
+    Parameters:
+    path        -- string:  the path of the file, Required.
+    matrix      -- ndarray: the uint8 (0 or 1) state matrix, Required.
+    comments    -- list:    the strings of the comment lines, Default = ().
+    
+    Returns: None.
+    
+    Exceptions Raised:
+    OSError     -- if the file cannot be written.
+    """
+    _text = numpy.where(matrix != 0, numpy.uint8(ord(ALIVE)),
+                                     numpy.uint8(ord(DEAD)))
+    
+    _lines = numpy.full((_text.shape[0], _text.shape[1] + 1), ord('\n'),
+                        dtype=numpy.uint8)
+    
+    _lines[:, :-1] = _text
+    
+    with open(path, "wb") as _file:
+        for _comment in comments:
+            _file.write(f"!{_comment}\n".encode())
+        
+        _file.write(_lines.tobytes())
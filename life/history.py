@@ -0,0 +1,220 @@
+"""
+This module provides bounded rollback history for cellular automata Models.
+
+The history of a Model is kept as a ring of XOR deltas between successive
+recorded states, each bit-packed and optionally zlib compressed, within a
+memory budget given in bytes. Only the current state is ever held in full,
+any earlier state is recovered by XORing the deltas back out of it, newest
+first. As most cells do not change from one generation to the next the
+deltas are sparse, and compress very well.
+
+Classes:
+History -- A bounded ring of XOR deltas of past states.
+
+Functions:
+create(rollback)    -- create the History for a rollback parameter.
+"""
+
+import zlib
+import collections
+
+import numpy
+
+
+class History:
+    """
+    A bounded ring of XOR deltas of the past states of a Model.
+    
+    Each entry spans a run of steps, from the generation at its start to that
+    at its stop, which is the start of the next entry. The entries are kept
+    in a deque, the oldest of which are discarded to keep the total size of
+    the deltas within the budget.
+    
+    Instance Variables:
+    _budget     -- int:     the memory budget for the deltas in bytes.
+    _compress   -- bool:    the deltas are zlib compressed.
+    _entries    -- deque:   the (start, stop, shape, delta) entries, oldest
+                            first.
+    _bytes      -- int:     the total size of the deltas in bytes.
+    
+    Properties:
+    first       -- int:     the generation of the oldest recoverable state,
+                            or None.
+    nbytes      -- int:     the total size of the deltas in bytes.
+    
+    Methods:
+    __init__(self, budget[, compress])
+            -- Initialize class object.
+    __len__(self)
+            -- The number of entries.
+    clear(self)
+            -- Discard all entries.
+    record(self, start, stop, before, after)
+            -- Record the delta of a run of steps.
+    rewind(self, state, stop, target)
+            -- Recover an earlier state.
+    """
+    
+    def __init__(self, budget, compress=False):
+        """
+        Initialize History object.
+        
+        Parameters:
+        self        -- History: the object itself, Required.
+        budget      -- int:     the memory budget for the deltas in bytes,
+                                Required.
+        compress    -- bool:    zlib compress the deltas, Default = False.
+        
+        Returns: None.
+        
+        Exceptions Raised:
+        ValueError  -- if budget is negative.
+        """
+        if budget < 0:
+            raise ValueError(f"Negative rollback budget: {budget}")
+        
+        self._budget = budget
+        self._compress = compress
+        
+        self._entries = collections.deque()
+        
+        self._bytes = 0
+    
+    
+    def __len__(self):
+        """
+        The number of entries, runs of steps, in the history.
+        """
+        return len(self._entries)
+    
+    
+    @property
+    def first(self):
+        """
+        The generation of the oldest recoverable state, or None if empty.
+        """
+        return self._entries[0][0] if self._entries else None
+    
+    
+    @property
+    def nbytes(self):
+        """
+        The total size of the deltas in bytes.
+        """
+        return self._bytes
+    
+    
+    def clear(self):
+        """
+        Discard all entries.
+        
+        Parameters:
+        self    -- History: the object itself, Required.
+        
+        Returns: None.
+        """
+        self._entries.clear()
+        
+        self._bytes = 0
+    
+    
+    def record(self, start, stop, before, after):
+        """
+        Record the delta of a run of steps.
+        
+        If start is not the stop of the newest entry, the history is no longer
+        contiguous and is cleared first. The oldest entries are then discarded
+        until the new delta fits within the budget, a delta larger than the
+        whole budget is not recorded at all.
+        
+        Parameters:
+        self    -- History: the object itself, Required.
+        start   -- int:     the generation of before, Required.
+        stop    -- int:     the generation of after, Required.
+        before  -- ndarray: the uint8 (0 or 1) state at start, Required.
+        after   -- ndarray: the uint8 (0 or 1) state at stop, Required.
+        
+        Returns: None.
+        """
+        if self._entries and self._entries[-1][1] != start:
+            self.clear()
+        
+        _delta = numpy.packbits(numpy.bitwise_xor(before, after)).tobytes()
+        
+        if self._compress:
+            _delta = zlib.compress(_delta, 1)
+        
+        if len(_delta) > self._budget:
+            self.clear()
+            
+            return
+        
+        while self._entries and self._bytes + len(_delta) > self._budget:
+            self._bytes -= len(self._entries.popleft()[3])
+        
+        self._entries.append((start, stop, before.shape, _delta))
+        
+        self._bytes += len(_delta)
+    
+    
+    def rewind(self, state, stop, target):
+        """
+        Recover an earlier state by XORing deltas out of the current state.
+        
+        Entries are consumed newest first until the generation is no later
+        than target. This may be earlier than target if an entry spans a run
+        of several steps, in which case the caller must step forward again.
+        
+        Parameters:
+        self    -- History: the object itself, Required.
+        state   -- ndarray: a writable copy of the state at stop, which is
+                            modified in place, Required.
+        stop    -- int:     the current generation, Required.
+        target  -- int:     the generation to recover, Required.
+        
+        Returns: tuple  -- the generation reached and its state.
+        
+        Exceptions Raised:
+        ValueError  -- if target is before the oldest recoverable state.
+        """
+        if target < stop and (not self._entries
+                              or self._entries[-1][1] != stop
+                              or target < self._entries[0][0]):
+            raise ValueError(f"Generation {target} is beyond the rollback "
+                              "history")
+        
+        while stop > target:
+            _start, _stop, _shape, _delta = self._entries.pop()
+            
+            self._bytes -= len(_delta)
+            
+            if self._compress:
+                _delta = zlib.decompress(_delta)
+            
+            _bits = numpy.unpackbits(numpy.frombuffer(_delta, numpy.uint8),
+                                     count=state.size)
+            
+            numpy.bitwise_xor(state, _bits.reshape(_shape), out=state)
+            
+            stop = _start
+        
+        return stop, state
+
+
+def create(rollback):
+    """
+    Create the History for a rollback parameter of a Model.
+    
+    Parameters:
+    rollback    -- int:     the memory budget in bytes, 0 for no history, or
+                            a History to use as is, Required.
+    
+    Returns: History    -- the history, or None for none.
+    
+    Exceptions Raised:
+    ValueError  -- if rollback is negative.
+    """
+    if isinstance(rollback, History):
+        return rollback
+    
+    return History(rollback) if rollback else None
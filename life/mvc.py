@@ -1,13 +1,21 @@
 """
 Abstract Base Classes (ABCs) for Model-View-Controllers for cellular automata.
 
+Constants:
+FRAME_RATE  -- int: the maximum number of View updates per second.
+
 Classes:
 Model       -- ABC for cellular automaton Models.
 View        -- ABC for cellular automaton Views.
 Controller  -- ABC for cellular automaton Controllers.
+FrameBuffer -- Buffered frames passed from a simulation to a View.
 """
 
 import time
+import threading
+
+
+FRAME_RATE = 60
 
 
 class Model:
@@ -16,9 +24,22 @@ class Model:
     
     Instance Variables:
     _closed -- bool:    the object has been terminated.
+    _past   -- History: the rollback history for back-steps, or None.
+    _frames -- Timeline:
+                        the keyframes for step_to(), or None.
+    _cycles -- Fingerprints:
+                        the recent fingerprints for cycle detection, or None.
+    _generation
+            -- int:     the number of changes of state, Default = 0.
+    
+    Properties:
+    period      -- int:     the period of the cycle the model has entered, or
+                            None.
+    generation  -- int:     the number of changes of state, increasing.
     
     Methods:
-    __init__(self, size[, density][, source][, offset][, rollback][, **kwargs])
+    __init__(self, size[, density][, source][, offset][, rollback][, rule][,
+                   keyframes][, cycles][, **kwargs])
             -- Initialize class object, Abstract.
     close(self)
             -- Decommission, deactivate and delete the object.
@@ -27,7 +48,21 @@ class Model:
     step(self[, steps])
             -- Advance or retract the model relative, Abstract.
     step_to(self, steps)
-            -- Advance or retract the model absolute, Abstract.
+            -- Advance or retract the model absolute.
+    restore(self, steps, state)
+            -- Replace the state and the step count.
+    _snapshot(self)
+            -- Return a copy of the state, Private.
+    _load(self, state)
+            -- Replace the state, Private.
+    _remember(self)
+            -- Return the state to record before stepping, Private.
+    _record(self, memory)
+            -- Record the steps since _remember(), Private.
+    _skip(self, steps)
+            -- Skip whole periods of a detected cycle, Private.
+    _rewind(self, steps)
+            -- Retract the model using the history, Private.
     
     Note:
     Classes implementing/extending Model should raise ValueError if public
@@ -35,8 +70,11 @@ class Model:
     This will ensure that assumptions about validity are not violated.
     """
     
+    _generation = 0
+    
     def __init__(self, size, density=None, source=None, offset=None,
-                             rollback=0, **kwargs):
+                             rollback=0, rule="B3/S23", keyframes=None,
+                             cycles=0, **kwargs):
         """
         Initializer for Model objects, Abstract.
         
@@ -46,11 +84,20 @@ class Model:
                                 Required.
         density     -- float:   the initial statistical density of living
                                 cells, Default = 0.5.
-        source      -- string:  a file name to initialize the "world",
-                                Default = None.
-        offset      -- tuple:   the offset coordinates for source,
+        source      -- string:  the path of a pattern file to initialize the
+                                "world", Default = None.
+        offset      -- tuple:   the x, y coordinates of the top left of the
+                                pattern, Default = None.
+        rollback    -- int:     the rollback memory budget in bytes for
+                                back-steps, or a history.History,
+                                Default = 0 for none.
+        rule        -- string:  the Life-like rule in B/S notation, e.g.
+                                "B36/S23" for HighLife, Default = "B3/S23".
+        keyframes   -- string:  the path of a timeline file of keyframes for
+                                step_to(), or a timeline.Timeline,
                                 Default = None.
-        rollback    -- int:     the requested rollback memory for back-steps,
+        cycles      -- int:     the number of recent states fingerprinted for
+                                cycle detection, or a fingerprint.Fingerprints,
                                 Default = 0.
         
         Returns: None.
@@ -60,6 +107,29 @@ class Model:
         """
         raise NotImplementedError
     
+    @property
+    def period(self):
+        """
+        The period of the cycle the model has entered, or None.
+        
+        This is 1 for a still life (or an empty "world"), and is None until a
+        state recurs within the fingerprint window or if there is none.
+        """
+        _cycles = getattr(self, "_cycles", None)
+        
+        return None if _cycles is None else _cycles.period
+    
+    @property
+    def generation(self):
+        """
+        The number of changes of state, a counter which only ever increases.
+        
+        The counter is advanced by every call which steps, back-steps or
+        seeks the model, so that a View (or anything else) need only compare
+        it with the value it last saw to know whether there is a new state.
+        """
+        return self._generation
+    
     def step(self, steps=1):
         """
         Advance or retract the model some number of steps, Abstract.
@@ -78,18 +148,111 @@ class Model:
     
     def step_to(self, steps):
         """
-        Advance or retract the model to some point, Abstract.
+        Advance or retract the model to some absolute number of steps.
+        
+        The model is retracted with the rollback history if it reaches back
+        to steps. Otherwise the nearest keyframe at or before steps, if any,
+        is loaded when it is at or ahead of the current state (so that a
+        reopened timeline replays its own run, not the model's initial
+        state) or the model must be retracted, and the model is advanced
+        from there, stopping at every
+        Kth step for keyframes to be recorded. Seeking with a timeline of
+        keyframes every K steps therefore costs no more than about K steps,
+        wherever steps is.
         
         Parameters:
         self    -- Model:   the object itself, Required.
-        steps   -- int:     the point to advance or retract to, Required.
+        steps   -- int:     the number of steps from initial state to advance
+                            or retract to, Required.
         
         Returns: None.
         
         Exceptions Raised:
-        NotImplementedError -- always.
+        ValueError  -- if self has already been closed with self.close(), if
+                       steps is negative, or if steps is before both the
+                       rollback history and the first keyframe.
         """
-        raise NotImplementedError
+        if self._closed:
+            raise ValueError("Operation on closed Model.")
+        
+        if steps < 0:
+            raise ValueError(f"Invalid number of steps: {steps}")
+        
+        if steps < self._steps and self._past is not None \
+        and self._past.first is not None and self._past.first <= steps:
+            self._rewind(self._steps - steps)
+            
+            return
+        
+        _key = None if self._frames is None else self._frames.nearest(steps)
+        
+        if _key is not None and (steps < self._steps or self._steps <= _key):
+            _state = self._frames.load(_key, self._snapshot())
+            
+            self._steps = _key
+            
+            self._load(_state)
+            
+            self._generation += 1
+            
+            if self._past is not None:
+                self._past.clear()
+            
+            if self._cycles is not None:
+                self._cycles.clear()
+        
+        while self._frames is not None and self._steps < steps:
+            self.step(min(steps, self._frames.boundary(self._steps))
+                      - self._steps)
+        
+        self.step(steps - self._steps)
+    
+    def restore(self, steps, state):
+        """
+        Replace the state and the step count, as from a checkpoint.
+        
+        The state is copied into a snapshot of the model's own and loaded as
+        by a back-step, and the rollback history and fingerprints, which are
+        of another run, are cleared.
+        
+        Parameters:
+        self    -- Model:   the object itself, Required.
+        steps   -- int:     the step count of the state, Required.
+        state   -- ndarray: the uint8 (0 or 1) state, of the shape of
+                            _snapshot(), Required.
+        
+        Returns: None.
+        
+        Exceptions Raised:
+        ValueError  -- if self has already been closed with self.close(), if
+                       steps is negative, or if state is not of the shape of
+                       the model's state.
+        """
+        if self._closed:
+            raise ValueError("Operation on closed Model.")
+        
+        if steps < 0:
+            raise ValueError(f"Invalid number of steps: {steps}")
+        
+        _state = self._snapshot()
+        
+        if _state.shape != state.shape:
+            raise ValueError(f"State of shape {state.shape} does not fit "
+                             f"the model of shape {_state.shape}")
+        
+        _state[...] = state
+        
+        self._steps = steps
+        
+        self._load(_state)
+        
+        self._generation += 1
+        
+        if self._past is not None:
+            self._past.clear()
+        
+        if self._cycles is not None:
+            self._cycles.clear()
     
     def reset(self):
         """
@@ -110,16 +273,174 @@ class Model:
         Decommission, deactivate and delete the object permanently.
         
         This is the only non-abstract method in this class and provides basic
-        decommissioning however subclasses implementing this may need to
-        override or extend this to ensure that memory and state are managed
-        and respected cleanly.
+        decommissioning, closing the keyframe timeline, if any, however
+        subclasses implementing this may need to override or extend this to
+        ensure that memory and state are managed and respected cleanly.
         
         Parameters:
         self    -- Model:   the object itself, Required.
         
         Returns None.
         """
+        if getattr(self, "_frames", None) is not None:
+            self._frames.close()
+        
         self._closed = True
+    
+    def _snapshot(self):
+        """
+        Return a copy of the state (world) matrix, for the rollback history.
+        
+        Subclasses whose state is not fully held in _mat should override
+        this, together with _load().
+        
+        Parameters:
+        self    -- Model:   the object itself, Required.
+        
+        Returns: ndarray    -- the writable uint8 (0 or 1) copy of the state.
+        
+        Note:
+        This is a private "helper" method for the rollback history.
+        """
+        return self._mat.copy()
+    
+    def _load(self, state):
+        """
+        Replace the state (world) matrix, from the rollback history.
+        
+        Subclasses which do not hold their state in a plain _mat attribute
+        should override this, together with _snapshot().
+        
+        Parameters:
+        self    -- Model:   the object itself, Required.
+        state   -- ndarray: the uint8 (0 or 1) state as from _snapshot(),
+                            Required.
+        
+        Returns None.
+        
+        Note:
+        This is a private "helper" method for the rollback history.
+        """
+        self._mat = state
+    
+    def _remember(self):
+        """
+        Return the state to record before stepping forward, if any.
+        
+        A keyframe of the current state is also recorded, if one is due, and
+        the first state is fingerprinted for cycle detection.
+        
+        Parameters:
+        self    -- Model:   the object itself, Required.
+        
+        Returns: tuple  -- the step count and a snapshot of the state, or None
+                           for the snapshot if there is no rollback history.
+        
+        Note:
+        This is a private "helper" method for the rollback history.
+        """
+        if self._frames is not None and self._frames.due(self._steps):
+            self._frames.record(self._steps, self._snapshot())
+        
+        if self._cycles is not None and not self._cycles:
+            self._cycles.see(self._steps, self._snapshot())
+        
+        if self._past is None:
+            return self._steps, None
+        
+        return self._steps, self._snapshot()
+    
+    def _record(self, memory):
+        """
+        Record the steps taken since _remember() in the rollback history.
+        
+        A keyframe of the new state is also recorded, if one is due, the new
+        state is fingerprinted for cycle detection until a cycle is found and
+        the generation advanced.
+        
+        Parameters:
+        self    -- Model:   the object itself, Required.
+        memory  -- tuple:   the value returned by _remember(), Required.
+        
+        Returns None.
+        
+        Note:
+        This is a private "helper" method for the rollback history.
+        """
+        if memory[1] is not None and memory[0] != self._steps:
+            self._past.record(memory[0], self._steps, memory[1],
+                                 self._snapshot())
+        
+        if memory[0] != self._steps:
+            self._generation += 1
+        
+        if self._frames is not None and self._frames.due(self._steps):
+            self._frames.record(self._steps, self._snapshot())
+        
+        if self._cycles is not None and self._cycles.period is None:
+            self._cycles.see(self._steps, self._snapshot())
+    
+    def _skip(self, steps):
+        """
+        Skip whole periods of a detected cycle, returning the steps left.
+        
+        Once the model is in a cycle of period p, advancing by any multiple of
+        p leaves the state unchanged, so only steps modulo p need be taken and
+        the step count is advanced by the rest at once.
+        
+        Parameters:
+        self    -- Model:   the object itself, Required.
+        steps   -- int:     the number of steps to advance, Required.
+        
+        Returns: int    -- the number of steps still to be taken.
+        
+        Note:
+        This is a private "helper" method for cycle detection.
+        """
+        if self._cycles is None:
+            return steps
+        
+        _skipped = self._cycles.skip(self._steps, steps)
+        
+        self._steps += _skipped
+        
+        return steps - _skipped
+    
+    def _rewind(self, steps):
+        """
+        Retract the model some number of steps using the rollback history.
+        
+        If the history holds runs of several steps, the model may be retracted
+        further than requested and is then advanced forward again.
+        
+        Parameters:
+        self    -- Model:   the object itself, Required.
+        steps   -- int:     the number of steps to retract, Required.
+        
+        Returns None.
+        
+        Exceptions Raised:
+        ValueError  -- if steps is further back than the rollback history.
+        
+        Note:
+        This is a private "helper" method for the rollback history.
+        """
+        _target = self._steps - steps
+        
+        if self._past is None:
+            raise ValueError("Back-steps require a rollback history")
+        
+        _steps, _state = self._past.rewind(self._snapshot(), self._steps,
+                                              _target)
+        
+        self._steps = _steps
+        
+        self._load(_state)
+        
+        self._generation += 1
+        
+        if _steps < _target:
+            self.step(_target - _steps)
 
 
 class View:
@@ -182,6 +503,10 @@ class View:
         Update the internal matrix and/or flush to the view screen, Abstract.
         
         This method is primarily for painting or preparing to paint the screen.
+        The View should keep the latest matrix given in place of any earlier
+        one, which may then be reused by the caller (see FrameBuffer). The
+        caller only gives a matrix for a new state, so the View should not
+        compare it with the last in full, only the cells it draws.
         
         Parameters:
         self    -- Model:   the object itself, Required.
@@ -296,10 +621,21 @@ class Controller:
     _delay      -- float:   additional delay in seconds added to each loop.
     _running    -- bool:    the automaton is not finished.
     _paused     -- bool:    the automaton is paused.
+    _step       -- bool:    a single step is requested.
+    _back       -- bool:    a single back-step is requested.
+    _buffer     -- FrameBuffer:
+                            the frames published by the simulation thread.
+    _period     -- int:     the period of the cycle found, or None.
+    _error      -- Exception:
+                            the Exception raised on the simulation thread, or
+                            None.
+    _autosave   -- Autosave:
+                            the periodic checkpoints of the Model, or None.
     _closed     -- bool:    the object has been terminated.
     
     Methods:
-    __init__(self[, model][, view][, delay][, paused][, **kwargs])
+    __init__(self[, model][, view][, delay][, paused][, autosave][,
+                    **kwargs])
             -- Initialize class object.
     close(self)
             -- Decommission, deactivate and delete the object.
@@ -311,6 +647,8 @@ class Controller:
             -- Handle interface specific events (e.g. user input).
     run(self)
             -- Run the main control loop.
+    _simulate(self)
+            -- Run the simulation loop, Private.
     
     Note:
     Classes implementing/extending Controller should raise ValueError if public
@@ -318,8 +656,10 @@ class Controller:
     This will ensure that assumptions about validity are not violated.
     """
     
+    _autosave = None
+    
     def __init__(self, model=None, view=None, delay=0.01,
-                       paused=False, **kwargs):
+                       paused=False, autosave=None, **kwargs):
         """
         Initializer for Controller objects.
         
@@ -332,6 +672,9 @@ class Controller:
         delay       -- float:       the additional delay in seconds per cycle,
                                     Default = 0.01.
         paused      -- bool:        Start the simulation in paused state.
+        autosave    -- Autosave:    the periodic checkpoints of the Model (see
+                                    checkpoint.Autosave), Default = None for
+                                    none.
         **kwargs    -- int:         catch any additional arguments provided by
                                     subclasses if they should go through to the
                                     keeper.
@@ -354,7 +697,10 @@ class Controller:
             self._running = True
             self._paused  = paused
             self._step    = False
+            self._back    = False
             self._closed  = False
+            
+            self._autosave = autosave
     
     def connect_model(self, model):
         """
@@ -420,18 +766,27 @@ class Controller:
         """
         Run the main control loop.
         
-        This method sequentially and iteratively updates the Model, updates
-        the View and calls its own event handler. It loops until the
-        self._running flag flips to False (usually due to some event) and then
-        calls self.close() on itself. It also calls self.close() if it
-        encounters KeyboardInterrupt or any other Exception before re-raising
-        in the latter case and so fails gracefully allowing any cleanup to
-        occur.
+        The Model is stepped on a simulation thread (see _simulate()), which
+        publishes each new generation to a FrameBuffer, while this (the main)
+        thread calls the event handler and updates the View with the latest
+        published frame, if it is new, at most FRAME_RATE times per second.
+        A slow View therefore only drops frames rather than slowing the
+        simulation, a slow step does not hold up the handling of events, and
+        a paused Model leaves the View with nothing to do. With an autosave,
+        checkpoints are captured by the simulation thread as they fall due
+        and written in the background, and a last one is written once the
+        loop ends, or is interrupted, unless by an Exception. It loops until
+        the self._running flag flips to False (usually due to some event),
+        waits for the simulation thread and then calls self.close() on
+        itself. It also calls self.close() if it encounters KeyboardInterrupt
+        or any other Exception, on either thread, before re-raising in the
+        latter case and so fails gracefully allowing any cleanup to occur.
         
         Parameters:
         self    -- Controller:  the object itself, Required.
         
-        Returns None.
+        Returns: int    -- the period of the cycle the Model was found to
+                           have entered, or None.
         
         Exceptions Raised:
         ValueError  --  if self has already been closed with self.close().
@@ -439,39 +794,129 @@ class Controller:
         if self._closed:
             raise ValueError("Operation on closed Controller.")
         
+        self._buffer = FrameBuffer()
+        self._period = None
+        self._error  = None
+        
+        _thread = threading.Thread(target=self._simulate, daemon=True)
+        
         try:
+            _thread.start()
+            
             while self._running:
+                _start = time.perf_counter()
+                
                 self.handle_events()
                 
-                if self._model is not None and self._running \
-                and ((not self._paused) or self._step
-                     or self._model._steps == 0): ### WARNING Private! Fix...
+                _frame = self._buffer.acquire()
+                
+                if self._view is not None and self._running:
+                    self._view.update(_frame, True)
+                
+                self._buffer.release()
+                
+                time.sleep(max(0, 1/FRAME_RATE
+                                  - (time.perf_counter() - _start)))
+        except KeyboardInterrupt:
+            self._running = False
+        except BaseException:
+            self._running = False
+            
+            _thread.join()
+            
+            self.close()
+            
+            raise
+        
+        _thread.join()
+        
+        try:
+            if self._autosave is not None and self._model is not None \
+            and self._error is None:
+                self._autosave.save(self._model, wait=True)
+        finally:
+            self.close()
+        
+        if self._error is not None:
+            raise self._error
+        
+        return self._period
+    
+    def _simulate(self):
+        """
+        Run the simulation loop, on the simulation thread.
+        
+        This method steps the Model (or back-steps it on request, if its
+        rollback history allows, otherwise ignoring the request) while it is
+        not paused, publishing each new generation to the FrameBuffer, and
+        sleeps for the delay after each step. Without a View, the loop also
+        stops as soon as the Model is found to have entered a cycle, as
+        nothing new can happen after that. A checkpoint is captured whenever
+        the autosave has one due. Any Exception is kept in self._error for
+        run() to re-raise, and stops the main loop.
+        
+        Parameters:
+        self    -- Controller:  the object itself, Required.
+        
+        Returns: None.
+        
+        Note:
+        This is a private "helper" method, it is the target of the
+        simulation thread started by run().
+        """
+        _first = True
+        
+        _published = None
+        
+        try:
+            while self._running:
+                if self._model is not None and self._back:
+                    try:
+                        self._model.step(-1)
+                    except ValueError:
+                        pass    # No (more) rollback history.
+                    
+                    self._back = False
+                elif self._model is not None \
+                and ((not self._paused) or self._step or _first):
                     self._model.step()
                     
                     self._step = False
                 
-                if self._view is not None and self._running:
-                    self._view.update(self._model._mat, True)
+                _first = False
+                
+                if self._model is not None \
+                and self._model.generation != _published:
+                    self._buffer.publish(self._model._mat)
+                    
+                    _published = self._model.generation
+                
+                if self._model is not None and self._period is None:
+                    self._period = self._model.period
+                    
+                    if self._period is not None and self._view is None:
+                        self._running = False
+                
+                if self._model is not None and self._autosave is not None \
+                and self._autosave.due(self._model):
+                    self._autosave.save(self._model)
                 
                 if not self._paused:
                     time.sleep(self._delay)
                 else:
                     time.sleep(0.01)
-        except KeyboardInterrupt:
-            self.close()
-        except BaseException:
-            self.close()
+        except BaseException as e:
+            self._error = e
             
-            raise
-        else:
-            self.close()
+            self._running = False
     
     def close(self):
         """
         Decommission, deactivate and delete the object permanently.
         
         Closing Controller calls the close() methods of the attached Model and
-        View objects (if any) before executing its own basic decommission.
+        View objects (if any), after waiting for any checkpoint still being
+        written, before executing its own basic decommission.
         Subclasses implementing this should extend this method rather than 
         overriding it to ensure that Models and Views are appropriately
         decommissioned. If a Model or View needs to be preserved (perhaps to
@@ -486,6 +931,9 @@ class Controller:
         
         Returns None.
         """
+        if self._autosave is not None:
+            self._autosave.close()
+        
         if self._model is not None:
             self._model.close()
         
@@ -493,3 +941,118 @@ class Controller:
             self._view.close()
         
         self._closed = True
+
+
+class FrameBuffer:
+    """
+    Buffered frames (state matrices) passed from a simulation to a View.
+    
+    The simulation thread copies each new state into a back buffer of its
+    own and then, under the lock, swaps it to the front. The rendering thread
+    acquires the front buffer, under the lock, to update the View. A buffer
+    is never written while it is at the front or held by the rendering
+    thread, so a View never sees a half-written matrix. As a View may keep
+    the matrix it was last given (to draw at a later flush), the buffer
+    acquired before the latest is also held until it is released, after the
+    View is updated. Usually two buffers alternate, at most four are ever
+    allocated.
+    
+    Instance Variables:
+    _lock       -- Lock:    the lock on the front and held buffers.
+    _buffers    -- list:    the buffers allocated.
+    _front      -- ndarray: the latest published buffer, or None.
+    _held       -- list:    the buffers held by the rendering thread.
+    _fresh      -- bool:    the front buffer has not yet been acquired.
+    
+    Methods:
+    __init__(self)
+            -- Initialize class object.
+    publish(self, matrix)
+            -- Publish a copy of a state matrix, on the simulation thread.
+    acquire(self)
+            -- Acquire the latest frame, on the rendering thread.
+    release(self)
+            -- Release all but the latest frame acquired.
+    """
+    
+    def __init__(self):
+        """
+        Initialize FrameBuffer object.
+        
+        Parameters:
+        self    -- FrameBuffer: the object itself, Required.
+        
+        Returns: None.
+        """
+        self._lock = threading.Lock()
+        
+        self._buffers = []
+        
+        self._front = None
+        self._held  = []
+        self._fresh = False
+    
+    def publish(self, matrix):
+        """
+        Publish a copy of a state matrix as the front buffer.
+        
+        The matrix is copied into a buffer which is neither at the front nor
+        held, outside the lock, and only swapped to the front under it.
+        
+        Parameters:
+        self    -- FrameBuffer: the object itself, Required.
+        matrix  -- ndarray:     the state matrix, Required.
+        
+        Returns: None.
+        """
+        with self._lock:
+            _busy = [self._front] + self._held
+        
+        _back = next((_buffer for _buffer in self._buffers
+                      if _buffer.shape == matrix.shape
+                      and not any(_buffer is _used for _used in _busy)),
+                     None)
+        
+        if _back is None:
+            _back = matrix.copy()
+            
+            self._buffers = [_buffer for _buffer in self._buffers
+                             if any(_buffer is _used for _used in _busy)]
+            self._buffers.append(_back)
+        else:
+            _back[...] = matrix
+        
+        with self._lock:
+            self._front = _back
+            self._fresh = True
+    
+    def acquire(self):
+        """
+        Acquire the latest frame, if it is new, holding it until released.
+        
+        Parameters:
+        self    -- FrameBuffer: the object itself, Required.
+        
+        Returns: ndarray    -- the latest published frame, or None if it has
+                               already been acquired (or there is none).
+        """
+        with self._lock:
+            if not self._fresh:
+                return None
+            
+            self._held.append(self._front)
+            self._fresh = False
+            
+            return self._front
+    
+    def release(self):
+        """
+        Release all but the latest frame acquired, once the View is updated.
+        
+        Parameters:
+        self    -- FrameBuffer: the object itself, Required.
+        
+        Returns: None.
+        """
+        with self._lock:
+            self._held = self._held[-1:]
@@ -4,14 +4,53 @@ A package containing implementations of Game of Life using NumPy.
 This package contains modules specifying classes implementing the Model
 component of a Model-View-Controller design pattern for Cellular Automata.
 The Models provided herin implement Conway's Game of Life using data
-structures and functions provided by NumPy.
+structures and functions provided by NumPy. The modules are imported on
+first access, e.g. as life.nump.roll, rather than with the package.
 
 Modules:
+block   -- A module providing a Model object implementing Game of Life with
+           a lookup table advancing 2x2 blocks from 4x4 neighbourhoods.
+bitwise -- A module providing a Model object implementing Game of Life with
+           packed bitwise (bit-sliced full adder) logic on NumPy words.
+ensemble
+        -- A module providing a Model object implementing Game of Life for an
+           ensemble of independent "worlds" stepped together.
+hashlife
+        -- A module providing a Model object implementing Game of Life with
+           Gosper's HashLife algorithm on a canonicalised quadtree.
 matmul  -- A module providing a Model object implementing Game of Life with
            standard matrix multiplication from NumPy.
+tiled   -- A module providing a Model object implementing Game of Life
+           recomputing only the tiles of the "world" which are active.
+padded  -- A module providing a Model object implementing Game of Life in
+           place on preallocated ghost cell padded buffers.
+parallel
+        -- A module providing a Model object implementing Game of Life in
+           horizontal strips over worker processes sharing memory.
 roll    -- A module providing a Model object implementing Game of Life with
            the roll() function from NumPy.
 """
 
-from . import roll
-from . import matmul
+import importlib
+
+# Modules, imported on first access (see __getattr__()).
+_LAZY = ("roll", "matmul", "bitwise", "hashlife", "tiled", "parallel",
+         "padded", "block", "ensemble")
+
+
+def __getattr__(name):
+    """
+    Import a module on first access, so that only the Model used is imported.
+    
+    Parameters:
+    name    -- string:  the name of the attribute, Required.
+    
+    Returns: module -- the module.
+    
+    Exceptions Raised:
+    AttributeError  -- if name is not a module of the package.
+    """
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    return importlib.import_module(f".{name}", __name__)
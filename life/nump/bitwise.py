@@ -0,0 +1,379 @@
+"""
+This module implements John Conway's Game of Life with packed bitwise logic.
+
+The Game of Life "world" is represented as a NumPy Matrix (ndarray) of packed
+uint64 words, 64 cells to a word along each row, and global neighbour summing
+is performed by bit-sliced full-adder logic (shifts, XOR, AND and OR) over the
+packed words.
+
+Classes:
+GOLNumpyBitwiseModel -- A Model of Game of Life using packed bitwise logic.
+"""
+
+import numpy
+
+from .. import fingerprint
+from .. import history
+from .. import mvc
+from .. import patterns
+from .. import rules
+from .. import timeline
+
+
+WORD = 64
+
+ONE = numpy.uint64(1)
+TOP = numpy.uint64(WORD - 1)
+
+rng = numpy.random.default_rng()
+
+
+class GOLNumpyBitwiseModel(mvc.Model):
+    """
+    A Model class implementing Game of Life as a packed bit Matrix.
+    
+    The Game of Life "world" is represented as a NumPy Matrix (ndarray) of
+    uint64 words, each holding 64 consecutive cells of a row (least
+    significant bit first). Neighbour counts are never materialized, instead
+    the eight shifted neighbour planes are reduced by bit-sliced full adders
+    and the rule is applied as a boolean expression on the resulting sum bits.
+    This processes 64 cells per machine operation and occupies an eighth of
+    the memory of the byte-per-cell Models. This class is intended to be used
+    with compatible View and Controller objects as part of a
+    Model-View-Controller pattern.
+    
+    Extends:
+    ..mvc.Model -- Abstract Base Class for Models in the Model-View-Controller.
+    
+    Instance Variables:
+    _closed -- bool:    the object has been terminated.
+    _words  -- ndarray: the packed state (world) matrix.
+    _size   -- tuple:   the dimensions (shape) of the unpacked world.
+    _steps  -- int:     the number of iterations from initial state.
+    _rule   -- uint32:  the rule lookup table.
+    _past   -- History: the rollback history, or None.
+    _frames -- Timeline:
+                        the keyframes for step_to(), or None.
+    _cycles -- Fingerprints:
+                        the recent fingerprints for cycle detection, or None.
+    _logic  -- function:
+                        the rule compiled into a function of bit planes.
+    _tail   -- int:     the number of cells used in the last word of a row.
+    _mask   -- uint64:  the mask of cells used in the last word of a row.
+    
+    Properties:
+    _mat    -- ndarray: the unpacked state (world) matrix, read only.
+    
+    Methods:
+    __init__(self, size[, density][, source][, offset][, rollback][,
+                   rule][, keyframes][, cycles])
+            -- Initialize class object, override Model.__init__().
+    reset(self)
+            -- Reset the model to initial state, Not Implemented.
+    step(self[, steps])
+            -- Advance or retract the model relative, override Model.step().
+    _load(self, state)
+            -- Replace the state, override Model._load(), Private.
+    _bitwise_step(self)
+            -- Advance the model one step, Private.
+    
+    Inherits:
+    Model.close(self)
+            -- Decommission, deactivate and delete the object.
+    Model.step_to(self, steps)
+            -- Advance or retract the model absolute.
+    
+    Warning:
+    Any assignment to instance variables or calls to private methods will
+    result in the object entering an illegal and potentially unrecoverable
+    state.
+    """
+    
+    def __init__(self, size, density=0.5, source=None, offset=None,
+                             rollback=0, rule=rules.CONWAY, keyframes=None,
+                             cycles=0):
+        """
+        Initialize GOLNumpyBitwiseModel object.
+        
+        Overrides:
+        Model.__init__()    -- Abstract Base Class initializer.
+        
+        Parameters:
+        self        -- GOLNumpyBitwiseModel:
+                                the object itself, Required.
+        size        -- tuple:   the dimensions (shape) of the "world",
+                                Required.
+        density     -- float:   the initial statistical density of living
+                                cells, Default = 0.5, Ignored.
+        source      -- string:  the path of a pattern file (.rle, .cells or
+                                .mc) to initialize the "world",
+                                Default = None for random.
+        offset      -- tuple:   the x, y coordinates of the top left of the
+                                pattern, Default = None to centre it.
+        rollback    -- int:     the rollback memory budget in bytes for
+                                back-steps, or a history.History,
+                                Default = 0 for none.
+        rule        -- string:  the Life-like rule in B/S notation,
+                                Default = "B3/S23".
+        keyframes   -- string:  the path of a timeline file of keyframes for
+                                step_to(), or a timeline.Timeline,
+                                Default = None for none.
+        cycles      -- int:     the number of recent states fingerprinted for
+                                cycle detection, or a fingerprint.Fingerprints,
+                                Default = 0 for none.
+        
+        Returns: None.
+        
+        Exceptions Raised:
+        ValueError          -- if rule is not a valid Life-like rule, or
+                               rollback or cycles is negative, or the
+                               source is malformed or larger than the
+                               "world".
+        OSError             -- if the keyframes timeline or the source
+                               cannot be opened.
+        """
+        self._rule = rules.lookup(rule)
+        
+        self._past = history.create(rollback)
+        
+        self._frames = timeline.create(keyframes)
+        
+        self._cycles = fingerprint.create(cycles)
+        
+        self._logic = rules.bitwise(self._rule)
+        
+        self._size = size[::-1]
+        
+        self._tail = self._size[1]%WORD or WORD
+        self._mask = numpy.uint64((1 << self._tail) - 1)
+        
+        if source is not None:
+            self._words = pack(patterns.load(source, self._size, offset))
+        else:
+            self._words = pack(rng.integers(2, size=self._size,
+                                            dtype=numpy.uint8))
+        
+        self._steps = 0
+        
+        self._closed = False
+    
+    
+    @property
+    def _mat(self):
+        """
+        The unpacked state (world) matrix as a NumPy uint8 Matrix.
+        
+        This property exists for compatibility with Views and Controllers
+        which expect a byte-per-cell matrix. Each access unpacks a fresh copy.
+        """
+        return unpack(self._words, self._size[1])
+    
+    
+    def step(self, steps=1):
+        """
+        Advance or retract the model some number of steps.
+        
+        Overrides:
+        Model.step()    -- Abstract Base Class API method.
+        
+        Parameters:
+        self    -- GOLNumpyBitwiseModel:
+                        the object itself, Required.
+        steps   -- int: the number of steps to advance or retract if negative,
+                        Default = 1.
+        
+        Returns: None.
+        
+        Exceptions Raised:
+        ValueError          -- if self has already been closed with
+                               self.close(), or if steps is negative beyond
+                               the rollback history.
+        """
+        if self._closed:
+            raise ValueError("Operation on closed Model.")
+        
+        if steps < 0:
+            self._rewind(-steps)
+            
+            return
+        
+        _memory = self._remember()
+        
+        steps = self._skip(steps)
+        
+        for _ in range(steps):
+            self._bitwise_step()
+        
+        self._steps += steps
+        
+        self._record(_memory)
+    
+    
+    def _load(self, state):
+        """
+        Replace the state (world) matrix, from the rollback history.
+        
+        The state is packed into words.
+        
+        Overrides:
+        Model._load()   -- Base Class rollback helper.
+        
+        Parameters:
+        self    -- GOLNumpyBitwiseModel:
+                            the object itself, Required.
+        state   -- ndarray: the uint8 (0 or 1) state matrix, Required.
+        
+        Returns: None.
+        
+        Note:
+        This is a private "helper" method for the rollback history.
+        """
+        self._words = pack(state)
+    
+    
+    def _bitwise_step(self):
+        """
+        Advance the model one step using the packed bitwise algorithm.
+        
+        The west and east neighbour planes are produced by shifting each word
+        one bit and carrying the boundary bit in from the adjacent word (with
+        wrap around at the row ends), the north and south planes by rolling
+        whole rows. The eight planes are summed by a tree of full adders into
+        ones, twos, fours and eights bit planes of the neighbour counts, on
+        which the rule compiled by rules.bitwise() is evaluated.
+        
+        Parameters:
+        self    -- GOLNumpyBitwiseModel:
+                        the object itself, Required.
+        
+        Returns: None.
+        
+        Note:
+        This is a private "helper" method, externally this operation should be
+        performed by a call to step() with the default value of 1 for steps.
+        External calls to this method may leave the object in an illegal,
+        unrecoverable state.
+        """
+        _mid = self._words
+        _up = numpy.roll(_mid,  1, axis=0)
+        _dn = numpy.roll(_mid, -1, axis=0)
+        
+        # The vertical pair is half-added, the west and east planes of each
+        # of the three rows are full-added.
+        _s0, _c0 = _up ^ _dn, _up & _dn
+        
+        _ws = [self._west(_up), self._west(_mid), self._west(_dn)]
+        _es = [self._east(_up), self._east(_mid), self._east(_dn)]
+        
+        _s1, _c1 = _full_add(_ws[0], _ws[1], _ws[2])
+        _s2, _c2 = _full_add(_es[0], _es[1], _es[2])
+        
+        _ones, _c3 = _full_add(_s0, _s1, _s2)
+        
+        _s4, _c4 = _full_add(_c0, _c1, _c2)
+        
+        _twos = _s4 ^ _c3
+        _c5 = _s4 & _c3
+        
+        _next = self._logic(_mid, _ones, _twos, _c4 ^ _c5, _c4 & _c5)
+        
+        _next[:, -1] &= self._mask
+        
+        self._words = _next
+    
+    
+    def _west(self, words):
+        """
+        Return the plane of west neighbours (cell x - 1) of packed words.
+        
+        Parameters:
+        self    -- GOLNumpyBitwiseModel:
+                            the object itself, Required.
+        words   -- ndarray: the packed rows to shift, Required.
+        
+        Returns: ndarray    -- the shifted packed rows.
+        
+        Note:
+        This is a private "helper" method for _bitwise_step().
+        """
+        _west = (words << ONE) | (numpy.roll(words, 1, axis=1) >> TOP)
+        
+        if self._tail != WORD:
+            _west[:, 0] &= ~ONE
+            _west[:, 0] |= (words[:, -1] >> numpy.uint64(self._tail - 1)) \
+                          & ONE
+        
+        return _west
+    
+    
+    def _east(self, words):
+        """
+        Return the plane of east neighbours (cell x + 1) of packed words.
+        
+        Parameters:
+        self    -- GOLNumpyBitwiseModel:
+                            the object itself, Required.
+        words   -- ndarray: the packed rows to shift, Required.
+        
+        Returns: ndarray    -- the shifted packed rows.
+        
+        Note:
+        This is a private "helper" method for _bitwise_step().
+        """
+        _east = (words >> ONE) | (numpy.roll(words, -1, axis=1) << TOP)
+        
+        if self._tail != WORD:
+            _east[:, -1] |= (words[:, 0] & ONE) \
+                         << numpy.uint64(self._tail - 1)
+        
+        return _east
+
+
+def pack(matrix):
+    """
+    Pack a uint8 (0 or 1) matrix into rows of little-endian uint64 words.
+    
+    Parameters:
+    matrix  -- ndarray: the byte-per-cell matrix, Required.
+    
+    Returns: ndarray    -- the packed matrix of shape (rows, ceil(cols/64)).
+    """
+    _bytes = numpy.packbits(matrix, axis=1, bitorder="little")
+    
+    _pad = -_bytes.shape[1]%(WORD//8)
+    
+    if _pad:
+        _bytes = numpy.pad(_bytes, ((0, 0), (0, _pad)))
+    
+    return numpy.ascontiguousarray(_bytes).view("<u8").astype(numpy.uint64)
+
+
+def unpack(words, width):
+    """
+    Unpack rows of little-endian uint64 words into a uint8 (0 or 1) matrix.
+    
+    Parameters:
+    words   -- ndarray: the packed matrix, Required.
+    width   -- int:     the number of cells in each row, Required.
+    
+    Returns: ndarray    -- the byte-per-cell matrix of shape (rows, width).
+    """
+    _bytes = numpy.ascontiguousarray(words.astype("<u8")).view(numpy.uint8)
+    
+    return numpy.unpackbits(_bytes, axis=1, count=width, bitorder="little")
+
+
+def _full_add(a, b, c):
+    """
+    Add three bit planes, returning the sum and carry planes.
+    
+    Parameters:
+    a, b, c -- ndarray: the packed bit planes to add, Required.
+    
+    Returns: tuple  -- the (sum, carry) packed bit planes.
+    
+    Note: This is a private function, you should not be calling this.
+    """
+    _ab = a ^ b
+    
+    return _ab ^ c, (a & b) | (c & _ab)
@@ -0,0 +1,346 @@
+"""
+This module implements John Conway's Game of Life for ensembles of worlds.
+
+An ensemble of independent Game of Life "worlds" of the same size is
+represented as a single 3D NumPy array (ndarray) of shape (N, H, W), and
+global neighbour summing is performed for every "world" at once via use of
+the roll() function, also provided by NumPy, so that the Python overhead of
+a step is paid once for the whole ensemble.
+
+Classes:
+GOLNumpyEnsembleModel -- A Model of an ensemble of Game of Life "worlds".
+"""
+
+import numpy
+
+from .. import fingerprint
+from .. import history
+from .. import mvc
+from .. import patterns
+from .. import rules
+from .. import timeline
+
+
+WORLDS = 16
+
+
+class GOLNumpyEnsembleModel(mvc.Model):
+    """
+    A Model class implementing an ensemble of Game of Life "worlds".
+    
+    The ensemble is represented as a NumPy 3D array (ndarray) of N stacked
+    "worlds", each its own torus, and each step rolls the whole stack in the
+    8 cardinal directions within the "world" axes, exactly as
+    GOLNumpyRollModel does for one "world". This is intended for statistical
+    studies of many small random "worlds", for which one Model per "world"
+    would be dominated by interpreter overhead rather than arithmetic.
+    
+    The population of each "world" is available, as is whether it is done:
+    either extinct or settled into still lifes and period 2 oscillators
+    (such as blinkers), which is detected by comparison with the state two
+    steps earlier. Worlds which are done continue to be stepped, so that the
+    ensemble is always in a consistent state.
+    
+    The initial density is honoured by this Model, and a seed may be given
+    for reproducible ensembles. For compatibility with Views, _mat is the
+    first "world" of the ensemble.
+    
+    Extends:
+    ..mvc.Model -- Abstract Base Class for Models in the Model-View-Controller.
+    
+    Instance Variables:
+    _closed     -- bool:    the object has been terminated.
+    _mats       -- ndarray: the state (world) matrices, stacked.
+    _last       -- ndarray: the state (world) matrices of the previous step.
+    _size       -- tuple:   the dimensions (shape) of each "world".
+    _steps      -- int:     the number of iterations from initial state.
+    _rule       -- uint32:  the rule lookup table.
+    _past       -- History: the rollback history, or None.
+    _frames     -- Timeline:
+                            the keyframes for step_to(), or None.
+    _cycles     -- Fingerprints:
+                            the recent fingerprints for cycle detection,
+                            or None.
+    _settled    -- ndarray: the step at which each "world" was first found
+                            done, or -1.
+    _seed       -- int:     the seed for the random initial states, or None.
+    
+    Properties:
+    _mat        -- ndarray: the state (world) matrix of the first "world".
+    population  -- ndarray: the number of living cells of each "world".
+    done        -- ndarray: whether each "world" is extinct or settled.
+    settled     -- ndarray: the step at which each "world" was first found
+                            done, or -1.
+    
+    Methods:
+    __init__(self, size[, density][, source][, offset][, rollback][,
+                   rule][, keyframes][, cycles][, worlds][, seed])
+            -- Initialize class object, override Model.__init__().
+    reset(self)
+            -- Reset the model to initial state, Not Implemented.
+    step(self[, steps])
+            -- Advance or retract the model relative, override Model.step().
+    _snapshot(self)
+            -- Return a copy of the state, override Model._snapshot(),
+               Private.
+    _load(self, state)
+            -- Replace the state, override Model._load(), Private.
+    _ensemble_step(self)
+            -- Advance the model one step, Private.
+    
+    Inherits:
+    Model.close(self)
+            -- Decommission, deactivate and delete the object.
+    Model.step_to(self, steps)
+            -- Advance or retract the model absolute.
+    
+    Warning:
+    Any assignment to instance variables or calls to private methods will
+    result in the object entering an illegal and potentially unrecoverable
+    state.
+    """
+    
+    def __init__(self, size, density=0.5, source=None, offset=None,
+                             rollback=0, rule=rules.CONWAY, keyframes=None,
+                             cycles=0, worlds=WORLDS, seed=None):
+        """
+        Initialize GOLNumpyEnsembleModel object.
+        
+        Overrides:
+        Model.__init__()    -- Abstract Base Class initializer.
+        
+        Parameters:
+        self        -- GOLNumpyEnsembleModel:
+                                the object itself, Required.
+        size        -- tuple:   the dimensions (shape) of each "world",
+                                Required.
+        density     -- float:   the initial statistical density of living
+                                cells, Default = 0.5.
+        source      -- string:  the path of a pattern file (.rle, .cells or
+                                .mc) to initialize the "world",
+                                Default = None for random.
+        offset      -- tuple:   the x, y coordinates of the top left of the
+                                pattern, Default = None to centre it.
+        rollback    -- int:     the rollback memory budget in bytes for
+                                back-steps, or a history.History,
+                                Default = 0 for none.
+        rule        -- string:  the Life-like rule in B/S notation,
+                                Default = "B3/S23".
+        keyframes   -- string:  the path of a timeline file of keyframes for
+                                step_to(), or a timeline.Timeline,
+                                Default = None for none.
+        cycles      -- int:     the number of recent states fingerprinted for
+                                cycle detection, or a fingerprint.Fingerprints,
+                                Default = 0 for none.
+        worlds      -- int:     the number of "worlds" in the ensemble,
+                                Default = 16.
+        seed        -- int:     the seed for the random initial states,
+                                Default = None for an unpredictable seed.
+        
+        Returns: None.
+        
+        Exceptions Raised:
+        ValueError          -- if rule is not a valid Life-like rule, or
+                               rollback or cycles is negative, or the
+                               source is malformed or larger than the
+                               "world".
+        OSError             -- if the keyframes timeline or the source
+                               cannot be opened.
+        """
+        self._rule = rules.lookup(rule)
+        
+        self._past = history.create(rollback)
+        
+        self._frames = timeline.create(keyframes)
+        
+        self._cycles = fingerprint.create(cycles)
+        
+        self._size = size[::-1]
+        
+        self._seed = seed
+        
+        _rng = numpy.random.default_rng(seed)
+        
+        if source is not None:
+            self._mats = numpy.repeat(
+                            patterns.load(source, self._size, offset)[None],
+                            worlds, axis=0)
+        else:
+            self._mats = (_rng.random((worlds, *self._size)) < density) \
+                       .astype(numpy.uint8)
+        
+        self._last = None
+        
+        self._settled = numpy.full(worlds, -1)
+        
+        self._steps = 0
+        
+        self._closed = False
+    
+    
+    @property
+    def _mat(self):
+        """
+        The state (world) matrix of the first "world", for Views.
+        """
+        return self._mats[0]
+    
+    
+    @property
+    def population(self):
+        """
+        The number of living cells of each "world" as a NumPy array.
+        """
+        return self._mats.sum(axis=(1, 2), dtype=numpy.int64)
+    
+    
+    @property
+    def done(self):
+        """
+        Whether each "world" is extinct or settled, as a NumPy bool array.
+        
+        A "world" is settled when it is found equal to its state two steps
+        earlier, after which it repeats with period 1 or 2 forever.
+        """
+        return (self._settled >= 0) | ~self._mats.any(axis=(1, 2))
+    
+    
+    @property
+    def settled(self):
+        """
+        The step at which each "world" was first found settled, or -1.
+        
+        The step is that of the first state to repeat, which is up to two
+        steps after the "world" actually settled.
+        """
+        return self._settled.copy()
+    
+    
+    def step(self, steps=1):
+        """
+        Advance or retract the model some number of steps.
+        
+        Overrides:
+        Model.step()    -- Abstract Base Class API method.
+        
+        Parameters:
+        self    -- GOLNumpyEnsembleModel:
+                        the object itself, Required.
+        steps   -- int: the number of steps to advance or retract if negative,
+                        Default = 1.
+        
+        Returns: None.
+        
+        Exceptions Raised:
+        ValueError          -- if self has already been closed with
+                               self.close(), or if steps is negative beyond
+                               the rollback history.
+        """
+        if self._closed:
+            raise ValueError("Operation on closed Model.")
+        
+        if steps < 0:
+            self._rewind(-steps)
+            
+            return
+        
+        _memory = self._remember()
+        
+        steps = self._skip(steps)
+        
+        for _ in range(steps):
+            self._ensemble_step()
+        
+        self._record(_memory)
+    
+    
+    def _ensemble_step(self):
+        """
+        Advance the model one step using the numpy.roll() algorithm.
+        
+        Neighbour relations are found by rolling the stack of "worlds" in
+        each of the 8 cardinal directions by one cell within the "world" axes
+        and adding the results, and the next states are looked up in the rule
+        table. Each "world" is then compared with its state two steps earlier
+        to detect those which have settled.
+        
+        Parameters:
+        self    -- GOLNumpyEnsembleModel:
+                        the object itself, Required.
+        
+        Returns: None.
+        
+        Note:
+        This is a private "helper" method, externally this operation should be
+        performed by a call to step() with the default value of 1 for steps.
+        External calls to this method may leave the object in an illegal,
+        unrecoverable state.
+        """
+        _mats = self._mats
+        
+        _neighbours = numpy.roll(_mats, ( 1,  0), (1, 2)) \
+                    + numpy.roll(_mats, (-1,  0), (1, 2)) \
+                    + numpy.roll(_mats, ( 0,  1), (1, 2)) \
+                    + numpy.roll(_mats, ( 0, -1), (1, 2)) \
+                    + numpy.roll(_mats, ( 1,  1), (1, 2)) \
+                    + numpy.roll(_mats, ( 1, -1), (1, 2)) \
+                    + numpy.roll(_mats, (-1,  1), (1, 2)) \
+                    + numpy.roll(_mats, (-1, -1), (1, 2))
+        
+        _next = rules.apply(self._rule, 2*_neighbours + _mats)
+        
+        self._steps += 1
+        
+        if self._last is not None:
+            _repeated = (_next == self._last).all(axis=(1, 2))
+            
+            self._settled[_repeated & (self._settled < 0)] = self._steps
+        
+        self._last, self._mats = _mats, _next
+    
+    
+    def _snapshot(self):
+        """
+        Return a copy of the state matrices of every "world".
+        
+        Overrides:
+        Model._snapshot()   -- Base Class rollback helper.
+        
+        Parameters:
+        self    -- GOLNumpyEnsembleModel:
+                        the object itself, Required.
+        
+        Returns: ndarray    -- the writable copy of the stacked states.
+        
+        Note:
+        This is a private "helper" method for the rollback history.
+        """
+        return self._mats.copy()
+    
+    
+    def _load(self, state):
+        """
+        Replace the state matrices of every "world".
+        
+        The previous step is unknown after a back-step, so the detection of
+        settled "worlds" restarts, forgetting any found after the step count.
+        
+        Overrides:
+        Model._load()   -- Base Class rollback helper.
+        
+        Parameters:
+        self    -- GOLNumpyEnsembleModel:
+                            the object itself, Required.
+        state   -- ndarray: the stacked states as from _snapshot(),
+                            Required.
+        
+        Returns: None.
+        
+        Note:
+        This is a private "helper" method for the rollback history.
+        """
+        self._mats = state
+        
+        self._last = None
+        
+        self._settled[self._settled > self._steps] = -1
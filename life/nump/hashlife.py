@@ -0,0 +1,724 @@
+"""
+This module implements John Conway's Game of Life with the HashLife algorithm.
+
+The Game of Life "world" is represented as a canonicalised quadtree, identical
+sub-trees being shared, and evolution is performed by memoised recursion over
+the tree so that repetitive regions (in space and in time) are computed only
+once. NumPy is used to convert between the quadtree and the Matrix (ndarray)
+representation expected by Views.
+
+Classes:
+GOLNumpyHashLifeModel   -- A Model of Game of Life using HashLife.
+"""
+
+import numpy
+
+from .. import fingerprint
+from .. import history
+from .. import mvc
+from .. import patterns
+from .. import rules
+from .. import timeline
+
+
+MIN_LEVEL = 3
+
+CACHE_SIZE = 1 << 20
+
+GROWTH = 2
+
+rng = numpy.random.default_rng()
+
+
+class _Node:
+    """
+    A canonical quadtree node, Private.
+    
+    Nodes at level 0 are single cells, a node at level L covers a square of
+    2**L cells and has four children (nw, ne, sw, se) at level L - 1. Nodes
+    up to level 3 also carry their cells as a row major board of bits. Nodes
+    are never mutated once created and are compared by identity, which is
+    sound because every node is created through GOLNumpyHashLifeModel._join()
+    and so is unique for its content.
+    """
+    
+    __slots__ = ("level", "population", "bits", "nw", "ne", "sw", "se")
+    
+    def __init__(self, level, population, nw=None, ne=None, sw=None, se=None):
+        self.level = level
+        self.population = population
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        
+        if level == 0:
+            self.bits = population
+        elif level <= 3:
+            _half = 1 << (level - 1)
+            _mask = (1 << _half) - 1
+            _low = 2*_half*_half
+            
+            self.bits = 0
+            
+            for _row in range(_half):
+                _src = _row*_half
+                _dst = 2*_src
+                
+                self.bits |= (nw.bits >> _src & _mask) << _dst \
+                           | (ne.bits >> _src & _mask) << (_dst + _half) \
+                           | (sw.bits >> _src & _mask) << (_dst + _low) \
+                           | (se.bits >> _src & _mask) << (_dst + _low + _half)
+        else:
+            self.bits = None
+
+
+OFF = _Node(0, 0)
+ON  = _Node(0, 1)
+
+FULL = (1 << 64) - 1
+
+NOT_WEST = sum(0xFE << (8*_row) for _row in range(8))
+NOT_EAST = sum(0x7F << (8*_row) for _row in range(8))
+
+
+class GOLNumpyHashLifeModel(mvc.Model):
+    """
+    A Model class implementing Game of Life as a quadtree using HashLife.
+    
+    The Game of Life "world" is represented as a canonicalised quadtree with a
+    memoised result cache, after Gosper's HashLife. The "world" is a torus, as
+    with the other Models; this is simulated exactly by treating the plane as
+    periodically tiled with the torus, for which the torus dimensions must be
+    powers of two. Requested dimensions are therefore rounded up to the next
+    power of two. Advancing by 2**k generations costs one lookup per
+    distinct (node, k) pair, so regular patterns may be advanced by very large
+    numbers of generations in time logarithmic in the number of generations.
+    Chaotic regions gain nothing from memoisation and are stepped more slowly
+    than by the per-cell Models, HashLife pays off on long runs of settled or
+    regular patterns.
+    Rules with B0 bring empty space to life, so empty nodes cannot be skipped
+    and gain much less from memoisation.
+    The node and result caches are each bounded by cache_size entries, or
+    GROWTH times the nodes reachable from the current state after the last
+    garbage collection if more, beyond which they are garbage collected down
+    to those reachable nodes. This class is intended to be used with compatible View and
+    Controller objects as part of a Model-View-Controller pattern.
+    
+    Extends:
+    ..mvc.Model -- Abstract Base Class for Models in the Model-View-Controller.
+    
+    Instance Variables:
+    _closed     -- bool:    the object has been terminated.
+    _root       -- _Node:   the state (world) quadtree.
+    _size       -- tuple:   the dimensions (shape) of the "world".
+    _steps      -- int:     the number of iterations from initial state.
+    _rule       -- uint32:  the rule lookup table.
+    _past       -- History: the rollback history, or None.
+    _frames     -- Timeline:
+                            the keyframes for step_to(), or None.
+    _cycles     -- Fingerprints:
+                            the recent fingerprints for cycle detection,
+                            or None.
+    _logic      -- function:
+                            the rule compiled into a function of bit planes.
+    _still      -- bool:    empty space stays empty under the rule.
+    _level      -- int:     the level of _root.
+    _nodes      -- dict:    the canonical node table.
+    _results    -- dict:    the memoised results of (node, log2 steps).
+    _empty      -- list:    the canonical empty node at each level.
+    _level1     -- list:    the canonical level 1 nodes by 4 bit code.
+    _blocks     -- dict:    the memoised 16x16 cell arrays of level 4 nodes.
+    _cache_size -- int:     the least cache size triggering garbage
+                            collection.
+    _limit      -- int:     the cache size triggering the next garbage
+                            collection.
+    
+    Properties:
+    _mat        -- ndarray: the state (world) matrix, read only.
+    
+    Methods:
+    __init__(self, size[, density][, source][, offset][, rollback][,
+                   rule][, keyframes][, cycles][, cache_size])
+            -- Initialize class object, override Model.__init__().
+    reset(self)
+            -- Reset the model to initial state, Not Implemented.
+    step(self[, steps])
+            -- Advance or retract the model relative, override Model.step().
+    _load(self, state)
+            -- Replace the state, override Model._load(), Private.
+    _advance(self, node, log2)
+            -- Advance a torus node by a power of two steps, Private.
+    _successor(self, node, log2)
+            -- Advance the centre of a node by a power of two steps, Private.
+    _join(self, nw, ne, sw, se)
+            -- Return the canonical node with given children, Private.
+    _collect(self)
+            -- Garbage collect the node and result caches, Private.
+    
+    Inherits:
+    Model.close(self)
+            -- Decommission, deactivate and delete the object.
+    Model.step_to(self, steps)
+            -- Advance or retract the model absolute.
+    
+    Warning:
+    Any assignment to instance variables or calls to private methods will
+    result in the object entering an illegal and potentially unrecoverable
+    state.
+    """
+    
+    def __init__(self, size, density=0.5, source=None, offset=None,
+                             rollback=0, rule=rules.CONWAY, keyframes=None,
+                             cycles=0, cache_size=CACHE_SIZE):
+        """
+        Initialize GOLNumpyHashLifeModel object.
+        
+        Overrides:
+        Model.__init__()    -- Abstract Base Class initializer.
+        
+        Parameters:
+        self        -- GOLNumpyHashLifeModel:
+                                the object itself, Required.
+        size        -- tuple:   the dimensions (shape) of the "world", each
+                                rounded up to a power of two, Required.
+        density     -- float:   the initial statistical density of living
+                                cells, Default = 0.5, Ignored.
+        source      -- string:  the path of a pattern file (.rle, .cells or
+                                .mc) to initialize the "world",
+                                Default = None for random.
+        offset      -- tuple:   the x, y coordinates of the top left of the
+                                pattern, Default = None to centre it.
+        rollback    -- int:     the rollback memory budget in bytes for
+                                back-steps, or a history.History,
+                                Default = 0 for none.
+        rule        -- string:  the Life-like rule in B/S notation,
+                                Default = "B3/S23".
+        keyframes   -- string:  the path of a timeline file of keyframes for
+                                step_to(), or a timeline.Timeline,
+                                Default = None for none.
+        cycles      -- int:     the number of recent states fingerprinted for
+                                cycle detection, or a fingerprint.Fingerprints,
+                                Default = 0 for none.
+        cache_size  -- int:     the least number of nodes or results at
+                                which the caches are garbage collected,
+                                Default = 1048576.
+        
+        Returns: None.
+        
+        Exceptions Raised:
+        ValueError          -- if rule is not a valid Life-like rule, or
+                               rollback or cycles is negative, or the
+                               source is malformed or larger than the
+                               "world".
+        OSError             -- if the keyframes timeline or the source
+                               cannot be opened.
+        """
+        self._rule = rules.lookup(rule)
+        
+        self._past = history.create(rollback)
+        
+        self._frames = timeline.create(keyframes)
+        
+        self._cycles = fingerprint.create(cycles)
+        
+        self._logic = rules.bitwise(self._rule)
+        
+        self._still = not self._rule & 1
+        
+        self._size = tuple(1 << max(0, int(_n) - 1).bit_length()
+                           for _n in size[::-1])
+        
+        self._level = max(MIN_LEVEL, *(_n.bit_length() - 1
+                                       for _n in self._size))
+        
+        self._cache_size = cache_size
+        self._limit = cache_size
+        
+        self._nodes = {}
+        self._results = {}
+        self._blocks = {}
+        self._empty = [OFF]
+        
+        for _ in range(self._level + 1):
+            self._empty.append(self._join(*4*[self._empty[-1]]))
+        
+        self._level1 = [self._join(*[ON if _code & (1 << _bit) else OFF
+                                     for _bit in range(4)])
+                        for _code in range(16)]
+        
+        if source is not None:
+            self._root = self._from_matrix(
+                            patterns.load(source, self._size, offset))
+        else:
+            self._root = self._from_matrix(
+                            rng.integers(2, size=self._size,
+                                         dtype=numpy.uint8))
+        
+        self._steps = 0
+        
+        self._closed = False
+    
+    
+    @property
+    def _mat(self):
+        """
+        The state (world) matrix as a NumPy uint8 Matrix.
+        
+        This property exists for compatibility with Views and Controllers
+        which expect a byte-per-cell matrix. Each access renders a fresh copy
+        of the quadtree.
+        """
+        _side = 1 << self._level
+        
+        _mat = numpy.zeros((_side, _side), dtype=numpy.uint8)
+        
+        self._render(self._root, _mat, 0, 0)
+        
+        return _mat[:self._size[0], :self._size[1]]
+    
+    
+    def step(self, steps=1):
+        """
+        Advance or retract the model some number of steps.
+        
+        The steps are decomposed into powers of two and each is advanced with
+        a single memoised call, so the cost depends on the number of distinct
+        states visited rather than the number of steps.
+        
+        Overrides:
+        Model.step()    -- Abstract Base Class API method.
+        
+        Parameters:
+        self    -- GOLNumpyHashLifeModel:
+                        the object itself, Required.
+        steps   -- int: the number of steps to advance or retract if negative,
+                        Default = 1.
+        
+        Returns: None.
+        
+        Exceptions Raised:
+        ValueError          -- if self has already been closed with
+                               self.close(), or if steps is negative beyond
+                               the rollback history.
+        """
+        if self._closed:
+            raise ValueError("Operation on closed Model.")
+        
+        if steps < 0:
+            self._rewind(-steps)
+            
+            return
+        
+        _memory = self._remember()
+        
+        steps = self._skip(steps)
+        
+        _log2 = 0
+        _bits = steps
+        
+        while _bits:
+            if _bits & 1:
+                self._root = self._advance(self._root, _log2)
+            
+            _bits >>= 1
+            _log2 += 1
+        
+        self._steps += steps
+        
+        self._record(_memory)
+    
+    
+    def _load(self, state):
+        """
+        Replace the state (world) matrix, from the rollback history.
+        
+        The quadtree of the state is built afresh.
+        
+        Overrides:
+        Model._load()   -- Base Class rollback helper.
+        
+        Parameters:
+        self    -- GOLNumpyHashLifeModel:
+                            the object itself, Required.
+        state   -- ndarray: the uint8 (0 or 1) state matrix, Required.
+        
+        Returns: None.
+        
+        Note:
+        This is a private "helper" method for the rollback history.
+        """
+        self._root = self._from_matrix(state)
+    
+    
+    def _advance(self, node, log2):
+        """
+        Advance a torus node by 2**log2 steps.
+        
+        For log2 less than the level of node, the node is tiled 2x2 (which is
+        exact for the torus) and the centre of the tiling is advanced, this
+        being the torus rotated by half its width and height. The rotation is
+        undone by exchanging diagonal quadrants. For larger log2, the advance
+        is performed as two advances of half the length, memoised.
+        
+        Parameters:
+        self    -- GOLNumpyHashLifeModel:
+                        the object itself, Required.
+        node    -- _Node:   the torus to advance, Required.
+        log2    -- int:     the base 2 logarithm of the steps, Required.
+        
+        Returns: _Node  -- the advanced torus.
+        
+        Note:
+        This is a private "helper" method, externally this operation should be
+        performed by a call to step(). External calls to this method may leave
+        the object in an illegal, unrecoverable state.
+        """
+        # Torus advances share the result cache with _successor(), negative
+        # keys keep the two apart.
+        _key = (node, -1 - log2)
+        
+        if _key in self._results:
+            return self._results[_key]
+        
+        if log2 < node.level:
+            _centre = self._successor(self._join(node, node, node, node),
+                                      log2)
+            
+            _result = self._join(_centre.se, _centre.sw,
+                                 _centre.ne, _centre.nw)
+        else:
+            _result = self._advance(self._advance(node, log2 - 1), log2 - 1)
+        
+        self._results[_key] = _result
+        
+        return _result
+    
+    
+    def _successor(self, node, log2):
+        """
+        Advance the centre of a node by 2**log2 steps.
+        
+        The node at level L is split into nine overlapping sub-nodes at level
+        L - 1, from which the centre at level L - 1 is assembled in two
+        stages. If log2 == L - 2 both stages advance by 2**(L - 3) steps,
+        otherwise the first stage only takes centres and the second advances
+        by 2**log2 steps.
+        
+        Parameters:
+        self    -- GOLNumpyHashLifeModel:
+                        the object itself, Required.
+        node    -- _Node:   the node to advance, level 2 or more, Required.
+        log2    -- int:     the base 2 logarithm of the steps, no more than
+                            the level of node less 2, Required.
+        
+        Returns: _Node  -- the advanced centre of node, one level down.
+        
+        Note:
+        This is a private "helper" method, externally this operation should be
+        performed by a call to step(). External calls to this method may leave
+        the object in an illegal, unrecoverable state.
+        """
+        _key = (node, log2)
+        
+        if _key in self._results:
+            return self._results[_key]
+        
+        if node.population == 0 and self._still:
+            _result = self._empty[node.level - 1]
+        elif node.level == 3:
+            _result = self._leaf_successor(node, log2)
+        else:
+            _nw, _ne, _sw, _se = node.nw, node.ne, node.sw, node.se
+            
+            _sub = [_nw,
+                    self._join(_nw.ne, _ne.nw, _nw.se, _ne.sw),
+                    _ne,
+                    self._join(_nw.sw, _nw.se, _sw.nw, _sw.ne),
+                    self._join(_nw.se, _ne.sw, _sw.ne, _se.nw),
+                    self._join(_ne.sw, _ne.se, _se.nw, _se.ne),
+                    _sw,
+                    self._join(_sw.ne, _se.nw, _sw.se, _se.sw),
+                    _se]
+            
+            if log2 == node.level - 2:
+                _sub = [self._successor(_n, log2 - 1) for _n in _sub]
+                _log2 = log2 - 1
+            else:
+                _sub = [self._join(_n.nw.se, _n.ne.sw, _n.sw.ne, _n.se.nw)
+                        for _n in _sub]
+                _log2 = log2
+            
+            _result = self._join(
+                self._successor(self._join(_sub[0], _sub[1],
+                                           _sub[3], _sub[4]), _log2),
+                self._successor(self._join(_sub[1], _sub[2],
+                                           _sub[4], _sub[5]), _log2),
+                self._successor(self._join(_sub[3], _sub[4],
+                                           _sub[6], _sub[7]), _log2),
+                self._successor(self._join(_sub[4], _sub[5],
+                                           _sub[7], _sub[8]), _log2))
+        
+        self._results[_key] = _result
+        
+        return _result
+    
+    
+    def _leaf_successor(self, node, log2):
+        """
+        Advance the centre 4x4 cells of a level 3 (8x8) node by 1 or 2 steps.
+        
+        The node is stepped as a 64 bit board (row major, least significant
+        bit first) with the same full adder logic as the bitwise Model, cells
+        outside the board being treated as dead. After n steps only the cells
+        at least n from the edge are valid, which includes the centre 4x4.
+        
+        Parameters:
+        self    -- GOLNumpyHashLifeModel:
+                        the object itself, Required.
+        node    -- _Node:   the level 3 node to advance, Required.
+        log2    -- int:     0 to advance 1 step or 1 to advance 2, Required.
+        
+        Returns: _Node  -- the advanced level 2 centre.
+        
+        Note: This is a private method, you should not be calling this.
+        """
+        _board = node.bits
+        
+        for _ in range(1 << log2):
+            _board = _board_step(_board, self._logic)
+        
+        _centre = 0
+        
+        for _row in range(4):
+            _centre |= ((_board >> (8*_row + 18)) & 0xF) << (4*_row)
+        
+        _quads = [_centre >> _shift & 0x33 for _shift in (0, 2, 8, 10)]
+        
+        return self._join(*(self._level1[_quad & 0x3 | _quad >> 2 & 0xC]
+                            for _quad in _quads))
+    
+    
+    def _join(self, nw, ne, sw, se):
+        """
+        Return the canonical node with the given children.
+        
+        Parameters:
+        self    -- GOLNumpyHashLifeModel:
+                        the object itself, Required.
+        nw, ne, sw, se
+                -- _Node:   the children, all at the same level, Required.
+        
+        Returns: _Node  -- the unique node with these children.
+        
+        Note: This is a private method, you should not be calling this.
+        """
+        _key = (nw, ne, sw, se)
+        
+        _node = self._nodes.get(_key)
+        
+        if _node is None:
+            if len(self._nodes) >= self._limit \
+            or len(self._results) >= self._limit:
+                self._collect()
+            
+            _node = _Node(nw.level + 1,
+                          nw.population + ne.population
+                        + sw.population + se.population, nw, ne, sw, se)
+            
+            self._nodes[_key] = _node
+        
+        return _node
+    
+    
+    def _collect(self):
+        """
+        Garbage collect the node and result caches.
+        
+        The result caches are cleared and the node table is rebuilt from the
+        nodes reachable from the current state and the empty nodes. Nodes held
+        elsewhere (e.g. on the stack of an advance in progress) stay valid, as
+        results depend only on node content, though they lose their sharing.
+        The next collection is put off until the caches reach GROWTH times the
+        live nodes, should that be more than cache_size, so that a live tree
+        larger than cache_size is not collected on every new node.
+        
+        Parameters:
+        self    -- GOLNumpyHashLifeModel:
+                        the object itself, Required.
+        
+        Returns: None.
+        
+        Note: This is a private method, you should not be calling this.
+        """
+        self._results.clear()
+        self._blocks.clear()
+        
+        _nodes = {}
+        _stack = list(self._empty[1:])
+        
+        if getattr(self, "_root", None) is not None:
+            _stack.append(self._root)
+        
+        while _stack:
+            _node = _stack.pop()
+            _key = (_node.nw, _node.ne, _node.sw, _node.se)
+            
+            if _node.level == 0 or _key in _nodes:
+                continue
+            
+            _nodes[_key] = _node
+            
+            _stack.extend(_key)
+        
+        self._nodes = _nodes
+        
+        self._limit = max(self._cache_size, GROWTH*len(_nodes))
+    
+    
+    def _from_matrix(self, matrix):
+        """
+        Build the torus quadtree of a matrix.
+        
+        The matrix is tiled up to the square of side 2**_level, which is exact
+        for the torus as the dimensions of matrix are powers of two. The cells
+        are grouped into level 1 nodes by a vectorised 4 bit encoding, and
+        each level above is joined from the one below.
+        
+        Parameters:
+        self    -- GOLNumpyHashLifeModel:
+                            the object itself, Required.
+        matrix  -- ndarray: the state (world) matrix, Required.
+        
+        Returns: _Node  -- the root of the quadtree.
+        
+        Note: This is a private method, you should not be calling this.
+        """
+        _side = 1 << self._level
+        
+        _mat = numpy.tile(matrix, (_side//matrix.shape[0],
+                                   _side//matrix.shape[1])).astype(numpy.uint8)
+        
+        _codes = _mat[0::2, 0::2] | _mat[0::2, 1::2] << 1 \
+               | _mat[1::2, 0::2] << 2 | _mat[1::2, 1::2] << 3
+        
+        _grid = [[self._level1[_code] for _code in _row]
+                 for _row in _codes.tolist()]
+        
+        while len(_grid) > 1:
+            _grid = [[self._join(_grid[i][j], _grid[i][j + 1],
+                                 _grid[i + 1][j], _grid[i + 1][j + 1])
+                      for j in range(0, len(_grid[i]), 2)]
+                     for i in range(0, len(_grid), 2)]
+        
+        return _grid[0][0]
+    
+    
+    def _render(self, node, matrix, y, x):
+        """
+        Write the cells of a node into a matrix at the given coordinates.
+        
+        Empty nodes are skipped and level 4 (16x16) nodes are memoised as
+        arrays, so rendering is proportional to the number of distinct
+        non-empty 16x16 blocks.
+        
+        Parameters:
+        self    -- GOLNumpyHashLifeModel:
+                            the object itself, Required.
+        node    -- _Node:   the node to render, Required.
+        matrix  -- ndarray: the zeroed destination matrix, Required.
+        y, x    -- int:     the coordinates of the top left of node, Required.
+        
+        Returns: None.
+        
+        Note: This is a private method, you should not be calling this.
+        """
+        if node.population == 0:
+            return
+        
+        if node.level <= 4:
+            _block = self._blocks.get(node)
+            
+            if _block is None:
+                _block = numpy.zeros((1 << node.level, 1 << node.level),
+                                     dtype=numpy.uint8)
+                
+                _stack = [(node, 0, 0)]
+                
+                while _stack:
+                    _node, _y, _x = _stack.pop()
+                    
+                    if _node.population == 0:
+                        continue
+                    
+                    if _node.level == 0:
+                        _block[_y, _x] = 1
+                    else:
+                        _half = 1 << (_node.level - 1)
+                        
+                        _stack.extend(((_node.nw, _y, _x),
+                                       (_node.ne, _y, _x + _half),
+                                       (_node.sw, _y + _half, _x),
+                                       (_node.se, _y + _half, _x + _half)))
+                
+                self._blocks[node] = _block
+            
+            _side = _block.shape[0]
+            
+            matrix[y:y + _side, x:x + _side] = _block
+        else:
+            _half = 1 << (node.level - 1)
+            
+            self._render(node.nw, matrix, y, x)
+            self._render(node.ne, matrix, y, x + _half)
+            self._render(node.sw, matrix, y + _half, x)
+            self._render(node.se, matrix, y + _half, x + _half)
+
+
+def _board_step(board, logic):
+    """
+    Advance an 8x8 board of bits by one step, with dead cells beyond it.
+    
+    Parameters:
+    board   -- int:     the row major 64 bit board, Required.
+    logic   -- function:
+                        the rule compiled by rules.bitwise(), Required.
+    
+    Returns: int    -- the advanced board.
+    
+    Note: This is a private function, you should not be calling this.
+    """
+    _up = (board << 8) & FULL
+    _dn = board >> 8
+    
+    _s0, _c0 = _up ^ _dn, _up & _dn
+    
+    _ws = [(_row << 1) & NOT_WEST for _row in (_up, board, _dn)]
+    _es = [(_row >> 1) & NOT_EAST for _row in (_up, board, _dn)]
+    
+    _s1, _c1 = _full_add(*_ws)
+    _s2, _c2 = _full_add(*_es)
+    
+    _ones, _c3 = _full_add(_s0, _s1, _s2)
+    
+    _s4, _c4 = _full_add(_c0, _c1, _c2)
+    
+    _c5 = _s4 & _c3
+    
+    return logic(board, _ones, _s4 ^ _c3, _c4 ^ _c5, _c4 & _c5) & FULL
+
+
+def _full_add(a, b, c):
+    """
+    Add three bit boards, returning the sum and carry boards.
+    
+    Parameters:
+    a, b, c -- int: the bit boards to add, Required.
+    
+    Returns: tuple  -- the (sum, carry) bit boards.
+    
+    Note: This is a private function, you should not be calling this.
+    """
+    _ab = a ^ b
+    
+    return _ab ^ c, (a & b) | (c & _ab)
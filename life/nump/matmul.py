@@ -11,7 +11,12 @@ GOLNumpyMatmulModel -- A Model of Game of Life using ndarray's `@` operator.
 
 import numpy
 
+from .. import fingerprint
+from .. import history
 from .. import mvc
+from .. import patterns
+from .. import rules
+from .. import timeline
 
 
 rng = numpy.random.default_rng()
@@ -35,20 +40,25 @@ class GOLNumpyMatmulModel(mvc.Model):
     _mat    -- ndarray: the state (world) matrix.
     _size   -- tuple:   the dimensions (shape) of _mat.
     _steps  -- int:     the number of iterations from initial state.
+    _rule   -- uint32:  the rule lookup table.
+    _past   -- History: the rollback history, or None.
+    _frames -- Timeline:
+                        the keyframes for step_to(), or None.
+    _cycles -- Fingerprints:
+                        the recent fingerprints for cycle detection, or None.
     _l_kern -- ndarray: one of four diagonal arrays to assist with matmul step.
     _r_kern -- ndarray: one of four diagonal arrays to assist with matmul step.
     _u_kern -- ndarray: one of four diagonal arrays to assist with matmul step.
     _d_kern -- ndarray: one of four diagonal arrays to assist with matmul step.
     
     Methods:
-    __init__(self, size[, density][, source][, offset][, rollback])
+    __init__(self, size[, density][, source][, offset][, rollback][,
+                   rule][, keyframes][, cycles])
             -- Initialize class object, override Model.__init__().
     reset(self)
             -- Reset the model to initial state, Not Implemented.
     step(self[, steps])
             -- Advance or retract the model relative, override Model.step().
-    step_to(self, steps)
-            -- Advance or retract the model absolute, Not Implemented.
     _init_kernels(self, size)
             -- Initialize the diagonal matrices for matmul operations, Private.
     _matmul_step(self)
@@ -57,6 +67,8 @@ class GOLNumpyMatmulModel(mvc.Model):
     Inherits:
     Model.close(self)
             -- Decommission, deactivate and delete the object.
+    Model.step_to(self, steps)
+            -- Advance or retract the model absolute.
     
     Warning:
     Any assignment to instance variables or calls to private methods will
@@ -65,7 +77,8 @@ class GOLNumpyMatmulModel(mvc.Model):
     """
     
     def __init__(self, size, density=0.5, source=None, offset=None,
-                             rollback=0):
+                             rollback=0, rule=rules.CONWAY, keyframes=None,
+                             cycles=0):
         """
         Initialize GOLNumpyMatmulModel object.
         
@@ -79,25 +92,49 @@ class GOLNumpyMatmulModel(mvc.Model):
                                 Required.
         density     -- float:   the initial statistical density of living
                                 cells, Default = 0.5, Ignored.
-        source      -- string:  a file name to initialize the "world", Not
-                                Implemented.
-        offset      -- tuple:   the offset coordinates for source, Ignored.
-        rollback    -- int:     the requested rollback memory for back-steps,
-                                Ignored.
+        source      -- string:  the path of a pattern file (.rle, .cells or
+                                .mc) to initialize the "world",
+                                Default = None for random.
+        offset      -- tuple:   the x, y coordinates of the top left of the
+                                pattern, Default = None to centre it.
+        rollback    -- int:     the rollback memory budget in bytes for
+                                back-steps, or a history.History,
+                                Default = 0 for none.
+        rule        -- string:  the Life-like rule in B/S notation,
+                                Default = "B3/S23".
+        keyframes   -- string:  the path of a timeline file of keyframes for
+                                step_to(), or a timeline.Timeline,
+                                Default = None for none.
+        cycles      -- int:     the number of recent states fingerprinted for
+                                cycle detection, or a fingerprint.Fingerprints,
+                                Default = 0 for none.
         
         Returns: None.
         
         Exceptions Raised:
-        NotImplementedError -- if source is provided.
+        ValueError          -- if rule is not a valid Life-like rule, or
+                               rollback or cycles is negative, or the
+                               source is malformed or larger than the
+                               "world".
+        OSError             -- if the keyframes timeline or the source
+                               cannot be opened.
         """
-        if source is not None:
-            raise NotImplementedError("Matrix source not (yet) supported")
+        self._rule = rules.lookup(rule)
+        
+        self._past = history.create(rollback)
+        
+        self._frames = timeline.create(keyframes)
+        
+        self._cycles = fingerprint.create(cycles)
         
         self._size = size[::-1]
         
         self._init_kernels(self._size)
         
-        self._mat = rng.integers(2, size=self._size, dtype=numpy.uint8)
+        if source is not None:
+            self._mat = patterns.load(source, self._size, offset)
+        else:
+            self._mat = rng.integers(2, size=self._size, dtype=numpy.uint8)
         
         self._steps = 0
         
@@ -121,19 +158,27 @@ class GOLNumpyMatmulModel(mvc.Model):
         
         Exceptions Raised:
         ValueError          -- if self has already been closed with
-                               self.close().
-        NotImplementedError -- if steps is negative.
+                               self.close(), or if steps is negative beyond
+                               the rollback history.
         """
         if self._closed:
             raise ValueError("Operation on closed Model.")
         
         if steps < 0:
-            raise NotImplementedError("Negative steps not (yet) supported")
+            self._rewind(-steps)
+            
+            return
+        
+        _memory = self._remember()
+        
+        steps = self._skip(steps)
         
         for _ in range(steps):
             self._matmul_step()
         
         self._steps += steps
+        
+        self._record(_memory)
     
     
     def _init_kernels(self, size):
@@ -172,8 +217,8 @@ class GOLNumpyMatmulModel(mvc.Model):
         
         Neighbour relations are found by algebraic manipulation (addition and
         multiplication) of the "world" matrix with the 4 kernel matrices. The
-        generate and survive conditions are then determined using integer
-        division thresholding.
+        next state of each cell is then looked up in the rule table by its
+        neighbour count and current state.
         
         Parameters:
         self    -- GOLNumpyMatmulModel:
@@ -193,10 +238,4 @@ class GOLNumpyMatmulModel(mvc.Model):
         
         _neighbours = _up_down + _lr_corn
         
-        _generate = numpy.minimum(_neighbours//3, 1) \
-                  - numpy.minimum(_neighbours//4, 1)
-        
-        _survive = numpy.minimum(_neighbours//2, 1) \
-                 - numpy.minimum(_neighbours//4, 1)
-        
-        self._mat = numpy.maximum(_generate, self._mat*_survive)
+        self._mat = rules.apply(self._rule, 2*_neighbours + self._mat)
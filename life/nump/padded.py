@@ -0,0 +1,307 @@
+"""
+This module implements John Conway's Game of Life in place with ghost cells.
+
+The Game of Life "world" is represented as a pair of preallocated NumPy
+Matrices (ndarray) padded with a one cell ghost border. Wrap around is
+provided by refreshing the ghost border with slice copies and neighbours are
+summed from slice views into preallocated scratch space with `out=` ufuncs,
+so that stepping performs no allocation at all.
+
+Classes:
+GOLNumpyPaddedModel -- A Model of Game of Life using padded buffers in place.
+"""
+
+import numpy
+
+from .. import fingerprint
+from .. import history
+from .. import mvc
+from .. import patterns
+from .. import rules
+from .. import timeline
+
+
+rng = numpy.random.default_rng()
+
+
+class GOLNumpyPaddedModel(mvc.Model):
+    """
+    A Model class implementing Game of Life in place on padded Matrices.
+    
+    The Game of Life "world" is represented as two NumPy Matrices (ndarray),
+    each padded with a one cell ghost border, the current state and the
+    next. Each step refreshes the ghost border of the current state from the
+    opposite edges (giving the torus wrap around), sums the 8 neighbour slice
+    views into a scratch Matrix, applies the rule into the interior of the
+    next state and swaps the two. All of this is performed with slice
+    assignment and `out=` ufuncs on preallocated memory, so a step makes no
+    allocations, avoiding allocator churn and keeping the working set small.
+    This class is intended to be used with compatible View and Controller
+    objects as part of a Model-View-Controller pattern.
+    
+    Extends:
+    ..mvc.Model -- Abstract Base Class for Models in the Model-View-Controller.
+    
+    Instance Variables:
+    _closed     -- bool:    the object has been terminated.
+    _size       -- tuple:   the dimensions (shape) of the "world".
+    _steps      -- int:     the number of iterations from initial state.
+    _rule       -- uint32:  the rule lookup table.
+    _past       -- History: the rollback history, or None.
+    _frames     -- Timeline:
+                            the keyframes for step_to(), or None.
+    _cycles     -- Fingerprints:
+                            the recent fingerprints for cycle detection,
+                            or None.
+    _ranges     -- list:    the ranges of living cell indices in _rule.
+    _bufs       -- list:    the two padded state Matrices.
+    _current    -- int:     the index in _bufs of the current state.
+    _count      -- ndarray: the scratch Matrix for neighbour counts.
+    _scratch    -- ndarray: the scratch Matrix for rule ranges.
+    
+    Properties:
+    _mat        -- ndarray: the state (world) matrix, read only view.
+    
+    Methods:
+    __init__(self, size[, density][, source][, offset][, rollback][,
+                   rule][, keyframes][, cycles])
+            -- Initialize class object, override Model.__init__().
+    reset(self)
+            -- Reset the model to initial state, Not Implemented.
+    step(self[, steps])
+            -- Advance or retract the model relative, override Model.step().
+    _load(self, state)
+            -- Replace the state, override Model._load(), Private.
+    _padded_step(self)
+            -- Advance the model one step, Private.
+    
+    Inherits:
+    Model.close(self)
+            -- Decommission, deactivate and delete the object.
+    Model.step_to(self, steps)
+            -- Advance or retract the model absolute.
+    
+    Warning:
+    Any assignment to instance variables or calls to private methods will
+    result in the object entering an illegal and potentially unrecoverable
+    state.
+    """
+    
+    def __init__(self, size, density=0.5, source=None, offset=None,
+                             rollback=0, rule=rules.CONWAY, keyframes=None,
+                             cycles=0):
+        """
+        Initialize GOLNumpyPaddedModel object.
+        
+        Overrides:
+        Model.__init__()    -- Abstract Base Class initializer.
+        
+        Parameters:
+        self        -- GOLNumpyPaddedModel:
+                                the object itself, Required.
+        size        -- tuple:   the dimensions (shape) of the "world",
+                                Required.
+        density     -- float:   the initial statistical density of living
+                                cells, Default = 0.5, Ignored.
+        source      -- string:  the path of a pattern file (.rle, .cells or
+                                .mc) to initialize the "world",
+                                Default = None for random.
+        offset      -- tuple:   the x, y coordinates of the top left of the
+                                pattern, Default = None to centre it.
+        rollback    -- int:     the rollback memory budget in bytes for
+                                back-steps, or a history.History,
+                                Default = 0 for none.
+        rule        -- string:  the Life-like rule in B/S notation,
+                                Default = "B3/S23".
+        keyframes   -- string:  the path of a timeline file of keyframes for
+                                step_to(), or a timeline.Timeline,
+                                Default = None for none.
+        cycles      -- int:     the number of recent states fingerprinted for
+                                cycle detection, or a fingerprint.Fingerprints,
+                                Default = 0 for none.
+        
+        Returns: None.
+        
+        Exceptions Raised:
+        ValueError          -- if rule is not a valid Life-like rule, or
+                               rollback or cycles is negative, or the
+                               source is malformed or larger than the
+                               "world".
+        OSError             -- if the keyframes timeline or the source
+                               cannot be opened.
+        """
+        self._rule = rules.lookup(rule)
+        
+        self._past = history.create(rollback)
+        
+        self._frames = timeline.create(keyframes)
+        
+        self._cycles = fingerprint.create(cycles)
+        
+        self._ranges = rules.ranges(self._rule)
+        
+        self._size = size[::-1]
+        
+        _padded = (self._size[0] + 2, self._size[1] + 2)
+        
+        self._bufs = [numpy.zeros(_padded, dtype=numpy.uint8),
+                      numpy.zeros(_padded, dtype=numpy.uint8)]
+        
+        self._count = numpy.zeros(self._size, dtype=numpy.uint8)
+        
+        self._scratch = numpy.zeros(self._size, dtype=numpy.uint8)
+        
+        self._current = 0
+        
+        if source is not None:
+            patterns.load(source, self._size, offset,
+                          self._bufs[0][1:-1, 1:-1])
+        else:
+            self._bufs[0][1:-1, 1:-1] = rng.integers(2, size=self._size,
+                                                     dtype=numpy.uint8)
+        
+        self._steps = 0
+        
+        self._closed = False
+    
+    
+    @property
+    def _mat(self):
+        """
+        The state (world) matrix as a read only view of a NumPy uint8 Matrix.
+        
+        The view is of the interior of the current buffer, which is
+        overwritten by the second step after this one. Take a copy if the
+        state must be kept for longer.
+        """
+        _view = self._bufs[self._current][1:-1, 1:-1]
+        
+        _view.flags.writeable = False
+        
+        return _view
+    
+    
+    def step(self, steps=1):
+        """
+        Advance or retract the model some number of steps.
+        
+        Overrides:
+        Model.step()    -- Abstract Base Class API method.
+        
+        Parameters:
+        self    -- GOLNumpyPaddedModel:
+                        the object itself, Required.
+        steps   -- int: the number of steps to advance or retract if negative,
+                        Default = 1.
+        
+        Returns: None.
+        
+        Exceptions Raised:
+        ValueError          -- if self has already been closed with
+                               self.close(), or if steps is negative beyond
+                               the rollback history.
+        """
+        if self._closed:
+            raise ValueError("Operation on closed Model.")
+        
+        if steps < 0:
+            self._rewind(-steps)
+            
+            return
+        
+        _memory = self._remember()
+        
+        steps = self._skip(steps)
+        
+        for _ in range(steps):
+            self._padded_step()
+        
+        self._steps += steps
+        
+        self._record(_memory)
+    
+    
+    def _load(self, state):
+        """
+        Replace the state (world) matrix, from the rollback history.
+        
+        The state is copied into the interior of the current buffer.
+        
+        Overrides:
+        Model._load()   -- Base Class rollback helper.
+        
+        Parameters:
+        self    -- GOLNumpyPaddedModel:
+                            the object itself, Required.
+        state   -- ndarray: the uint8 (0 or 1) state matrix, Required.
+        
+        Returns: None.
+        
+        Note:
+        This is a private "helper" method for the rollback history.
+        """
+        self._bufs[self._current][1:-1, 1:-1] = state
+    
+    
+    def _padded_step(self):
+        """
+        Advance the model one step in place using the padded buffers.
+        
+        The ghost rows are copied from the opposite edge rows, then the ghost
+        columns (including corners) from the opposite edge columns. The
+        neighbour count is accumulated from the 8 shifted slice views of the
+        current buffer. The count is doubled and the cell's own state added,
+        giving the index into the rule table. Rather than widening the index
+        for a lookup, the rule is applied as its ranges of living cell indices
+        (see rules.ranges()), each tested with one unsigned subtract and
+        compare, e.g. index - 5 <= 2 for Conway's rule, written straight into
+        the interior of the next buffer.
+        
+        Parameters:
+        self    -- GOLNumpyPaddedModel:
+                        the object itself, Required.
+        
+        Returns: None.
+        
+        Note:
+        This is a private "helper" method, externally this operation should be
+        performed by a call to step() with the default value of 1 for steps.
+        External calls to this method may leave the object in an illegal,
+        unrecoverable state.
+        """
+        _src = self._bufs[self._current]
+        _dst = self._bufs[1 - self._current]
+        _count = self._count
+        
+        _src[0, 1:-1] = _src[-2, 1:-1]
+        _src[-1, 1:-1] = _src[1, 1:-1]
+        _src[:, 0] = _src[:, -2]
+        _src[:, -1] = _src[:, 1]
+        
+        numpy.add(_src[:-2, :-2], _src[:-2, 1:-1], out=_count)
+        numpy.add(_count, _src[:-2, 2:],  out=_count)
+        numpy.add(_count, _src[1:-1, :-2], out=_count)
+        numpy.add(_count, _src[1:-1, 2:],  out=_count)
+        numpy.add(_count, _src[2:, :-2],  out=_count)
+        numpy.add(_count, _src[2:, 1:-1], out=_count)
+        numpy.add(_count, _src[2:, 2:],   out=_count)
+        
+        numpy.add(_count, _count, out=_count)
+        numpy.add(_count, _src[1:-1, 1:-1], out=_count)
+        
+        _next = _dst[1:-1, 1:-1]
+        
+        if not self._ranges:
+            _next[:] = 0
+        
+        for _i, (_first, _last) in enumerate(self._ranges):
+            numpy.subtract(_count, _first, out=self._scratch)
+            
+            if _i == 0:
+                numpy.less_equal(self._scratch, _last - _first, out=_next)
+            else:
+                numpy.less_equal(self._scratch, _last - _first,
+                                 out=self._scratch)
+                numpy.bitwise_or(_next, self._scratch, out=_next)
+        
+        self._current = 1 - self._current
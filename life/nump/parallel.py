@@ -0,0 +1,515 @@
+"""
+This module implements John Conway's Game of Life with multiple processes.
+
+The Game of Life "world" is represented as a NumPy Matrix (ndarray) held in
+shared memory and divided into horizontal strips, each of which is stepped by
+its own worker process. Halo rows are read directly from the neighbouring
+strips in shared memory, so no state is ever pickled between processes. The
+workers and the shared memory are released by close(), or by a finalizer if
+the Model is collected or the interpreter exits without it.
+
+Constants:
+TIMEOUT -- float:   the seconds to wait for the workers to start a run.
+POLL    -- float:   the seconds between checks that the workers are alive
+                    while waiting for a run to end.
+
+Classes:
+GOLNumpyParallelModel -- A Model of Game of Life using worker processes.
+"""
+
+import os
+import weakref
+import threading
+import multiprocessing
+
+from multiprocessing import shared_memory
+
+import numpy
+
+from .. import fingerprint
+from .. import history
+from .. import mvc
+from .. import patterns
+from .. import rules
+from .. import timeline
+
+
+TIMEOUT = 10.0
+
+POLL = 1.0
+
+rng = numpy.random.default_rng()
+
+
+class GOLNumpyParallelModel(mvc.Model):
+    """
+    A Model class implementing Game of Life as a Matrix over worker processes.
+    
+    The Game of Life "world" is represented as a pair of NumPy Matrices
+    (ndarray) in shared memory, the current state and the next. The rows are
+    divided into one horizontal strip per worker process, and each worker
+    steps its own strip from the current Matrix into the next, reading the
+    one row halo above and below its strip directly from the current Matrix.
+    Workers synchronise on a barrier after every generation, so that no strip
+    is read before it is complete, and the Matrices then swap roles. Only
+    the step count is communicated by the Model, also through shared memory.
+    The Model never waits on the workers without a timeout, so that a worker
+    which dies (e.g. killed for lack of memory) raises RuntimeError rather
+    than hanging the Model.
+    This class is intended to be used with compatible View and Controller
+    objects as part of a Model-View-Controller pattern.
+    
+    Extends:
+    ..mvc.Model -- Abstract Base Class for Models in the Model-View-Controller.
+    
+    Instance Variables:
+    _closed     -- bool:    the object has been terminated.
+    _size       -- tuple:   the dimensions (shape) of the "world".
+    _steps      -- int:     the number of iterations from initial state.
+    _rule       -- uint32:  the rule lookup table.
+    _past       -- History: the rollback history, or None.
+    _frames     -- Timeline:
+                            the keyframes for step_to(), or None.
+    _cycles     -- Fingerprints:
+                            the recent fingerprints for cycle detection,
+                            or None.
+    _shm        -- list:    the SharedMemory blocks of the two Matrices and
+                            the control word.
+    _bufs       -- list:    the two state Matrices in shared memory.
+    _control    -- ndarray: the shared step count for the workers.
+    _current    -- int:     the index in _bufs of the current state.
+    _workers    -- list:    the worker Processes.
+    _start      -- Barrier: released by the Model to start a run of steps.
+    _done       -- Semaphore:
+                            released by each worker at the end of a run.
+    _finalizer  -- finalize:
+                            stops the workers and closes and unlinks the
+                            shared memory, once, when closed, collected or
+                            at exit.
+    
+    Properties:
+    _mat        -- ndarray: a copy of the state (world) matrix, read only.
+    
+    Methods:
+    __init__(self, size[, density][, source][, offset][, rollback][,
+                   rule][, keyframes][, cycles][, workers])
+            -- Initialize class object, override Model.__init__().
+    close(self)
+            -- Stop the workers and release shared memory, override
+               Model.close().
+    reset(self)
+            -- Reset the model to initial state, Not Implemented.
+    step(self[, steps])
+            -- Advance or retract the model relative, override Model.step().
+    _check(self)
+            -- Check that every worker process is alive, Private.
+    _load(self, state)
+            -- Replace the state, override Model._load(), Private.
+    
+    Inherits:
+    Model.step_to(self, steps)
+            -- Advance or retract the model absolute.
+    
+    Warning:
+    Any assignment to instance variables or calls to private methods will
+    result in the object entering an illegal and potentially unrecoverable
+    state.
+    """
+    
+    def __init__(self, size, density=0.5, source=None, offset=None,
+                             rollback=0, rule=rules.CONWAY, keyframes=None,
+                             cycles=0, workers=None):
+        """
+        Initialize GOLNumpyParallelModel object.
+        
+        Overrides:
+        Model.__init__()    -- Abstract Base Class initializer.
+        
+        Parameters:
+        self        -- GOLNumpyParallelModel:
+                                the object itself, Required.
+        size        -- tuple:   the dimensions (shape) of the "world",
+                                Required.
+        density     -- float:   the initial statistical density of living
+                                cells, Default = 0.5, Ignored.
+        source      -- string:  the path of a pattern file (.rle, .cells or
+                                .mc) to initialize the "world",
+                                Default = None for random.
+        offset      -- tuple:   the x, y coordinates of the top left of the
+                                pattern, Default = None to centre it.
+        rollback    -- int:     the rollback memory budget in bytes for
+                                back-steps, or a history.History,
+                                Default = 0 for none.
+        rule        -- string:  the Life-like rule in B/S notation,
+                                Default = "B3/S23".
+        keyframes   -- string:  the path of a timeline file of keyframes for
+                                step_to(), or a timeline.Timeline,
+                                Default = None for none.
+        cycles      -- int:     the number of recent states fingerprinted for
+                                cycle detection, or a fingerprint.Fingerprints,
+                                Default = 0 for none.
+        workers     -- int:     the number of worker processes, no more than
+                                the "world" height, Default = None for the
+                                number of CPUs.
+        
+        Returns: None.
+        
+        Exceptions Raised:
+        ValueError          -- if rule is not a valid Life-like rule, or
+                               rollback or cycles is negative, or the
+                               source is malformed or larger than the
+                               "world".
+        OSError             -- if the keyframes timeline or the source
+                               cannot be opened.
+        """
+        self._rule = rules.lookup(rule)
+        
+        self._past = history.create(rollback)
+        
+        self._frames = timeline.create(keyframes)
+        
+        self._cycles = fingerprint.create(cycles)
+        
+        self._size = size[::-1]
+        
+        if workers is None:
+            workers = os.cpu_count() or 1
+        
+        workers = max(1, min(workers, self._size[0]))
+        
+        _context = multiprocessing.get_context()
+        
+        self._start = _context.Barrier(workers + 1)
+        self._done  = _context.Semaphore(0)
+        
+        self._workers = []
+        
+        _bytes = self._size[0]*self._size[1]
+        
+        self._shm = [shared_memory.SharedMemory(create=True, size=_bytes),
+                     shared_memory.SharedMemory(create=True, size=_bytes),
+                     shared_memory.SharedMemory(create=True, size=8)]
+        
+        self._finalizer = weakref.finalize(self, _release, self._shm,
+                                           self._workers, self._start)
+        
+        self._bufs = [numpy.ndarray(self._size, dtype=numpy.uint8,
+                                    buffer=_shm.buf)
+                      for _shm in self._shm[:2]]
+        
+        self._control = numpy.ndarray((1,), dtype=numpy.int64,
+                                      buffer=self._shm[2].buf)
+        
+        if source is not None:
+            patterns.load(source, self._size, offset, self._bufs[0])
+        else:
+            self._bufs[0][:] = rng.integers(2, size=self._size,
+                                            dtype=numpy.uint8)
+        
+        self._current = 0
+        
+        _sync = _context.Barrier(workers)
+        
+        _bounds = numpy.linspace(0, self._size[0], workers + 1).astype(int)
+        
+        for i in range(workers):
+            _worker = _context.Process(
+                            target=_work,
+                            args=([_shm.name for _shm in self._shm],
+                                  self._size, self._rule,
+                                  _bounds[i], _bounds[i + 1],
+                                  self._start, _sync, self._done),
+                            daemon=True)
+            
+            _worker.start()
+            
+            self._workers.append(_worker)
+        
+        self._steps = 0
+        
+        self._closed = False
+    
+    
+    @property
+    def _mat(self):
+        """
+        A copy of the state (world) matrix as a NumPy uint8 Matrix.
+        
+        A copy is returned, rather than the shared Matrix itself, as the
+        shared Matrices are overwritten alternately by subsequent steps.
+        """
+        return self._bufs[self._current].copy()
+    
+    
+    def step(self, steps=1):
+        """
+        Advance or retract the model some number of steps.
+        
+        The step count is written to shared memory and the workers are
+        released to run all of the steps before the Model waits for them,
+        checking every POLL seconds that none has died.
+        
+        Overrides:
+        Model.step()    -- Abstract Base Class API method.
+        
+        Parameters:
+        self    -- GOLNumpyParallelModel:
+                        the object itself, Required.
+        steps   -- int: the number of steps to advance or retract if negative,
+                        Default = 1.
+        
+        Returns: None.
+        
+        Exceptions Raised:
+        ValueError          -- if self has already been closed with
+                               self.close(), or if steps is negative beyond
+                               the rollback history.
+        RuntimeError        -- if a worker process has failed or died.
+        """
+        if self._closed:
+            raise ValueError("Operation on closed Model.")
+        
+        if steps < 0:
+            self._rewind(-steps)
+            
+            return
+        
+        if steps == 0:
+            return
+        
+        _memory = self._remember()
+        
+        steps = self._skip(steps)
+        
+        self._control[0] = steps
+        
+        self._check()
+        
+        try:
+            self._start.wait(timeout=TIMEOUT)
+        except threading.BrokenBarrierError:
+            raise RuntimeError("Worker process failed") from None
+        
+        for _ in self._workers:
+            while not self._done.acquire(timeout=POLL):
+                self._check()
+        
+        self._current = (self._current + steps)%2
+        
+        self._steps += steps
+        
+        self._record(_memory)
+    
+    
+    def _check(self):
+        """
+        Check that every worker process is alive.
+        
+        Parameters:
+        self    -- GOLNumpyParallelModel:
+                        the object itself, Required.
+        
+        Returns: None.
+        
+        Exceptions Raised:
+        RuntimeError    -- if a worker process has died.
+        
+        Note:
+        This is a private "helper" method, it is called by step().
+        """
+        for _worker in self._workers:
+            if not _worker.is_alive():
+                raise RuntimeError(f"Worker process died with exit code "
+                                   f"{_worker.exitcode}")
+    
+    
+    def _load(self, state):
+        """
+        Replace the state (world) matrix, from the rollback history.
+        
+        The state is copied into the current shared Matrix.
+        
+        Overrides:
+        Model._load()   -- Base Class rollback helper.
+        
+        Parameters:
+        self    -- GOLNumpyParallelModel:
+                            the object itself, Required.
+        state   -- ndarray: the uint8 (0 or 1) state matrix, Required.
+        
+        Returns: None.
+        
+        Note:
+        This is a private "helper" method for the rollback history.
+        """
+        self._bufs[self._current][:] = state
+    
+    
+    def close(self):
+        """
+        Decommission, deactivate and delete the object permanently.
+        
+        This method stops and joins the worker processes and releases the
+        shared memory, through the finalizer, before the basic decommission.
+        
+        Overrides:
+        Model.close()   -- Base Class destructor.
+        
+        Parameters:
+        self    -- GOLNumpyParallelModel:   the object itself, Required.
+        
+        Returns None.
+        """
+        if self._closed:
+            return
+        
+        del self._bufs, self._control
+        
+        self._finalizer()
+        
+        super().close()
+
+
+def _release(shms, workers, start):
+    """
+    Stop the worker processes of a Model and release its shared memory.
+    
+    The workers are sent a negative step count and released, then joined,
+    and terminated if they do not stop. The SharedMemory blocks are closed
+    and unlinked, a block still viewed by the Matrices of a Model being
+    collected is unmapped when they are.
+    
+    Parameters:
+    shms    -- list:    the SharedMemory blocks of the two state Matrices and
+                        the control word, Required.
+    workers -- list:    the worker Processes started, Required.
+    start   -- Barrier: released by the Model to start a run of steps,
+                        Required.
+    
+    Returns: None.
+    
+    Note: This is a private function, you should not be calling this.
+    """
+    _control = numpy.ndarray((1,), dtype=numpy.int64, buffer=shms[2].buf)
+    
+    _control[0] = -1
+    
+    del _control
+    
+    if workers:
+        try:
+            start.wait(timeout=1)
+        except threading.BrokenBarrierError:
+            pass
+    
+    for _worker in workers:
+        _worker.join(timeout=1)
+        
+        if _worker.is_alive():
+            _worker.terminate()
+    
+    for _shm in shms:
+        try:
+            _shm.close()
+        except BufferError:
+            pass
+        
+        _shm.unlink()
+
+
+def _work(names, size, rule, first, last, start, sync, done):
+    """
+    Run a worker process stepping the strip of rows [first, last).
+    
+    Parameters:
+    names   -- list:    the SharedMemory names of the two state Matrices and
+                        the control word, Required.
+    size    -- tuple:   the dimensions (shape) of the "world", Required.
+    rule    -- uint32:  the rule lookup table, Required.
+    first   -- int:     the first row of the strip, Required.
+    last    -- int:     one past the last row of the strip, Required.
+    start   -- Barrier: released by the Model to start a run of steps,
+                        Required.
+    sync    -- Barrier: shared by the workers to separate generations,
+                        Required.
+    done    -- Semaphore:
+                        released by each worker at the end of a run,
+                        Required.
+    
+    Returns: None.
+    
+    Note: This is a private function, you should not be calling this.
+    """
+    _shms = [shared_memory.SharedMemory(name=_name) for _name in names]
+    
+    _bufs = [numpy.ndarray(size, dtype=numpy.uint8, buffer=_shm.buf)
+             for _shm in _shms[:2]]
+    
+    _control = numpy.ndarray((1,), dtype=numpy.int64, buffer=_shms[2].buf)
+    
+    _rows = numpy.arange(first - 1, last + 1)%size[0]
+    
+    _current = 0
+    
+    try:
+        while True:
+            start.wait()
+            
+            _steps = int(_control[0])
+            
+            if _steps < 0:
+                break
+            
+            for _ in range(_steps):
+                _strip_step(_bufs[_current], _bufs[1 - _current], rule,
+                            _rows, first, last)
+                
+                sync.wait()
+                
+                _current = 1 - _current
+            
+            done.release()
+    except BaseException:
+        start.abort()
+        sync.abort()
+        
+        raise
+    finally:
+        del _bufs, _control
+        
+        for _shm in _shms:
+            _shm.close()
+
+
+def _strip_step(src, dst, rule, rows, first, last):
+    """
+    Step the strip of rows [first, last) from src into dst.
+    
+    The strip and its halo rows are gathered, horizontal triples are summed
+    with wrap around and then vertical triples of those sums, less the cell
+    itself, give the neighbour counts.
+    
+    Parameters:
+    src     -- ndarray: the current state Matrix, Required.
+    dst     -- ndarray: the next state Matrix, Required.
+    rule    -- uint32:  the rule lookup table, Required.
+    rows    -- ndarray: the row indices of the strip with halo, Required.
+    first   -- int:     the first row of the strip, Required.
+    last    -- int:     one past the last row of the strip, Required.
+    
+    Returns: None.
+    
+    Note: This is a private function, you should not be calling this.
+    """
+    if 0 < first and last < src.shape[0]:
+        _block = src[first - 1:last + 1]
+    else:
+        _block = src.take(rows, axis=0)
+    
+    _triples = _block + numpy.roll(_block, 1, axis=1) \
+                      + numpy.roll(_block, -1, axis=1)
+    
+    _neighbours = _triples[:-2] + _triples[1:-1] + _triples[2:] \
+                - _block[1:-1]
+    
+    rules.apply(rule, 2*_neighbours + _block[1:-1], out=dst[first:last])
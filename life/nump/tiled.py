@@ -0,0 +1,371 @@
+"""
+This module implements John Conway's Game of Life with active tile tracking.
+
+The Game of Life "world" is represented as a NumPy Matrix (ndarray) divided
+into fixed-size tiles. A Matrix of per-tile "changed" flags is kept and only
+the tiles which changed in the last step, and their neighbours, are
+recomputed, by gathering them into a stack with fancy indexing.
+
+Classes:
+GOLNumpyTiledModel -- A Model of Game of Life recomputing only active tiles.
+"""
+
+import numpy
+
+from .. import fingerprint
+from .. import history
+from .. import mvc
+from .. import patterns
+from .. import rules
+from .. import timeline
+
+
+TILE = 32
+
+DENSE = 0.5
+
+rng = numpy.random.default_rng()
+
+
+class GOLNumpyTiledModel(mvc.Model):
+    """
+    A Model class implementing Game of Life as a Matrix of active tiles.
+    
+    The Game of Life "world" is represented as a NumPy Matrix (ndarray) and is
+    divided into tiles of (up to) tile x tile cells. Only cells within one
+    cell of a change can change in the next step, so only the tiles which
+    changed in the last step and their neighbours are recomputed. Still lifes
+    and empty space therefore cost nothing and the cost of a step scales with
+    activity rather than area. When more than half the tiles are active the
+    whole "world" is stepped at once instead, which is cheaper than gathering
+    and scattering so many tiles. The results are identical to those of
+    GOLNumpyRollModel. This class is intended to be used with compatible View
+    and Controller objects as part of a Model-View-Controller pattern.
+    
+    Where the tile size does not divide the "world", the last tile in a row
+    or column wraps around to overlap the first. Overlapping cells are simply
+    computed twice, to the same value.
+    
+    Extends:
+    ..mvc.Model -- Abstract Base Class for Models in the Model-View-Controller.
+    
+    Instance Variables:
+    _closed     -- bool:    the object has been terminated.
+    _mat        -- ndarray: the state (world) matrix.
+    _size       -- tuple:   the dimensions (shape) of _mat.
+    _steps      -- int:     the number of iterations from initial state.
+    _rule       -- uint32:  the rule lookup table.
+    _past       -- History: the rollback history, or None.
+    _frames     -- Timeline:
+                            the keyframes for step_to(), or None.
+    _cycles     -- Fingerprints:
+                            the recent fingerprints for cycle detection,
+                            or None.
+    _changed    -- ndarray: the tiles which changed in the last step.
+    _rows       -- ndarray: the row indices of each tile row, with halo.
+    _cols       -- ndarray: the column indices of each tile column, with halo.
+    _row_adj    -- ndarray: the adjacency matrix of tile rows.
+    _col_adj    -- ndarray: the adjacency matrix of tile columns.
+    _row_starts -- ndarray: the first row index of each tile row.
+    _col_starts -- ndarray: the first column index of each tile column.
+    
+    Methods:
+    __init__(self, size[, density][, source][, offset][, rollback][,
+                   rule][, keyframes][, cycles][, tile])
+            -- Initialize class object, override Model.__init__().
+    reset(self)
+            -- Reset the model to initial state, Not Implemented.
+    step(self[, steps])
+            -- Advance or retract the model relative, override Model.step().
+    _load(self, state)
+            -- Replace the state, override Model._load(), Private.
+    _init_tiles(self, size, tile)
+            -- Initialize the tile indices and adjacencies, Private.
+    _tiled_step(self)
+            -- Advance the model one step, Private.
+    _dense_step(self)
+            -- Advance the whole model one step, Private.
+    
+    Inherits:
+    Model.close(self)
+            -- Decommission, deactivate and delete the object.
+    Model.step_to(self, steps)
+            -- Advance or retract the model absolute.
+    
+    Warning:
+    Any assignment to instance variables or calls to private methods will
+    result in the object entering an illegal and potentially unrecoverable
+    state.
+    """
+    
+    def __init__(self, size, density=0.5, source=None, offset=None,
+                             rollback=0, rule=rules.CONWAY, keyframes=None,
+                             cycles=0, tile=TILE):
+        """
+        Initialize GOLNumpyTiledModel object.
+        
+        Overrides:
+        Model.__init__()    -- Abstract Base Class initializer.
+        
+        Parameters:
+        self        -- GOLNumpyTiledModel:
+                                the object itself, Required.
+        size        -- tuple:   the dimensions (shape) of the "world",
+                                Required.
+        density     -- float:   the initial statistical density of living
+                                cells, Default = 0.5, Ignored.
+        source      -- string:  the path of a pattern file (.rle, .cells or
+                                .mc) to initialize the "world",
+                                Default = None for random.
+        offset      -- tuple:   the x, y coordinates of the top left of the
+                                pattern, Default = None to centre it.
+        rollback    -- int:     the rollback memory budget in bytes for
+                                back-steps, or a history.History,
+                                Default = 0 for none.
+        rule        -- string:  the Life-like rule in B/S notation,
+                                Default = "B3/S23".
+        keyframes   -- string:  the path of a timeline file of keyframes for
+                                step_to(), or a timeline.Timeline,
+                                Default = None for none.
+        cycles      -- int:     the number of recent states fingerprinted for
+                                cycle detection, or a fingerprint.Fingerprints,
+                                Default = 0 for none.
+        tile        -- int:     the width and height of tiles, Default = 32.
+        
+        Returns: None.
+        
+        Exceptions Raised:
+        ValueError          -- if rule is not a valid Life-like rule, or
+                               rollback or cycles is negative, or the
+                               source is malformed or larger than the
+                               "world".
+        OSError             -- if the keyframes timeline or the source
+                               cannot be opened.
+        """
+        self._rule = rules.lookup(rule)
+        
+        self._past = history.create(rollback)
+        
+        self._frames = timeline.create(keyframes)
+        
+        self._cycles = fingerprint.create(cycles)
+        
+        self._size = size[::-1]
+        
+        self._init_tiles(self._size, tile)
+        
+        if source is not None:
+            self._mat = patterns.load(source, self._size, offset)
+        else:
+            self._mat = rng.integers(2, size=self._size, dtype=numpy.uint8)
+        
+        self._changed = numpy.ones((len(self._rows), len(self._cols)),
+                                   dtype=bool)
+        
+        self._steps = 0
+        
+        self._closed = False
+    
+    
+    def step(self, steps=1):
+        """
+        Advance or retract the model some number of steps.
+        
+        Overrides:
+        Model.step()    -- Abstract Base Class API method.
+        
+        Parameters:
+        self    -- GOLNumpyTiledModel:
+                        the object itself, Required.
+        steps   -- int: the number of steps to advance or retract if negative,
+                        Default = 1.
+        
+        Returns: None.
+        
+        Exceptions Raised:
+        ValueError          -- if self has already been closed with
+                               self.close(), or if steps is negative beyond
+                               the rollback history.
+        """
+        if self._closed:
+            raise ValueError("Operation on closed Model.")
+        
+        if steps < 0:
+            self._rewind(-steps)
+            
+            return
+        
+        _memory = self._remember()
+        
+        steps = self._skip(steps)
+        
+        for _ in range(steps):
+            self._tiled_step()
+        
+        self._steps += steps
+        
+        self._record(_memory)
+    
+    
+    def _load(self, state):
+        """
+        Replace the state (world) matrix, from the rollback history.
+        
+        Every tile is marked changed, to be stepped in full.
+        
+        Overrides:
+        Model._load()   -- Base Class rollback helper.
+        
+        Parameters:
+        self    -- GOLNumpyTiledModel:
+                            the object itself, Required.
+        state   -- ndarray: the uint8 (0 or 1) state matrix, Required.
+        
+        Returns: None.
+        
+        Note:
+        This is a private "helper" method for the rollback history.
+        """
+        self._mat = state
+        
+        self._changed[:] = True
+    
+    
+    def _init_tiles(self, size, tile):
+        """
+        Initialize the model's tile indices and adjacency matrices.
+        
+        Each tile row (column) is described by the indices of its cells with
+        a one cell halo on either side, modulo the "world" height (width).
+        Two tile rows (columns) are adjacent if either contains a cell within
+        one cell of the other, which is recorded in a symmetric adjacency
+        matrix. The tiles to recompute are then found by multiplying the
+        changed tiles by the adjacency matrices on either side.
+        
+        Parameters:
+        self    -- GOLNumpyTiledModel:
+                            the object itself, Required.
+        size    -- tuple:   the dimensions (shape) of the "world", Required.
+        tile    -- int:     the width and height of tiles, Required.
+        
+        Returns: None.
+        
+        Note:
+        This is a private "helper" method, this operation should not be
+        performed externally. External calls to this method may leave the
+        object in an illegal, unrecoverable state.
+        """
+        _axes = []
+        
+        for _n in size:
+            _t = min(tile, _n)
+            _count = -(-_n//_t)
+            
+            _halo = (numpy.arange(_count)[:, None]*_t
+                   + numpy.arange(-1, _t + 1)[None, :])%_n
+            
+            _cover = numpy.zeros((_count, _n), dtype=numpy.int32)
+            _cover[numpy.arange(_count)[:, None], _halo[:, 1:-1]] = 1
+            
+            _reach = numpy.zeros((_count, _n), dtype=numpy.int32)
+            _reach[numpy.arange(_count)[:, None], _halo] = 1
+            
+            _axes.append((_halo, numpy.minimum(_reach@_cover.T, 1),
+                          numpy.arange(_count)*_t))
+        
+        (self._rows, self._row_adj, self._row_starts), \
+        (self._cols, self._col_adj, self._col_starts) = _axes
+    
+    
+    def _tiled_step(self):
+        """
+        Advance the model one step, recomputing only the active tiles.
+        
+        The active tiles (changed tiles and their neighbours) are gathered,
+        with their halos, into a stack of small matrices. Neighbours are
+        summed by slicing each small matrix in the 8 cardinal directions and
+        the next states are looked up in the rule table as in
+        GOLNumpyRollModel. The results are scattered back into the "world" and
+        the tiles which changed are recorded for the next step.
+        
+        Parameters:
+        self    -- GOLNumpyTiledModel:
+                        the object itself, Required.
+        
+        Returns: None.
+        
+        Note:
+        This is a private "helper" method, externally this operation should be
+        performed by a call to step() with the default value of 1 for steps.
+        External calls to this method may leave the object in an illegal,
+        unrecoverable state.
+        """
+        _active = (self._row_adj@self._changed.astype(numpy.int32)
+                  @self._col_adj).nonzero()
+        
+        self._changed[:] = False
+        
+        if not len(_active[0]):
+            return
+        
+        if len(_active[0]) > DENSE*self._changed.size:
+            self._dense_step()
+            
+            return
+        
+        _rows = self._rows[_active[0]][:, :, None]
+        _cols = self._cols[_active[1]][:, None, :]
+        
+        _block = self._mat[_rows, _cols]
+        
+        _neighbours = _block[:, :-2, :-2] + _block[:, :-2, 1:-1] \
+                    + _block[:, :-2,  2:] + _block[:, 1:-1, :-2] \
+                    + _block[:, 1:-1, 2:] + _block[:,  2:, :-2] \
+                    + _block[:,  2:, 1:-1] + _block[:,  2:,  2:]
+        
+        _old = _block[:, 1:-1, 1:-1]
+        
+        _new = rules.apply(self._rule, 2*_neighbours + _old)
+        
+        self._changed[_active] = (_new != _old).any(axis=(1, 2))
+        
+        self._mat[_rows[:, 1:-1], _cols[:, :, 1:-1]] = _new
+    
+    
+    def _dense_step(self):
+        """
+        Advance the whole model one step, recording the tiles which changed.
+        
+        The "world" is padded with a one cell wrap around halo and neighbours
+        are summed by slicing in the 8 cardinal directions. Changed cells are
+        reduced to changed tiles by logical or over each tile's extent (the
+        overlap of a wrapped tile being attributed to the first tile only,
+        which covers it equally well).
+        
+        Parameters:
+        self    -- GOLNumpyTiledModel:
+                        the object itself, Required.
+        
+        Returns: None.
+        
+        Note:
+        This is a private "helper" method, externally this operation should be
+        performed by a call to step() with the default value of 1 for steps.
+        External calls to this method may leave the object in an illegal,
+        unrecoverable state.
+        """
+        _pad = numpy.pad(self._mat, 1, mode="wrap")
+        
+        _neighbours = _pad[:-2, :-2] + _pad[:-2, 1:-1] + _pad[:-2, 2:] \
+                    + _pad[1:-1, :-2]                  + _pad[1:-1, 2:] \
+                    + _pad[2:, :-2]  + _pad[2:, 1:-1]  + _pad[2:, 2:]
+        
+        _new = rules.apply(self._rule, 2*_neighbours + self._mat)
+        
+        _diff = numpy.logical_or.reduceat(_new != self._mat,
+                                          self._row_starts, axis=0)
+        
+        self._changed[:] = numpy.logical_or.reduceat(_diff,
+                                                     self._col_starts, axis=1)
+        
+        self._mat = _new
@@ -0,0 +1,664 @@
+"""
+This module provides pattern file loaders for the initial state of Models.
+
+Patterns are read from Run Length Encoded (.rle), plaintext (.cells) and
+Macrocell (.mc) files a chunk at a time, parsed with vectorised NumPy
+operations and written straight into the state (world) matrix at an offset,
+wrapping around the torus. No Python object is made per cell, or per run of
+cells, so that patterns of hundreds of megabytes load in seconds.
+
+The rule of a pattern file, if any, is ignored, as the rule of a Model is
+given separately.
+
+Constants:
+CHUNK   -- int:     the number of bytes read from a file at a time.
+LEAVES  -- int:     the number of Macrocell leaves written at a time.
+ALIVE   -- bytes:   the characters of living cells in plaintext files.
+FORMATS -- dict:    the format of each file extension.
+
+Functions:
+load(path, shape[, offset][, out])
+        -- load a pattern file into a state matrix.
+"""
+
+import os
+import re
+
+import numpy
+
+
+CHUNK = 1 << 24
+
+LEAVES = 1 << 16
+
+ALIVE = b"O*"
+
+FORMATS = {".rle" : "rle", ".cells" : "plaintext", ".mc" : "macrocell"}
+
+
+def load(path, shape, offset=None, out=None):
+    """
+    Load a pattern file into a state matrix.
+    
+    The format is found from the file extension (see FORMATS) or, failing
+    that, from the start of the file. The pattern is placed with the top
+    left of its bounding box at the offset, or centred, wrapping around the
+    edges of the "world", and every other cell is dead.
+    
+    Parameters:
+    path    -- string:  the path of the pattern file, Required.
+    shape   -- tuple:   the dimensions (shape) of the state matrix, Required.
+    offset  -- tuple:   the x, y coordinates of the top left of the pattern,
+                        Default = None to centre it.
+    out     -- ndarray: the uint8 state matrix to load into, Default = None
+                        for a new one.
+    
+    Returns: ndarray    -- the uint8 (0 or 1) state matrix.
+    
+    Exceptions Raised:
+    OSError     -- if the file cannot be read.
+    ValueError  -- if the file is malformed, or the pattern is larger than
+                   the "world".
+    """
+    if out is None:
+        out = numpy.zeros(shape, dtype=numpy.uint8)
+    else:
+        out[...] = 0
+    
+    with open(path, "rb") as _file:
+        _format = FORMATS.get(os.path.splitext(path)[1].lower()) \
+               or _sniff(_file)
+        
+        {"rle"       : _rle,
+         "plaintext" : _plaintext,
+         "macrocell" : _macrocell}[_format](_file, out, offset)
+    
+    return out
+
+
+def _sniff(file):
+    """
+    Find the format of a pattern file from its start.
+    
+    Parameters:
+    file    -- file:    the binary file, Required.
+    
+    Returns: string -- the format, see FORMATS.
+    
+    Note: This is a private function, you should not be calling this.
+    """
+    _head = file.read(256).lstrip()
+    
+    file.seek(0)
+    
+    if _head.startswith(b"[M2]"):
+        return "macrocell"
+    
+    if _head[:1] in (b"!", b".") or _head[:1] in ALIVE and _head[:1]:
+        return "plaintext"
+    
+    return "rle"
+
+
+def _origin(size, shape, offset):
+    """
+    Find the top left cell of a pattern in the "world".
+    
+    Parameters:
+    size    -- tuple:   the height and width of the pattern, Required.
+    shape   -- tuple:   the height and width of the "world", Required.
+    offset  -- tuple:   the x, y coordinates of the top left of the pattern,
+                        or None to centre it, Required.
+    
+    Returns: tuple  -- the row and column of the top left of the pattern.
+    
+    Exceptions Raised:
+    ValueError  -- if the pattern is larger than the "world".
+    
+    Note: This is a private function, you should not be calling this.
+    """
+    if size[0] > shape[0] or size[1] > shape[1]:
+        raise ValueError(f"Pattern of {size[1]}x{size[0]} cells is larger "
+                         f"than the world of {shape[1]}x{shape[0]}")
+    
+    if offset is None:
+        return (shape[0] - size[0])//2, (shape[1] - size[1])//2
+    
+    return offset[1]%shape[0], offset[0]%shape[1]
+
+
+def _lines(file):
+    """
+    Read a file a chunk of whole lines at a time.
+    
+    Parameters:
+    file    -- file:    the binary file, Required.
+    
+    Returns: generator  -- the uint8 arrays of the bytes of each chunk, each
+                           line ending with a newline.
+    
+    Note: This is a private function, you should not be calling this.
+    """
+    _carry = b""
+    
+    while True:
+        _data = file.read(CHUNK)
+        
+        if not _data:
+            if _carry:
+                yield numpy.frombuffer(_carry + b"\n", dtype=numpy.uint8)
+            
+            return
+        
+        _data = _carry + _data
+        _cut = _data.rfind(b"\n") + 1
+        _carry = _data[_cut:]
+        
+        if _cut:
+            yield numpy.frombuffer(_data[:_cut], dtype=numpy.uint8)
+
+
+def _rle(file, out, offset):
+    """
+    Load a Run Length Encoded (.rle) pattern file into a state matrix.
+    
+    After the comment lines and the header line (x = WIDTH, y = HEIGHT,
+    ...), the runs of each chunk are decoded at once: the digits of the run
+    counts are weighted by their powers of ten and summed per tag, and the
+    rows and columns of the tags are found by cumulative sums of the counts,
+    restarted at each end of line ('$'). The runs of living cells are then
+    written as +1 at their first cell and -1 after their last into the state
+    matrix itself, viewed as int8, which is summed along the rows at the
+    end. Digits at the end of a chunk are carried to the next.
+    
+    Parameters:
+    file    -- file:    the binary file, Required.
+    out     -- ndarray: the zeroed uint8 state matrix, Required.
+    offset  -- tuple:   the x, y coordinates of the top left of the pattern,
+                        or None to centre it, Required.
+    
+    Returns: None.
+    
+    Exceptions Raised:
+    ValueError  -- if there is no header, or the pattern is larger than in
+                   its header or than the "world".
+    
+    Note: This is a private function, you should not be calling this.
+    """
+    _size = None
+    
+    for _line in file:
+        _line = _line.strip()
+        
+        if not _line or _line.startswith(b"#"):
+            continue
+        
+        _header = dict(re.findall(rb"(\w+)\s*=\s*([^,\s]+)", _line))
+        
+        if b"x" in _header and b"y" in _header:
+            _size = (int(_header[b"y"]), int(_header[b"x"]))
+        
+        break
+    
+    if _size is None:
+        raise ValueError("RLE pattern has no header line")
+    
+    _top, _left = _origin(_size, out.shape, offset)
+    
+    _diff = out.view(numpy.int8)
+    
+    _y, _x = 0, 0
+    
+    _carry = b""
+    
+    while True:
+        _data = file.read(CHUNK)
+        
+        if not _data:
+            break
+        
+        _bytes = numpy.frombuffer(_carry + _data, dtype=numpy.uint8)
+        
+        _end = numpy.flatnonzero(_bytes == ord('!'))
+        
+        if len(_end):
+            _bytes = _bytes[:_end[0]]
+        
+        _bytes = _bytes[_bytes > ord(' ')]
+        
+        _digit = (_bytes >= ord('0')) & (_bytes <= ord('9'))
+        
+        _tags = numpy.flatnonzero(~_digit)
+        
+        _cut = _tags[-1] + 1 if len(_tags) else 0
+        
+        _carry = _bytes[_cut:].tobytes()
+        
+        if len(_tags):
+            _y, _x = _rle_runs(_bytes[:_cut], _digit[:_cut], _tags, _y, _x,
+                               _size, _diff, _top, _left)
+        
+        if len(_end):
+            break
+    
+    numpy.cumsum(_diff, axis=1, out=_diff)
+    
+    numpy.clip(_diff, 0, 1, out=_diff)
+
+
+def _rle_runs(data, digit, tags, y, x, size, diff, top, left):
+    """
+    Decode the runs of a chunk of an RLE pattern into the difference matrix.
+    
+    Parameters:
+    data    -- ndarray: the bytes of the chunk, ending with a tag, Required.
+    digit   -- ndarray: the bool mask of the digits of data, Required.
+    tags    -- ndarray: the indices of the tags of data, Required.
+    y       -- int:     the row of the first tag, Required.
+    x       -- int:     the column of the first tag, Required.
+    size    -- tuple:   the height and width of the pattern, Required.
+    diff    -- ndarray: the int8 difference matrix, Required.
+    top     -- int:     the row of the top of the pattern, Required.
+    left    -- int:     the column of the left of the pattern, Required.
+    
+    Returns: tuple  -- the row and column after the last tag.
+    
+    Exceptions Raised:
+    ValueError  -- if the pattern is larger than in its header.
+    
+    Note: This is a private function, you should not be calling this.
+    """
+    _owner = numpy.cumsum(~digit)[digit]
+    _where = numpy.flatnonzero(digit)
+    
+    _value = (data[_where] - ord('0')).astype(numpy.int64) \
+           * numpy.power(10, tags[_owner] - _where - 1, dtype=numpy.int64)
+    
+    _counts = numpy.ones(len(tags), dtype=numpy.int64)
+    
+    if len(_owner):
+        _first = numpy.flatnonzero(numpy.diff(_owner, prepend=-1))
+        
+        _counts[_owner[_first]] = numpy.add.reduceat(_value, _first)
+    
+    _chars = data[tags]
+    
+    _newline = _chars == ord('$')
+    _alive = ~_newline & (_chars != ord('b')) & (_chars != ord('.'))
+    
+    _across = numpy.where(_newline, 0, _counts)
+    _down = numpy.where(_newline, _counts, 0)
+    
+    _rows = y + numpy.cumsum(_down) - _down
+    
+    _sum = numpy.cumsum(_across)
+    
+    _last = numpy.maximum.accumulate(
+                numpy.where(_newline, numpy.arange(len(tags)), -1))
+    
+    _base = numpy.where(_last >= 0, _sum[numpy.maximum(_last, 0)], -x)
+    
+    _cols = _sum - _across - _base
+    
+    _r = _rows[_alive]
+    _c0 = _cols[_alive]
+    _c1 = _c0 + _counts[_alive]
+    
+    if len(_r) and (_r.max() >= size[0] or _c1.max() > size[1]):
+        raise ValueError("RLE pattern is larger than its header "
+                         f"x = {size[1]}, y = {size[0]}")
+    
+    _paint(diff, _r, _c0, _c1, top, left)
+    
+    return int(_rows[-1] + _down[-1]), int(_sum[-1] - _base[-1])
+
+
+def _paint(diff, rows, starts, stops, top, left):
+    """
+    Write runs of living cells into a difference matrix, wrapping around.
+    
+    Each run is written as +1 at its first cell and -1 after its last,
+    unless that is past the last column, and a run crossing the right edge
+    is split in two.
+    
+    Parameters:
+    diff    -- ndarray: the int8 difference matrix, Required.
+    rows    -- ndarray: the rows of the runs in the pattern, Required.
+    starts  -- ndarray: the first columns of the runs, Required.
+    stops   -- ndarray: the columns after the runs, Required.
+    top     -- int:     the row of the top of the pattern, Required.
+    left    -- int:     the column of the left of the pattern, Required.
+    
+    Returns: None.
+    
+    Note: This is a private function, you should not be calling this.
+    """
+    _height, _width = diff.shape
+    
+    _rows = (rows + top)%_height
+    _starts = starts + left
+    _stops = stops + left
+    
+    _beyond = _starts >= _width
+    
+    _starts[_beyond] -= _width
+    _stops[_beyond] -= _width
+    
+    _across = _stops > _width
+    
+    _rows = numpy.concatenate((_rows, _rows[_across]))
+    _starts = numpy.concatenate((_starts, numpy.zeros(_across.sum(),
+                                                      dtype=_starts.dtype)))
+    _stops = numpy.concatenate((numpy.minimum(_stops, _width),
+                                _stops[_across] - _width))
+    
+    diff[_rows, _starts] += 1
+    
+    _inside = _stops < _width
+    
+    diff[_rows[_inside], _stops[_inside]] -= 1
+
+
+def _plaintext(file, out, offset):
+    """
+    Load a plaintext (.cells) pattern file into a state matrix.
+    
+    The file is read twice, first for the size of the pattern (the number
+    of lines other than comments, starting with '!', and the length of the
+    longest) and then for the living cells (see ALIVE) of each chunk, found
+    at once from the starts of the lines.
+    
+    Parameters:
+    file    -- file:    the binary file, Required.
+    out     -- ndarray: the zeroed uint8 state matrix, Required.
+    offset  -- tuple:   the x, y coordinates of the top left of the pattern,
+                        or None to centre it, Required.
+    
+    Returns: None.
+    
+    Exceptions Raised:
+    ValueError  -- if the pattern is larger than the "world".
+    
+    Note: This is a private function, you should not be calling this.
+    """
+    _height, _width = 0, 0
+    
+    for _bytes in _lines(file):
+        _rows, _length, _cells = _plaintext_lines(_bytes)
+        
+        _height += _rows
+        
+        if len(_length):
+            _width = max(_width, int(_length.max()))
+    
+    file.seek(0)
+    
+    _top, _left = _origin((_height, _width), out.shape, offset)
+    
+    _y = 0
+    
+    for _bytes in _lines(file):
+        _rows, _length, (_r, _c) = _plaintext_lines(_bytes)
+        
+        out[(_r + _y + _top)%out.shape[0], (_c + _left)%out.shape[1]] = 1
+        
+        _y += _rows
+
+
+def _plaintext_lines(data):
+    """
+    Find the lines and living cells of a chunk of a plaintext pattern.
+    
+    Parameters:
+    data    -- ndarray: the bytes of whole lines, Required.
+    
+    Returns: tuple  -- the number of lines other than comments, their
+                       lengths, and the rows and columns of their living
+                       cells.
+    
+    Note: This is a private function, you should not be calling this.
+    """
+    _newline = data == ord('\n')
+    
+    _ends = numpy.flatnonzero(_newline)
+    _starts = numpy.concatenate(([0], _ends[:-1] + 1))
+    
+    _comment = data[_starts] == ord('!')
+    
+    _length = _ends - _starts
+    _length -= (_length > 0) & (data[_ends - 1] == ord('\r'))
+    
+    _line = numpy.cumsum(_newline) - _newline
+    _row = numpy.cumsum(~_comment) - 1
+    
+    _where = numpy.flatnonzero(numpy.isin(data, numpy.frombuffer(
+                                                    ALIVE, dtype=numpy.uint8)))
+    _where = _where[~_comment[_line[_where]]]
+    
+    return (int((~_comment).sum()), _length[~_comment],
+            (_row[_line[_where]], _where - _starts[_line[_where]]))
+
+
+def _macrocell(file, out, offset):
+    """
+    Load a Macrocell (.mc) pattern file into a state matrix.
+    
+    The nodes of the quadtree are numbered from 1 in the order of their
+    lines, each an 8x8 leaf ('.', '*' and '$' for dead, living and end of
+    row) or "LEVEL NW NE SW SE" referring to earlier nodes (or 0 for
+    empty), the last being the root. The file is read a chunk of whole
+    lines at a time (see _lines()), the lines of each chunk sorted by the
+    kind of their first byte and the leaves decoded and the numbers parsed
+    for the whole chunk at once, with no Python object per line. The tree
+    is expanded a level at a time, for every non-empty
+    node at once, down to the positions of its leaves, which are written
+    LEAVES at a time.
+    
+    Parameters:
+    file    -- file:    the binary file, Required.
+    out     -- ndarray: the zeroed uint8 state matrix, Required.
+    offset  -- tuple:   the x, y coordinates of the top left of the pattern,
+                        or None to centre it, Required.
+    
+    Returns: None.
+    
+    Exceptions Raised:
+    ValueError  -- if the file is malformed, or the pattern is larger than
+                   the "world".
+    
+    Note: This is a private function, you should not be calling this.
+    """
+    _leaves, _leaf_ids = [], []
+    _nodes, _node_ids = [], []
+    
+    _count = 0
+    
+    for _data in _lines(file):
+        _ends = numpy.flatnonzero(_data == ord('\n'))
+        _starts = numpy.concatenate(([0], _ends[:-1] + 1))
+        
+        _kind = _data[_starts]
+        
+        _node = (_kind >= ord('0')) & (_kind <= ord('9'))
+        _leaf = (_kind == ord('.')) | (_kind == ord('*')) \
+              | (_kind == ord('$'))
+        
+        _ids = _count + numpy.cumsum(_node | _leaf)
+        
+        _count = int(_ids[-1])
+        
+        _lengths = _ends - _starts + 1
+        
+        if _node.any():
+            _nodes.append(_macrocell_nodes(
+                                _data[numpy.repeat(_node, _lengths)]))
+            _node_ids.append(_ids[_node])
+        
+        if _leaf.any():
+            _leaves.append(_macrocell_leaves(
+                                _data[numpy.repeat(_leaf, _lengths)]))
+            _leaf_ids.append(_ids[_leaf])
+    
+    if _count == 0:
+        return
+    
+    _level = numpy.zeros(_count + 1, dtype=numpy.int64)
+    _children = numpy.zeros((_count + 1, 4), dtype=numpy.int64)
+    _slot = numpy.full(_count + 1, -1)
+    
+    _bits = numpy.concatenate(_leaves) if _leaves \
+            else numpy.zeros((0, 8, 8), dtype=numpy.uint8)
+    
+    if _leaves:
+        _leaf_ids = numpy.concatenate(_leaf_ids)
+        
+        _level[_leaf_ids] = 3
+        _slot[_leaf_ids] = numpy.arange(len(_leaf_ids))
+    
+    if _nodes:
+        _ids = numpy.concatenate(_node_ids)
+        
+        _values = numpy.concatenate(_nodes)
+        
+        _level[_ids] = _values[:, 0]
+        _children[_ids] = _values[:, 1:]
+        
+        if (_values[:, 1:] >= _ids[:, None]).any() \
+        or (_values[:, 1:] < 0).any() \
+        or ((_level[_values[:, 1:]] != _values[:, :1] - 1)
+            & (_values[:, 1:] != 0)).any():
+            raise ValueError("Macrocell pattern has malformed nodes")
+    
+    _ids = numpy.array([_count])
+    _ys = numpy.zeros(1, dtype=numpy.int64)
+    _xs = numpy.zeros(1, dtype=numpy.int64)
+    
+    if not 3 <= _level[_count] < 62:
+        raise ValueError(f"Macrocell pattern of level {_level[_count]} "
+                          "not supported")
+    
+    for _lv in range(int(_level[_count]), 3, -1):
+        _half = 1 << (_lv - 1)
+        
+        _kids = _children[_ids]
+        _keep = _kids != 0
+        
+        _ys = (_ys[:, None] + numpy.array([0, 0, _half, _half]))[_keep]
+        _xs = (_xs[:, None] + numpy.array([0, _half, 0, _half]))[_keep]
+        
+        _ids = _kids[_keep]
+    
+    _slots = _slot[_ids]
+    
+    _rows = _bits.any(axis=2)
+    _cols = _bits.any(axis=1)
+    
+    _keep = _rows[_slots].any(axis=1)
+    
+    _slots, _ys, _xs = _slots[_keep], _ys[_keep], _xs[_keep]
+    
+    if not len(_slots):
+        return
+    
+    _y0 = (_ys + _rows.argmax(axis=1)[_slots]).min()
+    _x0 = (_xs + _cols.argmax(axis=1)[_slots]).min()
+    _y1 = (_ys + 8 - _rows[:, ::-1].argmax(axis=1)[_slots]).max()
+    _x1 = (_xs + 8 - _cols[:, ::-1].argmax(axis=1)[_slots]).max()
+    
+    _top, _left = _origin((int(_y1 - _y0), int(_x1 - _x0)), out.shape,
+                          offset)
+    
+    for _first in range(0, len(_slots), LEAVES):
+        _part = slice(_first, _first + LEAVES)
+        
+        _k, _r, _c = numpy.nonzero(_bits[_slots[_part]])
+        
+        out[(_ys[_part][_k] - _y0 + _r + _top)%out.shape[0],
+            (_xs[_part][_k] - _x0 + _c + _left)%out.shape[1]] = 1
+
+
+def _macrocell_nodes(data):
+    """
+    Parse the numbers of the node lines of a chunk of a Macrocell pattern.
+    
+    Parameters:
+    data    -- ndarray: the bytes of the node lines, each ending with a
+                        newline, Required.
+    
+    Returns: ndarray    -- the int64 level and the four children of each
+                           node, of shape (lines, 5).
+    
+    Exceptions Raised:
+    ValueError  -- if a node line is not of five numbers.
+    
+    Note: This is a private function, you should not be calling this.
+    """
+    _newline = data == ord('\n')
+    _digit = (data >= ord('0')) & (data <= ord('9'))
+    
+    if not (_digit | _newline | (data == ord(' ')) | (data == ord('\t'))
+            | (data == ord('\r'))).all():
+        raise ValueError("Macrocell pattern has malformed nodes")
+    
+    _begin = _digit & ~numpy.roll(_digit, 1)
+    
+    _firsts = numpy.flatnonzero(_begin)
+    _lasts = numpy.flatnonzero(_digit & ~numpy.roll(_digit, -1))
+    
+    _line = numpy.cumsum(_newline) - _newline
+    
+    _tokens = numpy.bincount(_line[_firsts], minlength=int(_newline.sum()))
+    
+    if (_tokens != 5).any() or (_lasts - _firsts).max() > 17:
+        raise ValueError("Macrocell pattern has malformed nodes")
+    
+    _where = numpy.flatnonzero(_digit)
+    _owner = numpy.cumsum(_begin)[_where] - 1
+    
+    _value = (data[_where] - ord('0')).astype(numpy.int64) \
+           * numpy.power(10, _lasts[_owner] - _where, dtype=numpy.int64)
+    
+    return numpy.add.reduceat(_value, numpy.flatnonzero(_begin[_where])) \
+                .reshape(-1, 5)
+
+
+def _macrocell_leaves(text):
+    """
+    Decode the 8x8 leaves of a chunk of a Macrocell pattern at once.
+    
+    Parameters:
+    text    -- ndarray: the bytes of the leaf lines, each ending with a
+                        newline, Required.
+    
+    Returns: ndarray    -- the uint8 (0 or 1) cells of the leaves, of shape
+                           (lines, 8, 8).
+    
+    Exceptions Raised:
+    ValueError  -- if a leaf is larger than 8x8 cells.
+    
+    Note: This is a private function, you should not be calling this.
+    """
+    _newline = text == ord('\n')
+    _break = _newline | (text == ord('$'))
+    
+    _bits = numpy.zeros((int(_newline.sum()), 8, 8), dtype=numpy.uint8)
+    
+    _leaf = numpy.cumsum(_newline) - _newline
+    _segment = numpy.cumsum(_break) - _break
+    
+    _starts = numpy.concatenate(([0], numpy.flatnonzero(_break) + 1))
+    _firsts = _segment[numpy.concatenate(
+                            ([0], numpy.flatnonzero(_newline)[:-1] + 1))]
+    
+    _where = numpy.flatnonzero(text == ord('*'))
+    
+    _l = _leaf[_where]
+    _r = _segment[_where] - _firsts[_l]
+    _c = _where - _starts[_segment[_where]]
+    
+    if len(_where) and (_r.max() > 7 or _c.max() > 7):
+        raise ValueError("Macrocell pattern has a leaf larger than 8x8")
+    
+    _bits[_l, _r, _c] = 1
+    
+    return _bits
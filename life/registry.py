@@ -0,0 +1,307 @@
+"""
+This module provides registries of the Models, Views and Controllers.
+
+A registry maps names (and their aliases) to the classes, or any callables,
+which create the elements of a Model-View-Controller. Each is registered as
+a "module:attribute" reference and imported only when its name is first
+looked up, so that choosing one never imports the others, nor PyGame, curses
+or SciPy unless they are used. Third party packages may register more under
+the entry point groups below, e.g. in their pyproject.toml:
+
+    [project.entry-points."matrix_life.models"]
+    my-engine = "my_package.engine:MyModel"
+
+The Models of the package are registered here under their names, for
+main.py and life.bench alike.
+
+Constants:
+MODELS      -- string:  the entry point group of the Models.
+VIEWS       -- string:  the entry point group of the Views.
+CONTROLLERS -- string:  the entry point group of the Controllers.
+DEFAULT     -- list:    the names of the default of each registry.
+NP_MATMUL, NP_ROLL, NP_BITWISE, NP_HASHLIFE, NP_TILED, NP_PARALLEL,
+NP_PADDED, NP_BLOCK, SP_MATMUL, SP_CONVOLVE
+            -- list:    the names of each of the Models of the package.
+ALGORITHMS  -- list:    the names of all of the Models of the package.
+
+Classes:
+Registry    -- A mapping of names to lazily imported objects.
+
+Functions:
+models()            -- create the Registry of the Models of the package.
+resolve(reference)  -- import the object of a "module:attribute" reference.
+plugins(group)      -- find the references of the entry points of a group.
+"""
+
+import importlib
+
+
+MODELS      = "matrix_life.models"
+VIEWS       = "matrix_life.views"
+CONTROLLERS = "matrix_life.controllers"
+
+DEFAULT   = ["default", "def", "deflt", "dflt", 'd']
+
+NP_MATMUL   = ["numpy-matmul","np-matmul", "n-matmul", "nm",
+               "numpy", "np", 'n']
+NP_ROLL     = ["numpy-roll", "np-roll", "n-roll", "nr", "roll", 'r']
+NP_BITWISE  = ["numpy-bitwise", "np-bitwise", "n-bitwise", "nb",
+               "bitwise", "bits", 'b']
+NP_HASHLIFE = ["numpy-hashlife", "np-hashlife", "n-hashlife", "nh",
+               "hashlife", "hash", 'h']
+NP_TILED    = ["numpy-tiled", "np-tiled", "n-tiled", "nt",
+               "tiled", "tiles", 't']
+NP_PARALLEL = ["numpy-parallel", "np-parallel", "n-parallel", "npar",
+               "parallel", "par"]
+NP_PADDED   = ["numpy-padded", "np-padded", "n-padded", "npad",
+               "padded", "pad", "inplace"]
+NP_BLOCK    = ["numpy-block", "np-block", "n-block", "nbl", "block", "blocks"]
+SP_MATMUL   = ["scipy-matmul", "sparse-matmul", "sp-matmul", "s-matmul", "sm",
+               "scipy", "sparse", "sp", 's',
+               "matmul", 'm']
+SP_CONVOLVE = ["scipy-convolve", "scipy-conv", "sp-convolve", "sp-conv", "sc",
+               "convolve", "conv", 'c']
+
+ALGORITHMS = DEFAULT + NP_MATMUL + NP_ROLL + NP_BITWISE + NP_HASHLIFE \
+           + NP_TILED + NP_PARALLEL + NP_PADDED + NP_BLOCK \
+           + SP_MATMUL + SP_CONVOLVE
+
+_plugins = {}
+
+
+class Registry:
+    """
+    A mapping of names to lazily imported objects, extended by entry points.
+    
+    Each name is registered with either a "module:attribute" reference,
+    which is imported the first time the name is looked up, or the object
+    itself. The entry points of the group, if any, are only looked for once
+    a name is not found among those registered, or all names are listed, and
+    never replace a name registered. A Registry may be given as the choices
+    of an argparse option.
+    
+    Instance Variables:
+    _entries    -- dict:    the reference or object of each name.
+    _objects    -- dict:    the object of each reference imported.
+    _group      -- string:  the entry point group of plugins, or None.
+    _found      -- bool:    the entry points of the group have been added.
+    
+    Methods:
+    __init__(self[, entries][, group])
+            -- Initialize class object.
+    __contains__(self, name)
+            -- Whether a name is registered.
+    __getitem__(self, name)
+            -- The object of a name, importing it if need be.
+    __iter__(self)
+            -- Iterate over the names registered.
+    items(self)
+            -- Iterate over the names and objects registered.
+    register(self, names, entry)
+            -- Register a reference or object under some names.
+    _discover(self)
+            -- Add the entry points of the group, Private.
+    """
+    
+    def __init__(self, entries=None, group=None):
+        """
+        Initialize Registry object.
+        
+        Parameters:
+        self    -- Registry:    the object itself, Required.
+        entries -- dict:        the reference or object of each name,
+                                Default = None for none.
+        group   -- string:      the entry point group of plugins,
+                                Default = None for none.
+        
+        Returns: None.
+        """
+        self._entries = dict(entries or {})
+        self._objects = {}
+        
+        self._group = group
+        self._found = group is None
+    
+    
+    def __contains__(self, name):
+        """
+        Whether a name is registered, or is the name of an entry point.
+        
+        Parameters:
+        self    -- Registry:    the object itself, Required.
+        name    -- string:      the name, Required.
+        
+        Returns: bool   -- the name is registered.
+        """
+        if name not in self._entries:
+            self._discover()
+        
+        return name in self._entries
+    
+    
+    def __getitem__(self, name):
+        """
+        The object of a name, imported from its reference if need be.
+        
+        Parameters:
+        self    -- Registry:    the object itself, Required.
+        name    -- string:      the name, Required.
+        
+        Returns: object -- the object registered under the name.
+        
+        Exceptions Raised:
+        KeyError    -- if the name is not registered.
+        ImportError -- if the reference cannot be imported.
+        """
+        if name not in self._entries:
+            self._discover()
+        
+        _entry = self._entries[name]
+        
+        if not isinstance(_entry, str):
+            return _entry
+        
+        if _entry not in self._objects:
+            self._objects[_entry] = resolve(_entry)
+        
+        return self._objects[_entry]
+    
+    
+    def __iter__(self):
+        """
+        Iterate over the names registered, with those of the entry points.
+        
+        Parameters:
+        self    -- Registry:    the object itself, Required.
+        
+        Returns: iterator   -- the names, in the order registered.
+        """
+        self._discover()
+        
+        return iter(list(self._entries))
+    
+    
+    def items(self):
+        """
+        Iterate over the names and objects registered, importing them all.
+        
+        Parameters:
+        self    -- Registry:    the object itself, Required.
+        
+        Returns: iterator   -- the name and object pairs, in the order
+                               registered.
+        
+        Exceptions Raised:
+        ImportError -- if a reference cannot be imported.
+        """
+        return ((_name, self[_name]) for _name in self)
+    
+    
+    def register(self, names, entry):
+        """
+        Register a reference or object under some names.
+        
+        Parameters:
+        self    -- Registry:    the object itself, Required.
+        names   -- list:        the name and aliases to register, Required.
+        entry   -- object:      the "module:attribute" reference or the
+                                object itself, Required.
+        
+        Returns: None.
+        """
+        for _name in names:
+            self._entries[_name] = entry
+    
+    
+    def _discover(self):
+        """
+        Add the entry points of the group, under any names not registered.
+        
+        Parameters:
+        self    -- Registry:    the object itself, Required.
+        
+        Returns: None.
+        
+        Note: This is a private method, you should not be calling this.
+        """
+        if self._found:
+            return
+        
+        for _name, _reference in plugins(self._group).items():
+            self._entries.setdefault(_name, _reference)
+        
+        self._found = True
+
+
+def models():
+    """
+    Create the Registry of the Models of the package, and of any plugins.
+    
+    Returns: Registry   -- the Model classes by name and alias, the default
+                           being numpy-roll.
+    """
+    return Registry({
+        **{key : "life.nump.roll:GOLNumpyRollModel"     for key in DEFAULT},
+        **{key : "life.nump.roll:GOLNumpyRollModel"     for key in NP_ROLL},
+        **{key : "life.nump.matmul:GOLNumpyMatmulModel" for key in NP_MATMUL},
+        **{key : "life.nump.bitwise:GOLNumpyBitwiseModel"
+                                                    for key in NP_BITWISE},
+        **{key : "life.nump.hashlife:GOLNumpyHashLifeModel"
+                                                    for key in NP_HASHLIFE},
+        **{key : "life.nump.tiled:GOLNumpyTiledModel"   for key in NP_TILED},
+        **{key : "life.nump.parallel:GOLNumpyParallelModel"
+                                                    for key in NP_PARALLEL},
+        **{key : "life.nump.padded:GOLNumpyPaddedModel" for key in NP_PADDED},
+        **{key : "life.nump.block:GOLNumpyBlockModel"   for key in NP_BLOCK},
+        **{key : "life.scip.matmul:GOLScipyMatmulModel" for key in SP_MATMUL},
+        **{key : "life.scip.convolve:GOLScipyConvolveModel"
+                                                    for key in SP_CONVOLVE}
+    }, MODELS)
+
+
+def resolve(reference):
+    """
+    Import the object of a "module:attribute" reference.
+    
+    The attribute may be dotted, e.g. "package.module:Class.method", and a
+    reference with no attribute is to the module itself.
+    
+    Parameters:
+    reference   -- string:  the reference, Required.
+    
+    Returns: object -- the object referred to.
+    
+    Exceptions Raised:
+    ImportError     -- if the module cannot be imported.
+    AttributeError  -- if the module has no such attribute.
+    """
+    _module, _, _attribute = reference.partition(':')
+    
+    _object = importlib.import_module(_module)
+    
+    for _name in filter(None, _attribute.split('.')):
+        _object = getattr(_object, _name)
+    
+    return _object
+
+
+def plugins(group):
+    """
+    Find the references of the entry points of a group.
+    
+    The installed distributions are only searched once for each group, and
+    importlib.metadata is only imported then.
+    
+    Parameters:
+    group   -- string:  the entry point group, Required.
+    
+    Returns: dict   -- the "module:attribute" reference of each entry point
+                       by name.
+    """
+    if group not in _plugins:
+        import importlib.metadata
+        
+        _plugins[group] = {_point.name : _point.value for _point
+                           in importlib.metadata.entry_points(group=group)}
+    
+    return _plugins[group]
@@ -0,0 +1,272 @@
+"""
+This module compiles Life-like cellular automaton rules for the Models.
+
+A Life-like rule is given in B/S notation, the neighbour counts for which a
+dead cell is born and those for which a living cell survives, e.g. "B3/S23"
+for Conway's Game of Life or "B36/S23" for HighLife. The legacy S/B notation
+("23/3") and the names in RULES are also accepted. Rules are compiled once
+into a lookup table indexed by 2*neighbours + alive, so that Models may apply
+any rule with a single vectorised lookup.
+
+Constants:
+CONWAY  -- string:  the rule of Conway's Game of Life.
+RULES   -- dict:    the B/S notation of some well known rules, by name.
+
+Functions:
+parse(rule)     -- parse a rule into its birth and survival counts.
+normalize(rule) -- normalize a rule into B/S notation.
+lookup(rule)    -- compile a rule into a lookup table.
+notation(table) -- convert a lookup table back into B/S notation.
+apply(table, index[, out])
+                -- look up the next states of cells in a lookup table.
+ranges(table)   -- find the ranges of living cell indices in a lookup table.
+bitwise(table)  -- compile a lookup table into a function of bit planes.
+"""
+
+import re
+
+import numpy
+
+
+CONWAY = "B3/S23"
+
+RULES = \
+{
+    "life"          : CONWAY,
+    "conway"        : CONWAY,
+    "highlife"      : "B36/S23",
+    "day-and-night" : "B3678/S34678",
+    "daynight"      : "B3678/S34678",
+    "seeds"         : "B2/S",
+    "life-without-death"
+                    : "B3/S012345678",
+    "replicator"    : "B1357/S1357",
+    "maze"          : "B3/S12345",
+    "2x2"           : "B36/S125",
+    "morley"        : "B368/S245",
+    "anneal"        : "B4678/S35678",
+    "diamoeba"      : "B35678/S5678"
+}
+
+_BS = re.compile(r"B([0-8]*)/?S([0-8]*)", re.IGNORECASE)
+_SB = re.compile(r"([0-8]*)/([0-8]*)")
+
+
+def parse(rule):
+    """
+    Parse a rule into its birth and survival neighbour counts.
+    
+    Parameters:
+    rule    -- string:  the rule in B/S or S/B notation, or a name in RULES,
+                        Required.
+    
+    Returns: tuple  -- the (birth, survive) tuples of sorted neighbour counts.
+    
+    Exceptions Raised:
+    ValueError  -- if rule is not a valid Life-like rule.
+    """
+    _rule = RULES.get(rule.strip().lower(), rule.strip())
+    
+    _match = _BS.fullmatch(_rule)
+    
+    if _match is not None:
+        _birth, _survive = _match.groups()
+    else:
+        _match = _SB.fullmatch(_rule)
+        
+        if _match is None:
+            raise ValueError(f"Invalid Life-like rule: '{rule}'")
+        
+        _survive, _birth = _match.groups()
+    
+    return tuple(sorted({int(_n) for _n in _birth})), \
+           tuple(sorted({int(_n) for _n in _survive}))
+
+
+def normalize(rule):
+    """
+    Normalize a rule into B/S notation, e.g. "23/3" into "B3/S23".
+    
+    Parameters:
+    rule    -- string:  the rule in B/S or S/B notation, or a name in RULES,
+                        Required.
+    
+    Returns: string -- the rule in B/S notation.
+    
+    Exceptions Raised:
+    ValueError  -- if rule is not a valid Life-like rule.
+    """
+    _birth, _survive = parse(rule)
+    
+    return "B" + "".join(map(str, _birth)) + "/S" + "".join(map(str, _survive))
+
+
+def lookup(rule):
+    """
+    Compile a rule into a lookup table of next states.
+    
+    The table has 18 entries, indexed by 2*neighbours + alive, which is
+    also directly the convolution of the "world"
+    with a kernel of 2 for each neighbour and 1 for the cell itself. As each
+    entry is a single bit the table is packed into the bits of an unsigned
+    integer, so that a lookup is a shift and a mask rather than a take(),
+    which would first convert every index to a 64 bit integer.
+    
+    Parameters:
+    rule    -- string:  the rule in B/S or S/B notation, or a name in RULES,
+                        Required.
+    
+    Returns: uint32 -- the lookup table, the next state for index i in bit i.
+    
+    Exceptions Raised:
+    ValueError  -- if rule is not a valid Life-like rule.
+    """
+    _birth, _survive = parse(rule)
+    
+    return numpy.uint32(sum(1 << 2*_n for _n in _birth)
+                      | sum(1 << 2*_n + 1 for _n in _survive))
+
+
+def notation(table):
+    """
+    Convert a lookup table back into a rule in B/S notation.
+    
+    Parameters:
+    table   -- uint32:  the lookup table, as from lookup(), Required.
+    
+    Returns: string -- the rule in B/S notation.
+    """
+    _table = int(table)
+    
+    return "B" + "".join(str(_n) for _n in range(9) if _table >> 2*_n & 1) \
+         + "/S" + "".join(str(_n) for _n in range(9)
+                          if _table >> 2*_n + 1 & 1)
+
+
+def apply(table, index, out=None):
+    """
+    Look up the next states of cells in a lookup table.
+    
+    Parameters:
+    table   -- uint32:  the lookup table as returned by lookup(), Required.
+    index   -- ndarray: the unsigned 2*neighbours + alive of each cell,
+                        Required.
+    out     -- ndarray: the uint8 matrix to write the next states to,
+                        Default = None for a new matrix.
+    
+    Returns: ndarray    -- the uint8 (0 or 1) next states.
+    """
+    return numpy.bitwise_and(numpy.right_shift(table, index), 1, out=out,
+                             dtype=numpy.uint8, casting="unsafe")
+
+
+def ranges(table):
+    """
+    Find the ranges of living cell indices in a lookup table.
+    
+    This is the form of a rule suited to Models which cannot afford the wide
+    intermediate of apply(), a cell being alive in the next step exactly
+    when its index falls in one of the ranges, e.g. (5, 7) alone for
+    Conway's rule.
+    
+    Parameters:
+    table   -- uint32:  the lookup table as returned by lookup(), Required.
+    
+    Returns: list   -- the (first, last) inclusive ranges of indices.
+    """
+    _ranges = []
+    
+    for _index in range(18):
+        if not int(table) >> _index & 1:
+            continue
+        
+        if _ranges and _ranges[-1][1] == _index - 1:
+            _ranges[-1] = (_ranges[-1][0], _index)
+        else:
+            _ranges.append((_index, _index))
+    
+    return _ranges
+
+
+def bitwise(table):
+    """
+    Compile a lookup table into a function of bit planes.
+    
+    This is the form of a rule suited to bitwise Models, which sum the
+    neighbours of many cells at once into ones, twos, fours and eights bit
+    planes. The function is built by Shannon expansion of the table over the
+    bits, eights first, folding constant and repeated branches, so that it
+    is about as short as a hand written expression, e.g. Conway's rule
+    becomes ~eights & ~fours & twos & (ones | alive). The planes may be NumPy
+    arrays of packed words or Python integers used as bit boards, and bits
+    beyond the "world" may be set in the result, which should be masked off
+    by the caller.
+    
+    Parameters:
+    table   -- uint32:  the lookup table as returned by lookup(), Required.
+    
+    Returns: function   -- a function of (alive, ones, twos, fours, eights)
+                           returning the plane of living cells in the next
+                           step.
+    """
+    _truth, _logic = _expand(int(table), ())
+    
+    if _logic == 0:
+        return lambda *planes: planes[0] ^ planes[0]
+    
+    if _logic == 1:
+        return lambda *planes: ~(planes[0] ^ planes[0])
+    
+    return lambda *planes: _logic(planes)
+
+
+def _expand(table, bits):
+    """
+    Expand a lookup table over the bits not yet fixed by bits.
+    
+    Parameters:
+    table   -- int:     the lookup table as returned by lookup(), Required.
+    bits    -- tuple:   the values of the first bits of the (eights, fours,
+                        twos, ones, alive) order, Required.
+    
+    Returns: tuple  -- the truth table over the remaining bits and either 0
+                       or 1, if it is constant, or a function of the tuple of
+                       planes.
+    
+    Note: This is a private function, you should not be calling this.
+    """
+    if len(bits) == 5:
+        _eights, _fours, _twos, _ones, _alive = bits
+        
+        _count = 8 if _eights else 4*_fours + 2*_twos + _ones
+        
+        _value = table >> (2*_count + _alive) & 1
+        
+        return (_value,), _value
+    
+    (_t0, _low), (_t1, _high) = _expand(table, bits + (0,)), \
+                                _expand(table, bits + (1,))
+    
+    _truth = _t0 + _t1
+    
+    _bit = 4 - len(bits)
+    
+    if _t0 == _t1:
+        _logic = _low
+    elif _low == 0 and _high == 1:
+        _logic = lambda planes: planes[_bit]
+    elif _low == 1 and _high == 0:
+        _logic = lambda planes: ~planes[_bit]
+    elif _low == 0:
+        _logic = lambda planes: planes[_bit] & _high(planes)
+    elif _high == 0:
+        _logic = lambda planes: ~planes[_bit] & _low(planes)
+    elif _low == 1:
+        _logic = lambda planes: ~planes[_bit] | _high(planes)
+    elif _high == 1:
+        _logic = lambda planes: planes[_bit] | _low(planes)
+    else:
+        _logic = lambda planes: (planes[_bit] & _high(planes)) \
+                              | (~planes[_bit] & _low(planes))
+    
+    return _truth, _logic
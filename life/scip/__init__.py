@@ -5,6 +5,8 @@ This package contains modules specifying classes implementing the Model
 component of a Model-View-Controller design pattern for Cellular Automata.
 The Models provided herin implement Conway's Game of Life using data
 structures provided by NumPy and SciPy and functions provided by SciPy.
+The modules are imported on first access, e.g. as life.scip.convolve, rather
+than with the package, so that SciPy is only imported if it is used.
 
 Modules:
 matmul      -- A module providing a Model object implementing Game of Life
@@ -13,5 +15,25 @@ convolve    -- A module providing a Model object implementing Game of Life
                with the ndimage.convolve() function from SciPy.
 """
 
-from . import matmul
-from . import convolve
+import importlib
+
+# Modules, imported on first access (see __getattr__()).
+_LAZY = ("matmul", "convolve")
+
+
+def __getattr__(name):
+    """
+    Import a module on first access, so that only the Model used is imported.
+    
+    Parameters:
+    name    -- string:  the name of the attribute, Required.
+    
+    Returns: module -- the module.
+    
+    Exceptions Raised:
+    AttributeError  -- if name is not a module of the package.
+    """
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    return importlib.import_module(f".{name}", __name__)
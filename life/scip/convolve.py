@@ -8,10 +8,17 @@ Classes:
 GOLScipyConvolveModel -- A Model of Game of Life using ndimage.convolve().
 """
 
+import concurrent.futures
+
 import numpy
 import scipy
 
+from .. import fingerprint
+from .. import history
 from .. import mvc
+from .. import patterns
+from .. import rules
+from .. import timeline
 
 
 KERNEL = [[2, 2, 2],
@@ -30,6 +37,10 @@ class GOLScipyConvolveModel(mvc.Model):
     SciPy's ndimage module. This class is intended to be used with compatible
     View and Controller objects as part of a Model-View-Controller pattern.
     
+    With more than one worker, each step is divided into horizontal bands of
+    rows which are convolved concurrently by a pool of threads into a shared
+    output Matrix, relying on NumPy and SciPy releasing the GIL.
+    
     Extends:
     ..mvc.Model -- Abstract Base Class for Models in the Model-View-Controller.
     
@@ -38,28 +49,40 @@ class GOLScipyConvolveModel(mvc.Model):
     _mat    -- ndarray: the state (world) matrix.
     _size   -- tuple:   the dimensions (shape) of _mat.
     _steps  -- int:     the number of iterations from initial state.
+    _rule   -- uint32:  the rule lookup table.
+    _past   -- History: the rollback history, or None.
+    _frames -- Timeline:
+                        the keyframes for step_to(), or None.
+    _cycles -- Fingerprints:
+                        the recent fingerprints for cycle detection, or None.
     _l_kern -- sparray: one of four diagonal arrays to assist with matmul step.
     _r_kern -- sparray: one of four diagonal arrays to assist with matmul step.
     _u_kern -- sparray: one of four diagonal arrays to assist with matmul step.
     _d_kern -- sparray: one of four diagonal arrays to assist with matmul step.
+    _pool   -- ThreadPoolExecutor:
+                        the worker threads, or None if single threaded.
+    _bands  -- list:    the (first, last) rows of each band of rows.
     
     Methods:
-    __init__(self, size[, density][, source][, offset][, rollback])
+    __init__(self, size[, density][, source][, offset][, rollback][,
+                   rule][, keyframes][, cycles][, workers])
             -- Initialize class object, override Model.__init__().
+    close(self)
+            -- Shut down the worker threads, extend Model.close().
     reset(self)
             -- Reset the model to initial state, Not Implemented.
     step(self[, steps])
             -- Advance or retract the model relative, override Model.step().
-    step_to(self, steps)
-            -- Advance or retract the model absolute, Not Implemented.
     _init_kernels(self, size)
             -- Initialize the diagonal matrices for matmul operations, Private.
     _convolve_step(self)
             -- Advance the model one step, Private.
+    _convolve_band(self, out, first, last)
+            -- Advance a band of rows one step, Private.
     
     Inherits:
-    Model.close(self)
-            -- Decommission, deactivate and delete the object.
+    Model.step_to(self, steps)
+            -- Advance or retract the model absolute.
     
     Warning:
     Any assignment to instance variables or calls to private methods will
@@ -68,7 +91,8 @@ class GOLScipyConvolveModel(mvc.Model):
     """
     
     def __init__(self, size, density=0.5, source=None, offset=None,
-                             rollback=0):
+                             rollback=0, rule=rules.CONWAY, keyframes=None,
+                             cycles=0, workers=None):
         """
         Initialize GOLScipyConvolveModel object.
         
@@ -82,23 +106,61 @@ class GOLScipyConvolveModel(mvc.Model):
                                 Required.
         density     -- float:   the initial statistical density of living
                                 cells, Default = 0.5, Ignored.
-        source      -- string:  a file name to initialize the "world", Not
-                                Implemented.
-        offset      -- tuple:   the offset coordinates for source, Ignored.
-        rollback    -- int:     the requested rollback memory for back-steps,
-                                Ignored.
+        source      -- string:  the path of a pattern file (.rle, .cells or
+                                .mc) to initialize the "world",
+                                Default = None for random.
+        offset      -- tuple:   the x, y coordinates of the top left of the
+                                pattern, Default = None to centre it.
+        rollback    -- int:     the rollback memory budget in bytes for
+                                back-steps, or a history.History,
+                                Default = 0 for none.
+        rule        -- string:  the Life-like rule in B/S notation,
+                                Default = "B3/S23".
+        keyframes   -- string:  the path of a timeline file of keyframes for
+                                step_to(), or a timeline.Timeline,
+                                Default = None for none.
+        cycles      -- int:     the number of recent states fingerprinted for
+                                cycle detection, or a fingerprint.Fingerprints,
+                                Default = 0 for none.
+        workers     -- int:     the number of worker threads, no more than
+                                the "world" height, Default = None for
+                                single threaded.
         
         Returns: None.
         
         Exceptions Raised:
-        NotImplementedError -- if source is provided.
+        ValueError          -- if rule is not a valid Life-like rule, or
+                               rollback or cycles is negative, or the
+                               source is malformed or larger than the
+                               "world".
+        OSError             -- if the keyframes timeline or the source
+                               cannot be opened.
         """
-        if source is not None:
-            raise NotImplementedError("Matrix source not (yet) supported")
+        self._rule = rules.lookup(rule)
+        
+        self._past = history.create(rollback)
+        
+        self._frames = timeline.create(keyframes)
+        
+        self._cycles = fingerprint.create(cycles)
         
         self._size = size[::-1]
         
-        self._mat = rng.integers(2, size=self._size, dtype=numpy.uint8)
+        if source is not None:
+            self._mat = patterns.load(source, self._size, offset)
+        else:
+            self._mat = rng.integers(2, size=self._size, dtype=numpy.uint8)
+        
+        self._pool, self._bands = None, None
+        
+        if workers is not None and workers > 1:
+            workers = min(workers, self._size[0])
+            
+            _bounds = numpy.linspace(0, self._size[0], workers + 1).astype(int)
+            
+            self._bands = list(zip(_bounds[:-1], _bounds[1:]))
+            
+            self._pool = concurrent.futures.ThreadPoolExecutor(workers)
         
         self._steps = 0
         
@@ -122,19 +184,48 @@ class GOLScipyConvolveModel(mvc.Model):
         
         Exceptions Raised:
         ValueError          -- if self has already been closed with
-                               self.close().
-        NotImplementedError -- if steps is negative.
+                               self.close(), or if steps is negative beyond
+                               the rollback history.
         """
         if self._closed:
             raise ValueError("Operation on closed Model.")
         
         if steps < 0:
-            raise NotImplementedError("Negative steps not (yet) supported")
+            self._rewind(-steps)
+            
+            return
+        
+        _memory = self._remember()
+        
+        steps = self._skip(steps)
         
         for _ in range(steps):
             self._convolve_step()
         
         self._steps += steps
+        
+        self._record(_memory)
+    
+    
+    def close(self):
+        """
+        Decommission, deactivate and delete the object permanently.
+        
+        This method shuts down the worker threads, if any, before the basic
+        decommission.
+        
+        Extends:
+        Model.close()   -- Base Class destructor.
+        
+        Parameters:
+        self    -- GOLScipyConvolveModel:   the object itself, Required.
+        
+        Returns None.
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+        
+        super().close()
     
     
     def _convolve_step(self):
@@ -142,9 +233,11 @@ class GOLScipyConvolveModel(mvc.Model):
         Advance the model one step using the scipy convolution algorithm.
         
         Neighbour and identity relations are found by 2D convolution of the
-        "world" matrix with a constant 3x3 kernel matrix. The kernel is
-        designed to provide strict threshold values for life in the next
-        iteration, this being determined using integer division thresholding.
+        "world" matrix with a constant 3x3 kernel matrix. The kernel weights
+        each neighbour 2 and the cell itself 1, giving 2*neighbours + alive,
+        which indexes the rule table directly for the next state.
+        With worker threads, the bands of rows are instead computed
+        concurrently by _convolve_band().
         
         Parameters:
         self    -- GOLScipyConvolveModel:
@@ -158,7 +251,51 @@ class GOLScipyConvolveModel(mvc.Model):
         External calls to this method may leave the object in an illegal,
         unrecoverable state.
         """
+        if self._pool is not None:
+            _next = numpy.empty_like(self._mat)
+            
+            for _future in [self._pool.submit(self._convolve_band, _next,
+                                              *_band)
+                            for _band in self._bands]:
+                _future.result()
+            
+            self._mat = _next
+            
+            return
+        
         _neighbours = scipy.ndimage.convolve(self._mat, KERNEL, mode="wrap")
         
-        self._mat = numpy.minimum(_neighbours//5, 1) \
-                  - numpy.minimum(_neighbours//8, 1)
+        self._mat = rules.apply(self._rule, _neighbours)
+    
+    
+    def _convolve_band(self, out, first, last):
+        """
+        Advance the band of rows [first, last) one step into out.
+        
+        The band is gathered with one halo row above and below (wrapping
+        around) and convolved as in _convolve_step(). The wrap around mode
+        is then correct for columns, while the halo rows, which would wrap
+        within the band, are discarded.
+        
+        Parameters:
+        self    -- GOLScipyConvolveModel:
+                            the object itself, Required.
+        out     -- ndarray: the next state Matrix to write the band to,
+                            Required.
+        first   -- int:     the first row of the band, Required.
+        last    -- int:     one past the last row of the band, Required.
+        
+        Returns: None.
+        
+        Note:
+        This is a private "helper" method, called concurrently from the worker
+        threads by _convolve_step(). External calls to this method may leave
+        the object in an illegal, unrecoverable state.
+        """
+        _block = self._mat.take(range(first - 1, last + 1), axis=0,
+                                mode="wrap")
+        
+        _neighbours = scipy.ndimage.convolve(_block, KERNEL,
+                                             mode="wrap")[1:-1]
+        
+        rules.apply(self._rule, _neighbours, out=out[first:last])
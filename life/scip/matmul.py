@@ -12,7 +12,12 @@ GOLScipyMatmulModel -- A Model of Game of Life using sparray's `@` operator.
 import numpy
 import scipy
 
+from .. import fingerprint
+from .. import history
 from .. import mvc
+from .. import patterns
+from .. import rules
+from .. import timeline
 
 
 rng = numpy.random.default_rng()
@@ -36,20 +41,25 @@ class GOLScipyMatmulModel(mvc.Model):
     _mat    -- ndarray: the state (world) matrix.
     _size   -- tuple:   the dimensions (shape) of _mat.
     _steps  -- int:     the number of iterations from initial state.
+    _rule   -- uint32:  the rule lookup table.
+    _past   -- History: the rollback history, or None.
+    _frames -- Timeline:
+                        the keyframes for step_to(), or None.
+    _cycles -- Fingerprints:
+                        the recent fingerprints for cycle detection, or None.
     _l_kern -- sparray: one of four diagonal arrays to assist with matmul step.
     _r_kern -- sparray: one of four diagonal arrays to assist with matmul step.
     _u_kern -- sparray: one of four diagonal arrays to assist with matmul step.
     _d_kern -- sparray: one of four diagonal arrays to assist with matmul step.
     
     Methods:
-    __init__(self, size[, density][, source][, offset][, rollback])
+    __init__(self, size[, density][, source][, offset][, rollback][,
+                   rule][, keyframes][, cycles])
             -- Initialize class object, override Model.__init__().
     reset(self)
             -- Reset the model to initial state, Not Implemented.
     step(self[, steps])
             -- Advance or retract the model relative, override Model.step().
-    step_to(self, steps)
-            -- Advance or retract the model absolute, Not Implemented.
     _init_kernels(self, size)
             -- Initialize the diagonal matrices for matmul operations, Private.
     _matmul_step(self)
@@ -58,6 +68,8 @@ class GOLScipyMatmulModel(mvc.Model):
     Inherits:
     Model.close(self)
             -- Decommission, deactivate and delete the object.
+    Model.step_to(self, steps)
+            -- Advance or retract the model absolute.
     
     Warning:
     Any assignment to instance variables or calls to private methods will
@@ -66,7 +78,9 @@ class GOLScipyMatmulModel(mvc.Model):
     """
     
     def __init__(self, size, density=0.5, source=None, offset=None,
-                                          rollback=0):
+                                          rollback=0,
+                                          rule=rules.CONWAY, keyframes=None,
+                                          cycles=0):
         """
         Initialize GOLScipyMatmulModel object.
         
@@ -80,25 +94,49 @@ class GOLScipyMatmulModel(mvc.Model):
                                 Required.
         density     -- float:   the initial statistical density of living
                                 cells, Default = 0.5, Ignored.
-        source      -- string:  a file name to initialize the "world", Not
-                                Implemented.
-        offset      -- tuple:   the offset coordinates for source, Ignored.
-        rollback    -- int:     the requested rollback memory for back-steps,
-                                Ignored.
+        source      -- string:  the path of a pattern file (.rle, .cells or
+                                .mc) to initialize the "world",
+                                Default = None for random.
+        offset      -- tuple:   the x, y coordinates of the top left of the
+                                pattern, Default = None to centre it.
+        rollback    -- int:     the rollback memory budget in bytes for
+                                back-steps, or a history.History,
+                                Default = 0 for none.
+        rule        -- string:  the Life-like rule in B/S notation,
+                                Default = "B3/S23".
+        keyframes   -- string:  the path of a timeline file of keyframes for
+                                step_to(), or a timeline.Timeline,
+                                Default = None for none.
+        cycles      -- int:     the number of recent states fingerprinted for
+                                cycle detection, or a fingerprint.Fingerprints,
+                                Default = 0 for none.
         
         Returns: None.
         
         Exceptions Raised:
-        NotImplementedError -- if source is provided.
+        ValueError          -- if rule is not a valid Life-like rule, or
+                               rollback or cycles is negative, or the
+                               source is malformed or larger than the
+                               "world".
+        OSError             -- if the keyframes timeline or the source
+                               cannot be opened.
         """
-        if source is not None:
-            raise NotImplementedError("Matrix source not (yet) supported")
+        self._rule = rules.lookup(rule)
+        
+        self._past = history.create(rollback)
+        
+        self._frames = timeline.create(keyframes)
+        
+        self._cycles = fingerprint.create(cycles)
         
         self._size = size[::-1]
         
         self._init_kernels(self._size)
         
-        self._mat = rng.integers(2, size=self._size, dtype=numpy.uint8)
+        if source is not None:
+            self._mat = patterns.load(source, self._size, offset)
+        else:
+            self._mat = rng.integers(2, size=self._size, dtype=numpy.uint8)
         
         self._steps = 0
         
@@ -122,19 +160,27 @@ class GOLScipyMatmulModel(mvc.Model):
         
         Exceptions Raised:
         ValueError          -- if self has already been closed with
-                               self.close().
-        NotImplementedError -- if steps is negative.
+                               self.close(), or if steps is negative beyond
+                               the rollback history.
         """
         if self._closed:
             raise ValueError("Operation on closed Model.")
         
         if steps < 0:
-            raise NotImplementedError("Negative steps not (yet) supported")
+            self._rewind(-steps)
+            
+            return
+        
+        _memory = self._remember()
+        
+        steps = self._skip(steps)
         
         for _ in range(steps):
             self._matmul_step()
         
         self._steps += steps
+        
+        self._record(_memory)
     
     
     def _init_kernels(self, size):
@@ -160,13 +206,17 @@ class GOLScipyMatmulModel(mvc.Model):
         object in an illegal, unrecoverable state.
         """
         self._l_kern = scipy.sparse.diags_array([[1], (size[1] - 1)*[1]],
-                                                offsets=[1 - size[1],  1])
+                                                offsets=[1 - size[1],  1],
+                                                dtype=numpy.uint8)
         self._r_kern = scipy.sparse.diags_array([[1], (size[1] - 1)*[1]],
-                                                offsets=[size[1] - 1, -1])
+                                                offsets=[size[1] - 1, -1],
+                                                dtype=numpy.uint8)
         self._u_kern = scipy.sparse.diags_array([[1], (size[0] - 1)*[1]],
-                                                offsets=[1 - size[0],  1])
+                                                offsets=[1 - size[0],  1],
+                                                dtype=numpy.uint8)
         self._d_kern = scipy.sparse.diags_array([[1], (size[0] - 1)*[1]],
-                                                offsets=[size[0] - 1, -1])
+                                                offsets=[size[0] - 1, -1],
+                                                dtype=numpy.uint8)
     
     
     def _matmul_step(self):
@@ -175,8 +225,8 @@ class GOLScipyMatmulModel(mvc.Model):
         
         Neighbour relations are found by algebraic manipulation (addition and
         multiplication) of the "world" matrix with the 4 kernel matrices. The
-        generate and survive conditions are then determined using integer
-        division thresholding.
+        next state of each cell is then looked up in the rule table by its
+        neighbour count and current state.
         
         Parameters:
         self    -- GOLScipyMatmulModel:
@@ -196,10 +246,4 @@ class GOLScipyMatmulModel(mvc.Model):
         
         _neighbours = _up_down + _lr_corn
         
-        _generate = numpy.minimum(_neighbours//3, 1) \
-                  - numpy.minimum(_neighbours//4, 1)
-        
-        _survive = numpy.minimum(_neighbours//2, 1) \
-                 - numpy.minimum(_neighbours//4, 1)
-        
-        self._mat = numpy.maximum(_generate, self._mat*_survive)
+        self._mat = rules.apply(self._rule, 2*_neighbours + self._mat)
@@ -14,6 +14,8 @@ TerminalController  -- A Controller to pair with a TerminalView object.
 import sys
 import curses
 
+import numpy
+
 from . import mvc
 
 
@@ -35,6 +37,27 @@ RESOLUTION = None   #(132, 32)
 
 SCALE = 1
 
+# Each glyph mode packs a block of cells (width, height) into a character,
+# the cells weighted by the bits of the index into its lookup table of
+# characters (as code points).
+
+GLYPHS = "block"
+
+PAD_LIMIT = 32767   # curses coordinates are (signed) shorts.
+
+MODES = \
+{
+    "block"     : ([[1]], " █"),
+    "half"      : ([[1],
+                    [2]], " ▀▄█"),
+    "quadrant"  : ([[1, 2],
+                    [4, 8]], " ▘▝▀▖▌▞▛▗▚▐▜▄▙▟█"),
+    "braille"   : ([[ 1,   8],
+                    [ 2,  16],
+                    [ 4,  32],
+                    [64, 128]], "".join(chr(0x2800 + i) for i in range(256)))
+}
+
 # Curses constants seem to be incorrect so we provide these alternatives,
 # these may not be very cross-platform compatible as they were detected
 # empirically.
@@ -64,19 +87,35 @@ class TerminalView(mvc.View):
     _canvas     -- window:  the output curses sub window.
     _closed     -- bool:    the object has been terminated.
     _colours    -- list:    the display colour scheme.
+    _weights    -- ndarray: the bit weights of the cells of a character.
+    _table      -- ndarray: the code points of the characters by packed
+                            cells.
+    _drawn      -- ndarray: the packed cells last drawn to _pad or _canvas,
+                            or None.
+    _pad        -- window:  the off-screen curses pad of the whole "world"
+                            and a wrap margin, or None to draw _canvas
+                            directly.
+    _pad_shape  -- tuple:   the shape of the _matrix _pad was made for, or
+                            None.
     _matrix     -- ndarray: the most recently provided automata state.
     _position   -- tuple:   coordinates for the top left corner of _matrix.
     _resolution -- tuple:   the size of the curses window _canvas.
     _scale      -- float:   the zoom factor in characters/cell.
     _updates    -- bool:    flag to indicate _matrix has updates not yet
                             flushed to _canvas.
+    _stale      -- bool:    flag to indicate _matrix has changes not yet
+                            drawn to _pad.
     
     Methods:
-    __init__(self[, resolution][, scale][, position][, colours][, **kwargs])
+    __init__(self[, resolution][, scale][, position][, colours][, glyphs][,
+                    **kwargs])
             -- Initialize class object, override View.__init__().
     close(self)
             -- Decommission, deactivate and delete the object,
                override View.close().
+    move(self, distance)
+            -- Move the view coordinates by a distance in characters,
+               override View.move().
     scale(self, delta)
             -- Scale the view by some delta, Not Implemented.
     scale_to(self, value)
@@ -89,10 +128,18 @@ class TerminalView(mvc.View):
             -- Initialize the curses instance, Private.
     _init_field(self[, resolution])
             -- Initialize the border and subwin _canvas, Private.
+    _init_pad(self)
+            -- Initialize the pad _pad for the shape of _matrix, Private.
+    _draw(self, window, codes)
+            -- Draw the changed runs of packed cells to a window, Private.
+    _pack(self, rows, cols)
+            -- Pack the cells of rows and columns of _matrix, Private.
+    _window(self)
+            -- The packed cells of _matrix visible in _canvas, Private.
+    _tiles(self)
+            -- The packed cells of _matrix and a wrap margin, Private.
     
     Inherits:
-    View.move(self, distance)
-            -- Move the view coordinates by a relative amount or distance.
     View.move_to(self, position)
             -- Move the view coordinates to an absolute position.
     
@@ -103,7 +150,7 @@ class TerminalView(mvc.View):
     """
     
     def __init__(self, resolution=None, scale=None, position=(0, 0),
-                       colours=COLOURS, **kwargs):
+                       colours=COLOURS, glyphs=GLYPHS, **kwargs):
         """
         Initialize TerminalView object.
         
@@ -121,11 +168,18 @@ class TerminalView(mvc.View):
                                 matrix, Default = (0, 0).
         colours     -- list:    the colour scheme for cell values,
                                 Default = [(121, 4, 180), (113, 805, 648)].
+        glyphs      -- string:  the glyph mode, any of "block" (1 cell per
+                                character), "half" (1x2 cells), "quadrant"
+                                (2x2 cells) or "braille" (2x4 cells),
+                                Default = "block".
         **kwargs    -- dict:    catch any additional arguments intended for
                                 other implementations of View if they should
                                 go through to the keeper.
         
         Returns: None.
+        
+        Exceptions Raised:
+        ValueError  -- if glyphs is not a glyph mode.
         """
         if resolution is None:
             resolution = RESOLUTION
@@ -133,8 +187,21 @@ class TerminalView(mvc.View):
         if scale is None:
             scale = SCALE
         
+        if glyphs not in MODES:
+            raise ValueError(f"Invalid glyph mode: '{glyphs}'")
+        
+        _weights, _glyphs = MODES[glyphs]
+        
+        self._weights = numpy.array(_weights, dtype=numpy.uint8)
+        self._table = numpy.array([ord(_glyph) for _glyph in _glyphs],
+                                  dtype=numpy.uint32)
+        
         self._matrix = None
+        self._drawn = None
+        self._pad = None
+        self._pad_shape = None
         self._updates = False
+        self._stale = True
         self._resolution = resolution
         self._scale = scale
         self._position = position
@@ -153,6 +220,9 @@ class TerminalView(mvc.View):
         View.update()   -- Abstract Base Class API method.
         
         This method is primarily for painting or preparing to paint the screen.
+        A matrix given is not compared with the last here, only the runs of
+        characters which differ from those last drawn are drawn at the next
+        flush.
         
         Parameters:
         self    -- TerminalView:
@@ -168,32 +238,57 @@ class TerminalView(mvc.View):
         if self._closed:
             raise ValueError("Operation on closed View.")
         
-        if matrix is not None and (matrix != self._matrix).any():
-            self._matrix = matrix
+        if matrix is not None:
             self._updates = True
+            self._stale = True
+            
+            self._matrix = matrix
         
         if flush and self._updates:
-            _w = len(self._matrix[0])
-            _h = len(self._matrix)
-            
-            _x = self._position[0]%_w
-            _y = self._position[1]%_h
+            if self._matrix.shape != self._pad_shape:
+                self._init_pad()
             
-            for i in range(self._resolution[1]):
-                for j in range(self._resolution[0]):
-                    # = "\x1B[38;2;255;0;0m"
-                    s = ('█' if self._matrix[(i - _y)%_h, (j - _x)%_w] \
-                    else ' ')
-                    # + "\x1B[39;49m"
-                    
-                    if j == self._resolution[0] - 1:
-                        self._canvas.insstr(i, j, s,
-                                       curses.color_pair(self._colour_pair))
-                    else:
-                        self._canvas.addstr(i, j, s,
-                                       curses.color_pair(self._colour_pair))
+            if self._pad is None:
+                self._draw(self._canvas, self._window())
+                
+                self._canvas.refresh()
+            else:
+                if self._stale:
+                    self._draw(self._pad, self._tiles())
+                
+                _h, _w = self._matrix.shape
+                _ch, _cw = self._weights.shape
+                _y, _x = self._canvas.getbegyx()
+                
+                self._pad.refresh(((-self._position[1])%_h)//_ch,
+                                  ((-self._position[0])%_w)//_cw,
+                                  _y, _x, _y + self._resolution[1] - 1,
+                                          _x + self._resolution[0] - 1)
             
-            self._canvas.refresh()
+            self._stale = False
+            self._updates = False
+    
+    
+    def move(self, distance):
+        """
+        Move the view coordinates by a relative distance in characters.
+        
+        The distance is in characters rather than cells, so that in a packed
+        glyph mode each move shifts the view by one whole character. Only
+        the offset of the pad is changed, the "world" is not redrawn.
+        
+        Overrides:
+        View.move() -- Base Class method.
+        
+        Parameters:
+        self        -- TerminalView:
+                                the object itself, Required.
+        distance    -- tuple:   the x, y distance to move, Required.
+        
+        Returns None.
+        """
+        super().move((distance[0]*self._weights.shape[1],
+                      distance[1]*self._weights.shape[0]))
     
     
     def close(self):
@@ -362,6 +457,159 @@ class TerminalView(mvc.View):
         
         self._canvas = frame.subwin(_h, _w, 1, 1)
 
+    
+    
+    def _init_pad(self):
+        """
+        Initialize the off-screen curses pad for the shape of the matrix.
+        
+        The pad holds the whole "world", in characters, and a margin of the
+        size of _canvas wrapped around from the other side, so that any view
+        of the torus is a single rectangle of the pad. The pad is used only
+        if the "world" is a whole number of characters in each dimension and
+        fits within curses' coordinates, otherwise _canvas is drawn directly.
+        
+        Parameters:
+        self    -- TerminalView:    the object itself, Required.
+        
+        Returns: None.
+        
+        Note:
+        This is a private "helper" method for update().
+        """
+        _h, _w = self._matrix.shape
+        _ch, _cw = self._weights.shape
+        
+        _rows = _h//_ch + self._resolution[1]
+        _cols = _w//_cw + self._resolution[0]
+        
+        self._pad = None
+        self._pad_shape = self._matrix.shape
+        self._drawn = None
+        
+        if _h%_ch == 0 and _w%_cw == 0 \
+        and _rows < PAD_LIMIT and _cols < PAD_LIMIT:
+            self._pad = curses.newpad(_rows + 1, _cols)
+    
+    
+    def _draw(self, window, codes):
+        """
+        Draw the runs of packed cells which changed since the last draw.
+        
+        The packed cells are compared with those last drawn and the runs of
+        changed characters found in each row from the edges of the padded
+        change mask, everything is drawn if nothing was drawn before. The
+        characters are looked up as code points and each row viewed as a
+        single string, so that each run is written with one call.
+        
+        Parameters:
+        self    -- TerminalView:
+                            the object itself, Required.
+        window  -- window:  the curses window or pad to draw to, Required.
+        codes   -- ndarray: the packed cells, Required.
+        
+        Returns: None.
+        
+        Note:
+        This is a private "helper" method for update().
+        """
+        if self._drawn is None or self._drawn.shape != codes.shape:
+            _changed = numpy.ones(codes.shape, dtype=bool)
+        else:
+            _changed = codes != self._drawn
+        
+        _edges = numpy.diff(numpy.pad(_changed, ((0, 0), (1, 1)))
+                            .astype(numpy.int8), axis=1)
+        
+        _rows, _starts = numpy.nonzero(_edges == 1)
+        _, _stops = numpy.nonzero(_edges == -1)
+        
+        _lines = self._table[codes].view(f"U{codes.shape[1]}")[:, 0]
+        
+        for i, j, k in zip(_rows.tolist(), _starts.tolist(), _stops.tolist()):
+            s = str(_lines[i])[j:k]
+            
+            if k == codes.shape[1]:
+                window.insstr(i, j, s, curses.color_pair(self._colour_pair))
+            else:
+                window.addstr(i, j, s, curses.color_pair(self._colour_pair))
+        
+        self._drawn = codes
+    
+    
+    def _pack(self, rows, cols):
+        """
+        Pack the cells of some rows and columns of the state matrix.
+        
+        The cells of each character are packed into its index in the lookup
+        table of the glyph mode.
+        
+        Parameters:
+        self    -- TerminalView:
+                            the object itself, Required.
+        rows    -- ndarray: the row indices, a whole number of characters,
+                            Required.
+        cols    -- ndarray: the column indices, a whole number of
+                            characters, Required.
+        
+        Returns: ndarray    -- the uint8 matrix of packed cells.
+        
+        Note:
+        This is a private "helper" method for update().
+        """
+        _ch, _cw = self._weights.shape
+        
+        _cells = (self._matrix[numpy.ix_(rows, cols)] != 0) \
+                .reshape(len(rows)//_ch, _ch, len(cols)//_cw, _cw)
+        
+        return (_cells*self._weights[:, None, :]).sum(axis=(1, 3),
+                                                      dtype=numpy.uint8)
+    
+    
+    def _window(self):
+        """
+        The packed cells of the state matrix visible in the curses sub-window.
+        
+        The matrix is tiled (wrapped around) to fill the window, offset by the
+        position, and the visible cells gathered with modular indexing.
+        
+        Parameters:
+        self    -- TerminalView:    the object itself, Required.
+        
+        Returns: ndarray    -- the uint8 matrix of the shape of the window.
+        
+        Note:
+        This is a private "helper" method for update().
+        """
+        _h, _w = self._matrix.shape
+        _ch, _cw = self._weights.shape
+        
+        _rows = (numpy.arange(self._resolution[1]*_ch) - self._position[1])%_h
+        _cols = (numpy.arange(self._resolution[0]*_cw) - self._position[0])%_w
+        
+        return self._pack(_rows, _cols)
+    
+    
+    def _tiles(self):
+        """
+        The packed cells of the whole state matrix and a wrap margin.
+        
+        Parameters:
+        self    -- TerminalView:    the object itself, Required.
+        
+        Returns: ndarray    -- the uint8 matrix of the shape of the pad.
+        
+        Note:
+        This is a private "helper" method for update().
+        """
+        _h, _w = self._matrix.shape
+        _ch, _cw = self._weights.shape
+        
+        _rows = numpy.arange(_h + self._resolution[1]*_ch)%_h
+        _cols = numpy.arange(_w + self._resolution[0]*_cw)%_w
+        
+        return self._pack(_rows, _cols)
+
 
 class TerminalController(mvc.Controller):
     """
@@ -440,6 +688,9 @@ class TerminalController(mvc.Controller):
                     self._paused = not self._paused
                 elif key in ('\r', '\n', 's', 'S'):
                     self._step = True
+                elif key in (curses.KEY_BACKSPACE, '\x7f', '\b', 'b', 'B'):
+                    self._paused = True
+                    self._back   = True
                 elif key in (curses.KEY_UP, '8'):
                     self._view.move(( 0,  1))
                 elif key in (curses.KEY_DOWN, '2'):
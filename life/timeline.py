@@ -0,0 +1,370 @@
+"""
+This module provides disk-backed keyframe timelines for cellular automata.
+
+A timeline keeps a full snapshot (keyframe) of the state of a Model at least
+every K generations, bit-packed and optionally zlib compressed, appended to
+a file on disk and read back through a memory map. An index from generation
+to file offset is kept alongside, in a second file of the same name with the
+suffix ".idx", so that a Model can seek to any generation by loading the
+nearest earlier keyframe and stepping at most about K generations forward.
+The index starts with header records of whether the keyframes are
+compressed and of the shape of the keyframes. As both files are only ever
+appended to, a timeline may be reopened to replay a previous run, and its
+keyframes are then read (and written) as the header says, whatever
+compression is asked for, and only for states of the same shape.
+
+Constants:
+INTERVAL    -- int:     the default number of generations between keyframes.
+SUFFIX      -- string:  the suffix of the index file.
+HEADER      -- int:     the generation marking the header records of the
+                        index file.
+
+Classes:
+Timeline    -- A disk-backed store of keyframes by generation.
+
+Functions:
+create(timeline)    -- create the Timeline for a timeline parameter.
+"""
+
+import os
+import zlib
+import bisect
+
+import numpy
+
+
+INTERVAL = 1024
+
+SUFFIX = ".idx"
+
+HEADER = -1
+
+
+class Timeline:
+    """
+    A disk-backed store of keyframes of the states of a Model by generation.
+    
+    Keyframes are appended to the data file, and a (generation, offset,
+    length) record of int64 for each to the index file, after a first
+    (HEADER, compress, 0) record of the index and, written with the first
+    keyframe, a (HEADER, axis, length) record for each axis of the shape
+    of the keyframes. The first state
+    recorded in each run of K generations (from 0) is kept, which is exactly
+    every Kth generation if the Model is stepped one generation at a time.
+    The data file is memory mapped for reading, and mapped again whenever it
+    has grown.
+    
+    Instance Variables:
+    _path       -- string:  the path of the data file.
+    _interval   -- int:     the number of generations between keyframes.
+    _compress   -- bool:    the keyframes are zlib compressed, as recorded
+                            in the index file.
+    _shape      -- tuple:   the shape of the keyframes, as recorded in the
+                            index file, or None before the first.
+    _data       -- file:    the data file, opened for appending.
+    _index      -- file:    the index file, opened for appending.
+    _keys       -- list:    the generations of the keyframes, sorted.
+    _frames     -- dict:    the (offset, length) of the keyframes by
+                            generation.
+    _map        -- memmap:  the memory map of the data file, or None.
+    _closed     -- bool:    the object has been terminated.
+    
+    Properties:
+    shape   -- tuple:   the shape of the keyframes, or None before the
+                        first.
+    
+    Methods:
+    __init__(self, path[, interval][, compress])
+            -- Initialize class object.
+    __len__(self)
+            -- The number of keyframes.
+    close(self)
+            -- Close the files.
+    due(self, generation)
+            -- Whether a keyframe should be recorded.
+    boundary(self, generation)
+            -- The first generation of the next run of K generations.
+    record(self, generation, state)
+            -- Record a keyframe.
+    nearest(self, generation)
+            -- The generation of the nearest keyframe at or before another.
+    load(self, generation, state)
+            -- Load a keyframe.
+    _check(self, state)
+            -- Check the shape of a state, Private.
+    
+    Warning:
+    Keyframes are never replaced, a timeline reopened with a Model started
+    from a different state will mix keyframes of the two runs unless the
+    Model first seeks a keyframe with step_to().
+    """
+    
+    def __init__(self, path, interval=INTERVAL, compress=False):
+        """
+        Initialize Timeline object, opening or creating its files.
+        
+        Parameters:
+        self        -- Timeline:    the object itself, Required.
+        path        -- string:      the path of the data file, Required.
+        interval    -- int:         the number of generations between
+                                    keyframes, Default = 1024.
+        compress    -- bool:        zlib compress the keyframes of a new
+                                    timeline (an existing one keeps its
+                                    own), Default = False.
+        
+        Returns: None.
+        
+        Exceptions Raised:
+        ValueError  -- if interval is not positive, or if the index file
+                       exists but has no header.
+        OSError     -- if the files cannot be opened.
+        """
+        if interval < 1:
+            raise ValueError(f"Invalid keyframe interval: {interval}")
+        
+        self._path = path
+        self._interval = interval
+        
+        self._data = open(path, "ab")
+        self._index = open(path + SUFFIX, "ab")
+        
+        _records = numpy.fromfile(path + SUFFIX, dtype=numpy.int64)
+        
+        _records = _records[:len(_records)//3*3].reshape(-1, 3)
+        
+        if len(_records) == 0:
+            self._index.write(numpy.array([HEADER, bool(compress), 0],
+                                          dtype=numpy.int64).tobytes())
+            self._index.flush()
+        elif _records[0, 0] != HEADER:
+            self._data.close()
+            self._index.close()
+            
+            raise ValueError(f"Timeline index has no header: "
+                             f"'{path + SUFFIX}'")
+        else:
+            compress = bool(_records[0, 1])
+        
+        _header = _records[:, 0] == HEADER
+        
+        self._compress = compress
+        self._shape = tuple(int(_length) for _length
+                            in _records[_header][1:, 2]) or None
+        
+        _records = _records[~_header]
+        
+        self._frames = {int(_generation) : (int(_offset), int(_length))
+                        for _generation, _offset, _length in _records}
+        
+        self._keys = sorted(self._frames)
+        
+        self._map = None
+        
+        self._closed = False
+    
+    
+    def __len__(self):
+        """
+        The number of keyframes in the timeline.
+        """
+        return len(self._keys)
+    
+    
+    @property
+    def shape(self):
+        """
+        The shape of the keyframes, or None before the first is recorded.
+        """
+        return self._shape
+    
+    
+    def close(self):
+        """
+        Close the files of the timeline.
+        
+        Parameters:
+        self    -- Timeline:    the object itself, Required.
+        
+        Returns: None.
+        """
+        if self._closed:
+            return
+        
+        self._map = None
+        
+        self._data.close()
+        self._index.close()
+        
+        self._closed = True
+    
+    
+    def due(self, generation):
+        """
+        Whether a keyframe should be recorded for a generation.
+        
+        Parameters:
+        self        -- Timeline:    the object itself, Required.
+        generation  -- int:         the generation of the state, Required.
+        
+        Returns: bool   -- there is no keyframe yet in the run of K
+                           generations of generation.
+        """
+        _i = bisect.bisect_right(self._keys, generation)
+        
+        return _i == 0 or self._keys[_i - 1]//self._interval \
+                          != generation//self._interval
+    
+    
+    def boundary(self, generation):
+        """
+        The first generation of the run of K generations after a generation.
+        
+        Parameters:
+        self        -- Timeline:    the object itself, Required.
+        generation  -- int:         the generation, Required.
+        
+        Returns: int    -- the next multiple of K after generation.
+        """
+        return (generation//self._interval + 1)*self._interval
+    
+    
+    def record(self, generation, state):
+        """
+        Record a keyframe of the state at a generation.
+        
+        Parameters:
+        self        -- Timeline:    the object itself, Required.
+        generation  -- int:         the generation of the state, Required.
+        state       -- ndarray:     the uint8 (0 or 1) state, Required.
+        
+        Returns: None.
+        
+        Exceptions Raised:
+        ValueError  -- if self has already been closed with self.close(), or
+                       if state is not of the shape of the keyframes.
+        """
+        if self._closed:
+            raise ValueError("Operation on closed Timeline.")
+        
+        if self._shape is None:
+            self._shape = state.shape
+            
+            self._index.write(numpy.array([[HEADER, _axis, _length]
+                                           for _axis, _length
+                                           in enumerate(state.shape)],
+                                          dtype=numpy.int64).tobytes())
+        
+        self._check(state)
+        
+        _frame = numpy.packbits(state).tobytes()
+        
+        if self._compress:
+            _frame = zlib.compress(_frame, 1)
+        
+        _offset = self._data.seek(0, os.SEEK_END)
+        
+        self._data.write(_frame)
+        self._data.flush()
+        
+        self._index.write(numpy.array([generation, _offset, len(_frame)],
+                                      dtype=numpy.int64).tobytes())
+        self._index.flush()
+        
+        self._frames[generation] = (_offset, len(_frame))
+        
+        bisect.insort(self._keys, generation)
+    
+    
+    def nearest(self, generation):
+        """
+        The generation of the nearest keyframe at or before a generation.
+        
+        Parameters:
+        self        -- Timeline:    the object itself, Required.
+        generation  -- int:         the generation to seek, Required.
+        
+        Returns: int    -- the generation of the keyframe, or None if there
+                           is none.
+        """
+        _i = bisect.bisect_right(self._keys, generation)
+        
+        return self._keys[_i - 1] if _i else None
+    
+    
+    def load(self, generation, state):
+        """
+        Load the keyframe of a generation into a state.
+        
+        Parameters:
+        self        -- Timeline:    the object itself, Required.
+        generation  -- int:         the generation of a keyframe, Required.
+        state       -- ndarray:     the writable uint8 state of the shape of
+                                    the keyframe, which is overwritten,
+                                    Required.
+        
+        Returns: ndarray    -- state.
+        
+        Exceptions Raised:
+        ValueError  -- if self has already been closed with self.close(), or
+                       if state is not of the shape of the keyframes.
+        KeyError    -- if there is no keyframe of generation.
+        """
+        if self._closed:
+            raise ValueError("Operation on closed Timeline.")
+        
+        self._check(state)
+        
+        _offset, _length = self._frames[generation]
+        
+        if self._map is None or len(self._map) < _offset + _length:
+            self._map = numpy.memmap(self._path, dtype=numpy.uint8, mode='r')
+        
+        _frame = self._map[_offset:_offset + _length]
+        
+        if self._compress:
+            _frame = numpy.frombuffer(zlib.decompress(_frame), numpy.uint8)
+        
+        state.reshape(-1)[:] = numpy.unpackbits(_frame, count=state.size)
+        
+        return state
+    
+    
+    def _check(self, state):
+        """
+        Check that a state is of the shape of the keyframes.
+        
+        Parameters:
+        self    -- Timeline:    the object itself, Required.
+        state   -- ndarray:     the state, Required.
+        
+        Returns: None.
+        
+        Exceptions Raised:
+        ValueError  -- if state is not of the shape of the keyframes.
+        
+        Note:
+        This is a private "helper" method, it is called by record() and
+        load().
+        """
+        if self._shape is not None and state.shape != self._shape:
+            raise ValueError(f"State of shape {state.shape} does not fit "
+                             f"the timeline of shape {self._shape}")
+
+
+def create(timeline):
+    """
+    Create the Timeline for a timeline parameter of a Model.
+    
+    Parameters:
+    timeline    -- string:  the path of the data file, None for no timeline,
+                            or a Timeline to use as is, Required.
+    
+    Returns: Timeline   -- the timeline, or None for none.
+    
+    Exceptions Raised:
+    OSError     -- if the files cannot be opened.
+    """
+    if timeline is None or isinstance(timeline, Timeline):
+        return timeline
+    
+    return Timeline(timeline)
@@ -8,19 +8,69 @@ Invoke with:
 Options:
     -A, --algorithm=ALGORITHM
         Select the algorithm for executing Conway's Game of Life. ALGORITHM
-        may be any of: "numpy-roll", "numpy-matmul", "scipy-matmul" or
-        "scipy-convolve", or accepted aliases/abbreviations for these.
+        may be any of: "numpy-roll", "numpy-matmul", "numpy-bitwise",
+        "numpy-hashlife", "numpy-tiled", "numpy-parallel", "numpy-padded",
+        "numpy-block", "scipy-matmul" or "scipy-convolve", or accepted
+        aliases/abbreviations for these.
+        HashLife rounds the size up to powers of two, Block to even numbers.
+    
+    -b, --rollback=BYTES
+        Keep a rollback history of up to BYTES (e.g. "64M") for back-steps,
+        tap 'b' or BACKSPACE to step back. Defaults to 0 for no history.
+    
+    -C, --checkpoint=FILE
+        Autosave checkpoints of the complete state to FILE, every 60 seconds
+        unless set with -e, and once more on exit (or Ctrl-C), so that the
+        run may be resumed with -u. Checkpoints are written in the
+        background without holding up the simulation.
+    
+    -c, --cycles [NUMBER]
+        Detect when the "world" enters a cycle (including a still life) by
+        fingerprinting the last NUMBER states, 4096 if NUMBER is omitted, and
+        from then on skip whole periods. The period is reported on exit.
     
     -d, --delay=NUMBER
         Set the delay interval between iterations, 0 for no delay. NUMBER is
         in seconds but may take floating point values.
     
+    -f, --file=FILE
+        Initialize the "world" with the pattern in FILE, in RLE (.rle),
+        plaintext (.cells) or Macrocell (.mc) format, rather than at random.
+        The pattern is centred unless placed with -x.
+    
+    -G, --glyphs=MODE
+        In terminal mode, select the glyphs drawing the cells. MODE may be
+        any of "block" (1 cell per character, the default), "half" (1x2
+        cells), "quadrant" (2x2 cells) or "braille" (2x4 cells).
+    
+    -g, --goto=STEPS
+        Start from the given number of steps, seeking from the nearest
+        keyframe of the -T timeline, if any, before that.
+    
+    -e, --every=NUMBER
+        Set the interval between the -C checkpoints, in steps, or in time
+        with a suffix of 's', 'm' or 'h' (e.g. "5m").
+    
     -F, --fullscreen
         In graphical mode, set display to fullscreen.
     
+    -k, --interval=NUMBER
+        Set the number of steps between keyframes of the -T timeline,
+        defaulting to 1024.
+    
+    -n, --steps=STEPS
+        In headless mode, run the given number of steps and exit, rather than
+        running until a cycle is detected (with -c) or interrupted.
+    
     -O, --outmode=OUTMODE
-        Select the output mode. OUTMODE may be either "terminal" or
-        "graphical", or accepted aliases/abbreviations for these.
+        Select the output mode. OUTMODE may be any of "terminal", "graphical"
+        or "none", or accepted aliases/abbreviations for these. In headless
+        ("none") mode the model is run with no display and no delay, and the
+        throughput and final statistics are printed on exit.
+    
+    -o, --output=FILE
+        In headless mode, write the final state to FILE in plaintext (.cells)
+        format.
     
     -p, --paused (Ignored)
         Start Conway's Game of Life in paused mode. To toggle pause during
@@ -34,13 +84,42 @@ Options:
         Enter the display resolution for the output, if only WIDTH is
         specified, HEIGHT = WIDTH.
     
+    -R, --rule=RULE
+        Select the Life-like rule in B/S notation, e.g. "B36/S23", or S/B
+        notation, e.g. "23/36", or one of the names "life", "highlife",
+        "day-and-night", "seeds", etc. Defaults to Conway's "B3/S23".
+    
     -s, --size WIDTH [HEIGHT]
         Enter the size of the matrix to initialize for Conway's Game of Life.
         If only WIDTH is specified, HEIGHT = WIDTH.
     
+    -T, --timeline=FILE
+        Keep keyframes of the state in FILE (and an index in FILE.idx) for
+        seeking with -g. An existing timeline is reopened to replay its run,
+        from its first keyframe unless -g or -u says otherwise, keeping its
+        own compression whatever -z says, and only for the same size.
+    
+    -u, --resume=FILE
+        Resume the run saved in the checkpoint FILE, with its size, rule and
+        step count, in place of -s, -R and the random initial state.
+    
     -v, --verbose (Ignored)
         Increase the verbosity of accompanying information to output for each
         instance of flag.
+    
+    -w, --workers=NUMBER
+        Set the number of worker processes for the "numpy-parallel"
+        algorithm, defaulting to the number of CPUs, or the number of worker
+        threads for the "numpy-roll" and "scipy-convolve" algorithms,
+        defaulting to single threaded.
+    
+    -x, --offset X Y
+        Place the top left of the -f pattern at column X and row Y, wrapping
+        around the edges of the "world".
+    
+    -z, --compress
+        Compress the rollback history and keyframes with zlib, for a longer
+        history in the same memory at some cost in speed.
 """
 
 import sys
@@ -52,41 +131,41 @@ import arguments as arg
 
 # Algorithm Analytics:
 #
-#   Tests on matrices of size 1300x280, values in seconds per 100 steps:
-#       numpy roll:       7
-#       scipy convolve:   8
-#       scipy matmul:    11
-#       numpy matmul:   200
+#   Run `python -m life.bench` for reproducible timings of every algorithm
+#   registered below, see life/bench.py.
 
-MODELS = \
-{
-    **{key : life.nump.roll.GOLNumpyRollModel     for key in arg.DEFAULT},
-    **{key : life.nump.roll.GOLNumpyRollModel     for key in arg.NP_ROLL},
-    **{key : life.nump.matmul.GOLNumpyMatmulModel for key in arg.NP_MATMUL},
-    **{key : life.scip.matmul.GOLScipyMatmulModel for key in arg.SP_MATMUL},
-    **{key : life.scip.convolve.GOLScipyConvolveModel
-                                                  for key in arg.SP_CONVOLVE}
-}
-
-VIEWS = \
+# The Models, Views and Controllers are registered by reference and imported
+# only once chosen, so that only the one Model, and neither PyGame, curses
+# nor SciPy unless used, is imported. More may be registered by third party
+# packages with entry points, see life/registry.py, which also registers
+# the Models of the package for life.bench.
+
+MODELS = life.registry.models()
+
+VIEWS = life.registry.Registry(
 {
-    **{key : life.graphics.GraphicsView for key in arg.DEFAULT},
-    **{key : life.graphics.GraphicsView for key in arg.GRAPHICAL},
-    **{key : life.terminal.TerminalView for key in arg.TERMINAL}
-}
+    **{key : "life.graphics:GraphicsView"           for key in arg.DEFAULT},
+    **{key : "life.graphics:GraphicsView"           for key in arg.GRAPHICAL},
+    **{key : "life.terminal:TerminalView"           for key in arg.TERMINAL},
+    **{key : lambda **kwargs: None                  for key in arg.NONE}
+}, life.registry.VIEWS)
 
-CONTROLLERS = \
+CONTROLLERS = life.registry.Registry(
 {
-    **{key : life.graphics.GraphicsController for key in arg.DEFAULT},
-    **{key : life.graphics.GraphicsController for key in arg.GRAPHICAL},
-    **{key : life.terminal.TerminalController for key in arg.TERMINAL}
-}
+    **{key : "life.graphics:GraphicsController"     for key in arg.DEFAULT},
+    **{key : "life.graphics:GraphicsController"     for key in arg.GRAPHICAL},
+    **{key : "life.terminal:TerminalController"     for key in arg.TERMINAL},
+    **{key : "life.headless:HeadlessController"     for key in arg.NONE}
+}, life.registry.CONTROLLERS)
 
 
 def main(argv):
     controller = _initialize(argv)
     
-    controller.run()
+    period = controller.run()
+    
+    if period is not None:
+        sys.stderr.write(f"{argv[0]}: cycle of period {period} detected\n")
     
     return 0
 
@@ -94,14 +173,72 @@ def main(argv):
 def _initialize(argv):
     args = arg.get_args(argv)
     
-    model = MODELS[args.algorithm](args.size)
+    options = {"rule" : args.rule}
+    
+    if args.workers is not None:
+        options["workers"] = args.workers
+    
+    if args.file is not None:
+        options["source"] = args.file
+        options["offset"] = args.offset
+    
+    if args.cycles:
+        options["cycles"] = args.cycles
+    
+    if args.rollback:
+        options["rollback"] = life.history.History(args.rollback,
+                                                   compress=args.compress)
+    
+    if args.timeline is not None:
+        options["keyframes"] = life.timeline.Timeline(
+                                    args.timeline,
+                                    args.interval or life.timeline.INTERVAL,
+                                    compress=args.compress)
+    
+    checkpoint = None
+    
+    if args.resume is not None:
+        checkpoint = life.checkpoint.load(args.resume)
+        
+        args.size = checkpoint.size
+        
+        if checkpoint.rule is not None:
+            options["rule"] = checkpoint.rule
+    
+    model = MODELS[args.algorithm](args.size, **options)
+    
+    if checkpoint is not None:
+        model.restore(checkpoint.steps, checkpoint.state)
+    
+    if args.goto is None and args.timeline is not None and checkpoint is None:
+        args.goto = 0
+    
+    if args.goto is not None:
+        model.step_to(args.goto)
+    
+    view_options = {}
+    
+    if args.glyphs is not None:
+        view_options["glyphs"] = args.glyphs
     
     view = VIEWS[args.outmode](resolution=args.resolution,
                                fullscreen=args.fullscreen,
-                               caption="I didn't choose the Matrix Life...")
+                               caption="I didn't choose the Matrix Life...",
+                               **view_options)
+    
+    autosave = None
+    
+    if args.checkpoint is not None:
+        autosave = life.checkpoint.Autosave(args.checkpoint, *args.every)
+    
+    if args.outmode in arg.NONE:
+        return CONTROLLERS[args.outmode](model, view, steps=args.steps,
+                                                      output=args.output,
+                                                      autosave=autosave)
     
     controller = CONTROLLERS[args.outmode](model, view, args.delay,
-                                                        args.paused)
+                                                        args.paused,
+                                                        autosave=autosave)
     
     return controller
 
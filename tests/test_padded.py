@@ -0,0 +1,105 @@
+"""
+Tests of the padded in place Model.
+
+The padded Model promises to step without allocating, so stepping it under
+tracemalloc, once warmed up, must never hold as much new memory as a single
+state Matrix.
+
+Constants:
+SIZE    -- tuple:   the dimensions (shape) of the "world".
+WARMUP  -- int:     the number of steps taken before tracing.
+STEPS   -- int:     the number of steps taken while tracing.
+
+Classes:
+TestPaddedAllocation    -- Tests that stepping does not allocate.
+"""
+
+import unittest
+import tracemalloc
+
+import numpy
+
+from life.nump import padded
+from life.nump import roll
+
+
+SIZE = (256, 192)
+
+WARMUP = 4
+
+STEPS = 64
+
+
+class TestPaddedAllocation(unittest.TestCase):
+    """
+    Tests that stepping the padded Model does not allocate.
+    """
+    
+    def setUp(self):
+        self.model = padded.GOLNumpyPaddedModel(SIZE)
+        
+        self.model.step(WARMUP)
+    
+    
+    def tearDown(self):
+        self.model.close()
+    
+    
+    def test_single_steps(self):
+        """
+        Single steps allocate less than one state Matrix between them.
+        """
+        _array = numpy.prod(SIZE)
+        
+        tracemalloc.start()
+        
+        try:
+            for _ in range(STEPS):
+                self.model.step()
+            
+            _, _peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        
+        self.assertLess(_peak, _array)
+    
+    
+    def test_many_steps(self):
+        """
+        A run of steps allocates less than one state Matrix.
+        """
+        _array = numpy.prod(SIZE)
+        
+        tracemalloc.start()
+        
+        try:
+            self.model.step(STEPS)
+            
+            _, _peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        
+        self.assertLess(_peak, _array)
+    
+    
+    def test_matches_roll(self):
+        """
+        Stepping in place gives the same states as the roll Model.
+        """
+        _other = roll.GOLNumpyRollModel(SIZE)
+        
+        try:
+            _other._load(self.model._snapshot())
+            
+            for _ in range(STEPS):
+                self.model.step()
+                _other.step()
+                
+                numpy.testing.assert_array_equal(self.model._snapshot(),
+                                                 _other._snapshot())
+        finally:
+            _other.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Tests of saving and resuming a run from the command line.
+
+A headless run saving a checkpoint is resumed by a second run, which must
+carry on from the step count and state of the first exactly as the roll
+Model stepping the saved state would.
+
+Constants:
+ROOT    -- string:  the directory of main.py.
+SIZE    -- int:     the width and height of the "world".
+FIRST   -- int:     the number of steps of the first run.
+SECOND  -- int:     the number of steps of the resumed run.
+
+Classes:
+TestResume  -- Tests that a checkpointed run resumes where it stopped.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+import subprocess
+
+import numpy
+
+from life import checkpoint
+from life.nump import roll
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SIZE = 64
+
+FIRST = 50
+
+SECOND = 10
+
+
+class TestResume(unittest.TestCase):
+    """
+    Tests that a checkpointed run resumes where it stopped.
+    """
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        
+        self.path = os.path.join(self.directory.name, "run.ck")
+    
+    
+    def tearDown(self):
+        self.directory.cleanup()
+    
+    
+    def run_main(self, *args):
+        """
+        Run main.py headless with some arguments, failing on an error.
+        """
+        _result = subprocess.run([sys.executable,
+                                  os.path.join(ROOT, "main.py"),
+                                  "-O", "none", *args],
+                                 cwd=ROOT, capture_output=True, text=True,
+                                 timeout=120)
+        
+        self.assertEqual(_result.returncode, 0, _result.stderr)
+    
+    
+    def test_save_and_resume(self):
+        """
+        A resumed run continues the step count and state of the saved run.
+        """
+        self.run_main("-s", str(SIZE), "-n", str(FIRST), "-C", self.path)
+        
+        _first = checkpoint.load(self.path)
+        
+        self.assertEqual(_first.steps, FIRST)
+        
+        self.run_main("-n", str(SECOND), "-u", self.path, "-C", self.path)
+        
+        _second = checkpoint.load(self.path)
+        
+        self.assertEqual(_second.steps, FIRST + SECOND)
+        
+        _model = roll.GOLNumpyRollModel(_first.size)
+        
+        try:
+            _model.restore(_first.steps, _first.state)
+            _model.step(SECOND)
+            
+            numpy.testing.assert_array_equal(_model._snapshot(),
+                                             _second.state)
+        finally:
+            _model.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
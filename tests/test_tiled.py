@@ -0,0 +1,111 @@
+"""
+Tests of the active tile Model.
+
+The tiled Model recomputes only the tiles which changed and their
+neighbours, so stepping it from the same state as the roll Model must give
+the same states under every rule, whether the tiles are stepped densely or
+gathered a few at a time, and whether or not the tiles divide the "world".
+
+Constants:
+SIZE    -- tuple:   the dimensions (shape) of the "world".
+TILE    -- int:     the width and height of the small tiles.
+UNEVEN  -- tuple:   the dimensions of a "world" the tiles do not divide.
+RULES   -- list:    the Life-like rules compared.
+STEPS   -- int:     the number of steps compared.
+
+Classes:
+TestTiledMatchesRoll    -- Tests that the tiled Model steps as roll does.
+"""
+
+import unittest
+
+import numpy
+
+from life.nump import roll
+from life.nump import tiled
+
+
+SIZE = (256, 192)
+
+TILE = 16
+
+UNEVEN = (100, 70)
+
+RULES = ["B3/S23", "B36/S23", "B2/S", "B3678/S34678"]
+
+STEPS = 48
+
+
+class TestTiledMatchesRoll(unittest.TestCase):
+    """
+    Tests that the tiled Model steps as the roll Model does.
+    """
+    
+    def setUp(self):
+        self.rng = numpy.random.default_rng(0)
+    
+    
+    def assert_matches(self, size, state, rule, tile=tiled.TILE):
+        """
+        Step both Models from state, failing at the first state that differs.
+        """
+        _tiled = tiled.GOLNumpyTiledModel(size, rule=rule, tile=tile)
+        _roll = roll.GOLNumpyRollModel(size, rule=rule)
+        
+        try:
+            _tiled._load(state.copy())
+            _roll._load(state.copy())
+            
+            for _step in range(STEPS):
+                _tiled.step()
+                _roll.step()
+                
+                numpy.testing.assert_array_equal(
+                            _tiled._snapshot(), _roll._snapshot(),
+                            err_msg=f"{rule} step {_step + 1}")
+        finally:
+            _tiled.close()
+            _roll.close()
+    
+    
+    def test_dense(self):
+        """
+        A random soup, stepping most tiles, gives the states of roll.
+        """
+        for _rule in RULES:
+            _state = self.rng.integers(2, size=SIZE[::-1], dtype=numpy.uint8)
+            
+            self.assert_matches(SIZE, _state, _rule)
+    
+    
+    def test_sparse(self):
+        """
+        A few small soups, stepping only their tiles, give the states of roll.
+        """
+        for _rule in RULES:
+            _state = numpy.zeros(SIZE[::-1], dtype=numpy.uint8)
+            
+            for _y, _x in ((0, 0), (40, 70), (187, 250)):
+                _patch = self.rng.integers(2, size=(6, 6), dtype=numpy.uint8)
+                
+                _state[numpy.ix_(numpy.arange(_y, _y + 6)%SIZE[1],
+                                 numpy.arange(_x, _x + 6)%SIZE[0])] = _patch
+            
+            self.assert_matches(SIZE, _state, _rule, tile=TILE)
+    
+    
+    def test_uneven(self):
+        """
+        Tiles which do not divide the "world" give the states of roll.
+        """
+        for _rule in RULES:
+            _state = numpy.zeros(UNEVEN[::-1], dtype=numpy.uint8)
+            
+            _state[30:40, 45:55] = self.rng.integers(2, size=(10, 10),
+                                                     dtype=numpy.uint8)
+            
+            self.assert_matches(UNEVEN, _state, _rule, tile=TILE)
+
+
+if __name__ == "__main__":
+    unittest.main()
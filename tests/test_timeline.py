@@ -0,0 +1,98 @@
+"""
+Tests of reopening keyframe timelines.
+
+A timeline reopened by a Model started from another random state must
+replay the run it was recorded from, with its own compression, and must
+refuse a Model of another size.
+
+Constants:
+SIZE    -- tuple:   the dimensions (shape) of the "world".
+STEPS   -- int:     the number of steps recorded.
+INTERVAL
+        -- int:     the number of generations between keyframes.
+
+Classes:
+TestReopen  -- Tests that a reopened timeline replays its own run.
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy
+
+from life import timeline
+from life.nump import roll
+
+
+SIZE = (48, 32)
+
+STEPS = 40
+
+INTERVAL = 10
+
+
+class TestReopen(unittest.TestCase):
+    """
+    Tests that a reopened timeline replays its own run.
+    """
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        
+        self.path = os.path.join(self.directory.name, "run.tl")
+        
+        _model = roll.GOLNumpyRollModel(
+                        SIZE, keyframes=timeline.Timeline(self.path, INTERVAL,
+                                                          compress=True))
+        
+        try:
+            self.states = [_model._snapshot()]
+            
+            for _ in range(STEPS):
+                _model.step()
+                
+                self.states.append(_model._snapshot())
+        finally:
+            _model.close()
+    
+    
+    def tearDown(self):
+        self.directory.cleanup()
+    
+    
+    def test_replay(self):
+        """
+        Seeking a reopened timeline gives the states of its own run.
+        """
+        for _compress in (False, True):
+            _model = roll.GOLNumpyRollModel(
+                        SIZE, keyframes=timeline.Timeline(self.path, INTERVAL,
+                                                          compress=_compress))
+            
+            try:
+                for _steps in (0, 25, 3, STEPS):
+                    _model.step_to(_steps)
+                    
+                    numpy.testing.assert_array_equal(_model._snapshot(),
+                                                     self.states[_steps])
+            finally:
+                _model.close()
+    
+    
+    def test_other_size(self):
+        """
+        A reopened timeline refuses a Model of another size.
+        """
+        _model = roll.GOLNumpyRollModel(
+                        SIZE[::-1], keyframes=timeline.Timeline(self.path))
+        
+        try:
+            with self.assertRaises(ValueError):
+                _model.step_to(0)
+        finally:
+            _model.close()
+
+
+if __name__ == "__main__":
+    unittest.main()